@@ -1,17 +1,43 @@
+import hmac
+import time
 import dash
-from dash import html, dcc, callback_context
+from dash import html, dcc, dash_table, callback_context
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
-from backend.src.data_service import fetch_data, calculate_indicators
-from frontend.src.charts import create_price_chart, create_indicator_chart, create_performance_metrics
+import pandas as pd
+from flask import request, jsonify, Response
+from backend.src.data_service import fetch_data, fetch_epoch, calculate_indicators, supported
+from backend.src.live import LiveFeed
+from backend.src.scanner import scan, load_watchlist, result_cache, SCAN_COLUMNS
+from frontend.src.charts import (create_price_chart, create_indicator_chart, create_performance_metrics,
+                                 figure_dict, price_chart_patch, indicator_chart_patch, patchable, candle_limit)
 from backend.src.models import TradingStrategy  # Add this import
+from backend.src.shared_cache import make_cache
+from backend.src.scheduler import PrecomputeScheduler
+from backend.src.metrics import metrics, profiler, cache_collector
+from backend.src.config import TradingConfig as cfg
+
+# Computed frames/signals/figures shared across requests, keyed by the latest bar
+# (and across server workers with TRAIDE_CACHE=shared)
+analysis_cache = make_cache('analysis', cfg.DASHBOARD_CACHE_SIZE, cfg.DASHBOARD_CACHE_TTL)
+figure_cache = make_cache('figure', cfg.DASHBOARD_CACHE_SIZE, cfg.DASHBOARD_CACHE_TTL)
+# Fetched bars per freshness window, so one worker asks the provider and the rest reuse its result
+bars_cache = make_cache('bars', cfg.DASHBOARD_CACHE_SIZE)
+# Incremental indicator/signal state behind live ticks
+live_feed = LiveFeed()
+metrics.collect(cache_collector('bars', bars_cache))
+metrics.collect(cache_collector('analysis', analysis_cache))
+metrics.collect(cache_collector('figure', figure_cache))
+metrics.collect(cache_collector('scan', result_cache))
 
 def create_chart_area():
     return dbc.Col([
         dcc.Graph(id="price-chart"),
         dcc.Graph(id="indicator-chart"),
         html.Div(id="performance-metrics", className="mt-3"),  # Added performance metrics div
-        dcc.Interval(id="interval-component"),
+        dcc.Interval(id="interval-component", interval=cfg.UPDATE_INTERVAL, disabled=True),
+        dcc.Store(id="live-state"),
         html.Div(id="update-status")
     ], width=9)
 
@@ -51,12 +77,38 @@ def create_sidebar_controls():
                     {"label": "MACD", "value": "macd"},
                     {"label": "BB", "value": "bollinger"}
                 ],
+                value=list(cfg.DEFAULT_INDICATORS),
+                className="mb-3"
+            ),
+            dcc.Checklist(
+                id="live-mode",
+                options=[{"label": "Live", "value": "live"}],
                 className="mb-3"
             ),
             dbc.Button("Update", id="update-button", color="primary", className="w-100")
         ], className="p-3 bg-light rounded")
     ], width=3)
 
+def create_scanner_panel():
+    return dbc.Row([
+        dbc.Col([
+            html.Div([
+                html.H4("Scanner", className="mb-3"),
+                dbc.Button("Scan watchlist", id="scan-button", color="secondary", className="mb-3"),
+                html.Div(id="scan-status", className="mb-2"),
+                dash_table.DataTable(
+                    id="scanner-table",
+                    columns=[{"name": c, "id": c} for c in SCAN_COLUMNS],
+                    sort_action="native",
+                    page_size=25,
+                    style_table={"overflowX": "auto"},
+                    style_header={"backgroundColor": "#303030", "color": "white"},
+                    style_cell={"backgroundColor": "#222", "color": "white"}
+                )
+            ], className="p-3 bg-light rounded")
+        ], width=12)
+    ], className="mt-4")
+
 # Initialize the Dash app
 app = dash.Dash(
     __name__,
@@ -71,45 +123,286 @@ def create_layout():
         dbc.Row([
             create_sidebar_controls(),
             create_chart_area()
-        ])
+        ]),
+        create_scanner_panel()
     ], fluid=True)
 
+def bar_version(df):
+    """Cache version for a bar series: last timestamp plus the still-forming bar's values"""
+    last = df.iloc[-1]
+    return (df.index[-1], len(df), last['Close'], last['High'], last['Low'], last['Volume'])
+
+def build_figure(builder, *args, **kwargs):
+    """Build a chart and convert it to a JSON-ready dict, timing both stages"""
+    with metrics.stage('figure'):
+        fig = builder(*args, **kwargs)
+    with metrics.stage('serialize'):
+        return figure_dict(fig)
+
+def analyze(symbol, timeframe, interval):
+    """Fetch bars and compute indicators, signals and the price figure (memoized)"""
+    with metrics.stage('fetch'):
+        df = bars_cache.get_or_compute((symbol.upper(), timeframe, interval),
+                                       lambda: fetch_data(symbol, timeframe, interval), fetch_epoch(interval))
+    if df.empty or len(df) < 2:
+        return None
+    
+    def compute():
+        with metrics.stage('indicators'):
+            frame = calculate_indicators(df)
+        with metrics.stage('signals'):
+            strategy = TradingStrategy()
+            signals, frame = strategy.calculate_signals(frame)
+        price_fig = build_figure(create_price_chart, frame, symbol, signals)
+        return frame, signals, price_fig
+    
+    key = (symbol.upper(), timeframe, interval)
+    version = bar_version(df)
+    frame, signals, price_fig = analysis_cache.get_or_compute(key, compute, version)
+    return frame, signals, price_fig, version
+
+def indicator_figure(symbol, timeframe, interval, df, indicators, version):
+    """Indicator chart for the selected indicators (memoized per bar version)"""
+    key = (symbol.upper(), timeframe, interval, tuple(sorted(indicators or [])))
+    return figure_cache.get_or_compute(key, lambda: build_figure(create_indicator_chart, df, indicators), version)
+
+def precompute(symbol, timeframe, interval):
+    """Warm the caches a dashboard request reads, with the default indicator selection"""
+    result = analyze(symbol, timeframe, interval)
+    if result is not None:
+        df, _, _, version = result
+        indicator_figure(symbol, timeframe, interval, df, list(cfg.DEFAULT_INDICATORS), version)
+
+# Refreshes watchlist symbols as bars close so their requests are cache hits (TRAIDE_PRECOMPUTE=1)
+precompute_scheduler = None
+if cfg.PRECOMPUTE:
+    precompute_scheduler = PrecomputeScheduler(precompute, load_watchlist()).start()
+    metrics.collect(lambda: [('precompute_pending', 'gauge', {}, precompute_scheduler.stats()['pending'])])
+
+def relayout_range(relayout):
+    """Visible x-range from a price-chart relayout event; None means the full series"""
+    if not relayout or relayout.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout:
+        return relayout['xaxis.range[0]'], relayout['xaxis.range[1]']
+    if 'xaxis.range' in relayout:
+        return tuple(relayout['xaxis.range'])
+    return None
+
+def live_state(df, signals, symbol, timeframe, interval):
+    """What the browser currently shows, so live ticks can send only what changed"""
+    last = df.iloc[-1]
+    return {
+        'symbol': symbol, 'timeframe': timeframe, 'interval': interval,
+        'last_ts': df.index[-1].isoformat(),
+        'marked_ts': df.index[-1].isoformat(),    # Full renders draw markers up to the last bar
+        'close': float(last['Close']), 'volume': float(last['Volume']),
+        'patchable': patchable(df), 'bars': len(df),
+    }
+
 @app.callback(
     [Output("price-chart", "figure"),
      Output("indicator-chart", "figure"),
-     Output("performance-metrics", "children")],
+     Output("performance-metrics", "children"),
+     Output("live-state", "data")],
     [Input("symbol-input", "value"),
      Input("timeframe-select", "value"),
      Input("interval-select", "value"),       # Added interval input
-     Input("update-button", "n_clicks")],
+     Input("update-button", "n_clicks"),
+     Input("price-chart", "relayoutData")],   # Re-fetch detail on zoom
     [State("technical-indicators", "value")],
     prevent_initial_call=True
 )
-def update_dashboard(symbol, timeframe, interval, n_clicks, indicators):
+@metrics.timer('callback', ignore=PreventUpdate, callback='update_dashboard')
+def update_dashboard(symbol, timeframe, interval, n_clicks, relayout, indicators):
     ctx = callback_context
     if not ctx.triggered or not symbol:
-        return {}, {}, []
+        return {}, {}, [], None
+    
+    if timeframe and interval and not supported(timeframe, interval):
+        return {}, {}, [html.Div(f"Error: {interval} bars are not available for a {timeframe} timeframe.")], None
+    
+    x_range = None
+    if ctx.triggered[0]['prop_id'] == "price-chart.relayoutData":
+        x_range = relayout_range(relayout)
+        if x_range is None and not (relayout or {}).get('xaxis.autorange'):
+            raise PreventUpdate    # Not a zoom/pan event (e.g. initial autosize)
     
     try:
         # Fetch and process data with both period and interval
-        df = fetch_data(symbol, timeframe, interval)
-        df = calculate_indicators(df)
-        
-        if df.empty or len(df) < 2:
-            return {}, {}, [html.Div("Error: Insufficient data retrieved.")]
-        
-        # Calculate trading signals
-        strategy = TradingStrategy()
-        signals, df = strategy.calculate_signals(df)
+        result = analyze(symbol, timeframe, interval)
+        if result is None:
+            return {}, {}, [html.Div("Error: Insufficient data retrieved.")], None
+        df, signals, price_fig, version = result
         
         # Create charts and metrics with signals
-        price_fig = create_price_chart(df, symbol, signals)
-        indicator_fig = create_indicator_chart(df, indicators)
-        metrics = create_performance_metrics(df)
+        if x_range is not None:
+            # Zoomed in: rebuild both charts at full detail for the visible window
+            price_fig = build_figure(create_price_chart, df, symbol, signals, x_range=x_range)
+            indicator_fig = build_figure(create_indicator_chart, df, indicators, x_range=x_range)
+            state = None    # Live ticks would append to the zoomed window; resume after autorange
+        else:
+            indicator_fig = indicator_figure(symbol, timeframe, interval, df, indicators, version)
+            state = live_state(df, signals, symbol, timeframe, interval)
+        performance = create_performance_metrics(df)
         
-        return price_fig, indicator_fig, metrics
+        return price_fig, indicator_fig, performance, state
     except Exception as e:
-        return {}, {}, [html.Div(f"Error: {str(e)}")]
+        return {}, {}, [html.Div(f"Error: {str(e)}")], None
+
+@app.callback(
+    Output("interval-select", "options"),
+    Input("timeframe-select", "value"),
+    State("interval-select", "options")
+)
+def interval_options(timeframe, options):
+    """Disable the intervals the provider cannot serve over the selected timeframe"""
+    return [{**option, 'disabled': bool(timeframe) and not supported(timeframe, option['value'])}
+            for option in options]
+
+@app.callback(
+    Output("interval-component", "disabled"),
+    Input("live-mode", "value")
+)
+def toggle_live(live_mode):
+    return "live" not in (live_mode or [])
+
+@app.callback(
+    [Output("price-chart", "figure", allow_duplicate=True),
+     Output("indicator-chart", "figure", allow_duplicate=True),
+     Output("live-state", "data", allow_duplicate=True)],
+    [Input("interval-component", "n_intervals")],
+    [State("live-state", "data"),
+     State("technical-indicators", "value")],
+    prevent_initial_call=True
+)
+@metrics.timer('callback', ignore=PreventUpdate, callback='live_update')
+def live_update(n_intervals, state, indicators):
+    """Per-tick update: patch in the revised last bar and any new bars instead of resending figures"""
+    if not state:
+        raise PreventUpdate
+    symbol, timeframe, interval = state['symbol'], state['timeframe'], state['interval']
+    last_ts, marked_ts = pd.Timestamp(state['last_ts']), pd.Timestamp(state['marked_ts'])
+    try:
+        bars = None
+        if state.get('patchable'):
+            with metrics.stage('live_poll'):
+                bars = live_feed.poll(symbol, timeframe, interval, since=last_ts)
+        if bars is not None and bars.empty:
+            raise PreventUpdate
+        added = 0 if bars is None else int((bars.index > last_ts).sum())
+        if bars is not None and state['bars'] + added > candle_limit():
+            bars = None    # The full render would bucket the candles now
+        if bars is not None:
+            last = bars.iloc[-1]
+            if (len(bars) == 1 and bars.index[0] == last_ts
+                    and last['Close'] == state['close'] and last['Volume'] == state['volume']):
+                raise PreventUpdate
+            state = dict(state, last_ts=bars.index[-1].isoformat(), bars=state['bars'] + added,
+                         close=float(last['Close']), volume=float(last['Volume']))
+            if len(bars) > 1:
+                state['marked_ts'] = max(marked_ts, bars.index[-2]).isoformat()
+            return (price_chart_patch(bars, last_ts, marked_ts),
+                    indicator_chart_patch(bars, indicators, last_ts), state)
+        
+        # The browser is further behind than the live buffer (or shows bucketed candles): full render
+        result = analyze(symbol, timeframe, interval)
+        if result is None:
+            raise PreventUpdate
+        df, signals, price_fig, version = result
+        new_state = live_state(df, signals, symbol, timeframe, interval)
+        if all(new_state[k] == state.get(k) for k in ('last_ts', 'close', 'volume')):
+            raise PreventUpdate
+        indicator_fig = indicator_figure(symbol, timeframe, interval, df, indicators, version)
+        return price_fig, indicator_fig, new_state
+    except PreventUpdate:
+        raise
+    except Exception:
+        raise PreventUpdate    # Keep showing the last good figures; the next tick retries
+
+def scan_records(table):
+    """Scanner table as JSON-ready records"""
+    table = table.assign(time=table['time'].map(lambda ts: ts.isoformat())).round(
+        {'close': 4, 'change_pct': 2, 'RSI': 2, 'MACD': 4, 'Stoch_K': 2})
+    return table.astype(object).where(table.notna(), None).to_dict('records')
+
+@app.callback(
+    [Output("scanner-table", "data"),
+     Output("scan-status", "children")],
+    [Input("scan-button", "n_clicks"),
+     Input("interval-component", "n_intervals")],
+    prevent_initial_call=True
+)
+@metrics.timer('callback', ignore=PreventUpdate, callback='update_scanner')
+def update_scanner(n_clicks, n_intervals):
+    if not n_clicks:
+        raise PreventUpdate    # Live ticks only rescan once a scan has been requested
+    tickers = load_watchlist()
+    table, errors = scan(tickers, cfg.SCAN_PERIOD, cfg.SCAN_INTERVAL)
+    status = f"{len(table)} of {len(tickers)} symbols fired ({cfg.SCAN_PERIOD}, {cfg.SCAN_INTERVAL})"
+    if errors:
+        status += f", {len(errors)} failed"
+    return scan_records(table), status
+
+@app.callback(
+    Output("symbol-input", "value"),
+    Input("scanner-table", "active_cell"),
+    State("scanner-table", "derived_viewport_data"),
+    prevent_initial_call=True
+)
+def select_scanned_symbol(active_cell, rows):
+    """Clicking a scanner row loads that symbol in the charts"""
+    if not active_cell or not rows:
+        raise PreventUpdate
+    return rows[active_cell['row']]['ticker']
+
+@app.server.route("/api/scan")
+def scan_endpoint():
+    """Latest-bar signals for `symbols` (default: the watchlist); `all=1` includes symbols that did not fire"""
+    symbols = request.args.get('symbols')
+    tickers = [t for t in symbols.split(',') if t.strip()] if symbols else load_watchlist()
+    period = request.args.get('period', cfg.SCAN_PERIOD)
+    interval = request.args.get('interval', cfg.SCAN_INTERVAL)
+    fired_only = request.args.get('all') not in ('1', 'true')
+    table, errors = scan([t.strip() for t in tickers], period, interval, fired_only=fired_only)
+    return jsonify({'period': period, 'interval': interval, 'symbols': len(tickers),
+                    'signals': scan_records(table), 'errors': errors})
+
+@app.server.before_request
+def start_request_timer():
+    request.environ['traide.start'] = time.perf_counter()
+    profiler.start()
+
+@app.server.after_request
+def observe_request(response):
+    """Request latency per route (per callback output for Dash updates), plus the optional profile dump"""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    if request.path.endswith('_dash-update-component'):
+        endpoint = (request.get_json(silent=True) or {}).get('output', endpoint)
+    start = request.environ.get('traide.start')
+    if start is not None:
+        metrics.observe('request_seconds', time.perf_counter() - start, endpoint=endpoint)
+    profiler.stop(endpoint)
+    return response
+
+@app.server.route("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of stage/callback/provider latencies and cache counters"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.server.route("/metrics/profile", methods=["GET", "POST"])
+def profile_endpoint():
+    """Profiler status; POST `enable=1`/`enable=0` with the X-Profile-Token header toggles it"""
+    if request.method == 'POST':
+        token = request.headers.get('X-Profile-Token', '')
+        if not cfg.PROFILE_TOKEN or not hmac.compare_digest(token, cfg.PROFILE_TOKEN):
+            return jsonify({'error': 'Profiling cannot be toggled without a valid token.'}), 403
+        enable = request.values.get('enable')
+        if enable in ('1', 'true'):
+            profiler.enable()
+        elif enable in ('0', 'false'):
+            profiler.disable()
+    return jsonify({'enabled': profiler.enabled})
 
 if __name__ == '__main__':
     app.layout = create_layout()
@@ -0,0 +1,325 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from .providers import OHLCV_COLUMNS
+
+try:
+    import fcntl
+except ImportError:    # Windows: only threads of one process are serialized
+    fcntl = None
+
+INTERVAL_DELTAS = {
+    '1m': pd.Timedelta(minutes=1),
+    '2m': pd.Timedelta(minutes=2),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '60m': pd.Timedelta(hours=1),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1),
+    '5d': pd.Timedelta(days=5),
+    '1wk': pd.Timedelta(weeks=1),
+    '1mo': pd.Timedelta(days=30),
+}
+
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+TS_FILE = 'ts.i8'
+META_FILE = 'meta.json'
+LOCK_DIR = '.locks'
+# File suffixes of derived (non-OHLCV) columns
+DERIVED_DTYPES = {'f8': np.float64, 'f4': np.float32, 'i8': np.int64, 'u1': np.uint8}
+
+
+def period_days(period):
+    """Calendar days spanned by a yfinance-style period (None for 'max')"""
+    if period in (None, 'max'):
+        return None
+    end = pd.Timestamp.now(tz='UTC')
+    return (end - period_start(end, period)) / pd.Timedelta(days=1)
+
+
+def interval_to_timedelta(interval):
+    if interval not in INTERVAL_DELTAS:
+        raise ValueError(f"Unsupported interval '{interval}'.")
+    return INTERVAL_DELTAS[interval]
+
+
+def is_intraday(interval):
+    return interval_to_timedelta(interval) < pd.Timedelta(days=1)
+
+
+def period_start(end, period):
+    """Earliest timestamp a yfinance-style `period` reaches back from `end`"""
+    if period in (None, 'max'):
+        return None
+    if period == 'ytd':
+        return end.normalize().replace(month=1, day=1)
+    if period in PERIOD_OFFSETS:
+        return end - PERIOD_OFFSETS[period]
+    if period.endswith('d') and period[:-1].isdigit():
+        return end - pd.Timedelta(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period '{period}'.")
+
+
+def slice_period(df, period, interval):
+    """Select the bars a provider would return for `period`, anchored at the last bar"""
+    if df.empty or period in (None, 'max'):
+        return df
+    if period.endswith('d') and period[:-1].isdigit() and is_intraday(interval):
+        # Like yfinance, day periods on intraday bars count trading sessions
+        sessions = df.index.normalize()
+        keep = sessions.unique()[-int(period[:-1]):]
+        return df[sessions.isin(keep)]
+    start = period_start(df.index[-1], period)
+    return df[df.index > start]
+
+
+class _SeriesLock:
+    """Thread lock and held file lock of one series within this process"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.fd = None
+        self.depth = 0
+        self.shared = False
+
+
+class BarStore:
+    """On-disk columnar OHLCV store: one flat binary file per column under `<root>/<TICKER>/<interval>/`"""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()    # Guards _series only
+        self._series = {}    # (TICKER, interval) -> _SeriesLock
+
+    @contextmanager
+    def _locked(self, ticker, interval, shared=False):
+        """Hold one series' lock: its thread lock plus a cross-process file lock (re-entrant)"""
+        key = (ticker.upper(), interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _SeriesLock()
+        with series.lock:
+            if series.depth and series.shared and not shared:
+                raise RuntimeError(f"{key[0]} {interval} is locked for reading; take the write lock first.")
+            if not series.depth:
+                series.fd = self._flock(key, shared)
+                series.shared = shared
+            series.depth += 1
+            try:
+                yield
+            finally:
+                series.depth -= 1
+                if not series.depth and series.fd is not None:
+                    fcntl.flock(series.fd, fcntl.LOCK_UN)
+                    os.close(series.fd)
+                    series.fd = None
+
+    def _flock(self, key, shared):
+        """Open and lock the series' lock file (None without fcntl)"""
+        if fcntl is None:
+            return None
+        path = os.path.join(self.root, LOCK_DIR, f"{key[0]}-{key[1]}.lock")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return fd
+
+    def _path(self, ticker, interval):
+        return os.path.join(self.root, ticker.upper(), interval)
+
+    def state_path(self, ticker, interval, name):
+        """Path for derived state (e.g. indicator checkpoints) kept next to a series"""
+        path = self._path(ticker, interval)
+        os.makedirs(path, exist_ok=True)
+        return os.path.join(path, name)
+
+    def read_meta(self, ticker, interval):
+        path = os.path.join(self._path(ticker, interval), META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, ticker, interval, meta):
+        path = self._path(ticker, interval)
+        tmp = os.path.join(path, META_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, META_FILE))
+
+    def update_meta(self, ticker, interval, **fields):
+        with self._locked(ticker, interval):
+            meta = self.read_meta(ticker, interval)
+            if meta is None:
+                return
+            meta.update(fields)
+            self._write_meta(ticker, interval, meta)
+
+    def last_timestamp(self, ticker, interval):
+        meta = self.read_meta(ticker, interval)
+        if not meta or meta['rows'] == 0:
+            return None
+        return pd.Timestamp(meta['last_ts'], tz='UTC').tz_convert(meta['tz'])
+
+    def read(self, ticker, interval, mmap=False):
+        """Load a stored series as a DataFrame (empty if missing), optionally backed by read-only memory maps"""
+        with self._locked(ticker, interval, shared=True):
+            meta = self.read_meta(ticker, interval)
+            if meta is None or meta['rows'] == 0:
+                return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], tz='UTC'), dtype=float)
+            path = self._path(ticker, interval)
+            rows = meta['rows']
+            ts = self._load_column(os.path.join(path, TS_FILE), np.int64, rows, mmap)
+            data = {
+                col: self._load_column(os.path.join(path, f"{col}.f8"), np.float64, rows, mmap)
+                for col in OHLCV_COLUMNS
+            }
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(ts), unit='ns', utc=True)).tz_convert(meta['tz'])
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def read_since(self, ticker, interval, since, lookback=0):
+        """Bars with timestamp >= `since`, plus `lookback` bars before them, copied from memory-mapped columns"""
+        with self._locked(ticker, interval, shared=True):
+            meta = self.read_meta(ticker, interval)
+            if meta is None or meta['rows'] == 0:
+                return self.read(ticker, interval)
+            path = self._path(ticker, interval)
+            rows = meta['rows']
+            ts = self._load_column(os.path.join(path, TS_FILE), np.int64, rows, True)
+            since = pd.Timestamp(since)
+            since = since.tz_localize('UTC') if since.tz is None else since
+            start = max(int(np.searchsorted(ts, since.value)) - lookback, 0)
+            data = {
+                col: np.array(self._load_column(os.path.join(path, f"{col}.f8"), np.float64, rows, True)[start:])
+                for col in OHLCV_COLUMNS
+            }
+            ts = np.array(ts[start:])
+        index = pd.DatetimeIndex(pd.to_datetime(ts, unit='ns', utc=True)).tz_convert(meta['tz'])
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def columns(self, ticker, interval, names=None):
+        """Memory-mapped OHLCV and derived columns of a series: `(rows, {'ts': ..., name: ...})`"""
+        with self._locked(ticker, interval, shared=True):
+            meta = self.read_meta(ticker, interval)
+            if meta is None or meta['rows'] == 0:
+                return 0, {}
+            path = self._path(ticker, interval)
+            rows = meta['rows']
+            derived = meta.get('derived', {})
+            arrays = {'ts': self._load_column(os.path.join(path, TS_FILE), np.int64, rows, True)}
+            for name in names or OHLCV_COLUMNS:
+                if name in OHLCV_COLUMNS:
+                    arrays[name] = self._load_column(os.path.join(path, f"{name}.f8"), np.float64, rows, True)
+                elif name in derived:
+                    code = derived[name]['dtype']
+                    if derived[name]['rows'] < rows:
+                        raise ValueError(f"Derived column '{name}' covers {derived[name]['rows']} of {rows} bars.")
+                    arrays[name] = self._load_column(os.path.join(path, f"{name}.{code}"),
+                                                     DERIVED_DTYPES[code], rows, True)
+                else:
+                    raise KeyError(f"No column '{name}' stored for {ticker.upper()} {interval}.")
+        return rows, arrays
+
+    def write_derived(self, ticker, interval, name, values, start=0):
+        """Write a derived column (e.g. signals or ATR) at bar offset `start`, dropping any rows after it"""
+        values = np.asarray(values)
+        code = next(c for c, dtype in DERIVED_DTYPES.items() if np.dtype(dtype) == values.dtype)
+        with self._locked(ticker, interval):
+            meta = self.read_meta(ticker, interval)
+            if meta is None:
+                raise KeyError(f"No series stored for {ticker.upper()} {interval}.")
+            file = os.path.join(self._path(ticker, interval), f"{name}.{code}")
+            with open(file, 'r+b' if os.path.exists(file) else 'w+b') as f:
+                f.truncate(start * values.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(values.tobytes())
+            meta.setdefault('derived', {})[name] = {'dtype': code, 'rows': start + len(values)}
+            self._write_meta(ticker, interval, meta)
+
+    @staticmethod
+    def _load_column(path, dtype, rows, mmap):
+        if mmap:
+            return np.memmap(path, dtype=dtype, mode='r', shape=(rows,))
+        return np.fromfile(path, dtype=dtype, count=rows)
+
+    def write(self, ticker, interval, df, **meta_fields):
+        """Replace a stored series with `df`"""
+        with self._locked(ticker, interval):
+            path = self._path(ticker, interval)
+            os.makedirs(path, exist_ok=True)
+            df = self._normalize(df)
+            for name, values in self._columns(df):
+                values.tofile(os.path.join(path, name))
+            meta = self.read_meta(ticker, interval) or {}
+            meta.update(meta_fields)
+            meta.update(self._meta_for(df, meta.get('tz')))
+            self._write_meta(ticker, interval, meta)
+            return len(df)
+
+    def append(self, ticker, interval, df, **meta_fields):
+        """Append bars newer than the stored tail (a bar at the stored last timestamp replaces it)"""
+        with self._locked(ticker, interval):
+            meta = self.read_meta(ticker, interval)
+            if meta is None or meta['rows'] == 0:
+                return self.write(ticker, interval, df, **meta_fields)
+            df = self._normalize(df)
+            ts = df.index.asi8
+            keep = ts >= meta['last_ts']
+            df = df[keep]
+            rows = meta['rows']
+            if len(df) and df.index.asi8[0] == meta['last_ts']:
+                rows -= 1
+            path = self._path(ticker, interval)
+            for name, values in self._columns(df):
+                itemsize = values.dtype.itemsize
+                with open(os.path.join(path, name), 'r+b') as f:
+                    f.truncate(rows * itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(values.tobytes())
+            meta.update(meta_fields)
+            if len(df):
+                meta['rows'] = rows + len(df)
+                meta['last_ts'] = int(df.index.asi8[-1])
+            self._write_meta(ticker, interval, meta)
+            return len(df)
+
+    @staticmethod
+    def _normalize(df):
+        df = df[OHLCV_COLUMNS]
+        if df.index.tz is None:
+            df = df.tz_localize('UTC')
+        if hasattr(df.index, 'as_unit'):
+            df = df.set_axis(df.index.as_unit('ns'))
+        df = df[~df.index.duplicated(keep='last')]
+        return df.sort_index()
+
+    @staticmethod
+    def _columns(df):
+        yield TS_FILE, df.index.tz_convert('UTC').asi8.astype(np.int64)
+        for col in OHLCV_COLUMNS:
+            yield f"{col}.f8", df[col].to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def _meta_for(df, tz=None):
+        return {
+            'rows': len(df),
+            'first_ts': int(df.index.asi8[0]) if len(df) else None,
+            'last_ts': int(df.index.asi8[-1]) if len(df) else None,
+            'tz': str(df.index.tz) if len(df) else (tz or 'UTC'),
+            'columns': OHLCV_COLUMNS,
+        }
+
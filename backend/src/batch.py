@@ -0,0 +1,116 @@
+import os
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import pandas as pd
+from .config import TradingConfig as cfg
+from .bar_store import BarStore, slice_period
+from .indicator_frame import indicators_and_signals
+from .models import backtest_strategy
+
+_worker_store = None
+
+
+def _init_worker(store_root):
+    global _worker_store
+    _worker_store = BarStore(store_root)
+
+
+def store_pool(store_root, workers):
+    """Process pool whose workers each open the bar store at `store_root` (see worker_store)"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_root,))
+
+
+def worker_store():
+    """The bar store of the current store_pool worker process"""
+    return _worker_store
+
+
+def _as_timestamp(value, tz):
+    ts = pd.Timestamp(value)
+    return ts.tz_localize(tz) if ts.tz is None else ts
+
+
+def load_range(store, ticker, interval, date_range):
+    """Read stored bars for a period string or a (start, end) tuple"""
+    df = store.read(ticker, interval)
+    if isinstance(date_range, (tuple, list)):
+        start, end = date_range
+        if start is not None:
+            df = df[df.index >= _as_timestamp(start, df.index.tz)]
+        if end is not None:
+            df = df[df.index < _as_timestamp(end, df.index.tz)]
+        return df
+    return slice_period(df, date_range, interval)
+
+
+def run_job(store, ticker, interval, date_range, strategy=None):
+    """Run load -> indicators -> signals -> backtest for one series from the local store"""
+    row = {'ticker': ticker, 'interval': interval, 'range': str(date_range)}
+    try:
+        df = load_range(store, ticker, interval, date_range)
+        if len(df) < 2:
+            raise ValueError("Insufficient data in bar store.")
+        signals, df = indicators_and_signals(df, strategy)
+        _, performance = backtest_strategy(df, signals)
+        row.update(bars=len(df), start=df.index[0], end=df.index[-1], error=None)
+        row.update(performance)
+    except Exception as e:
+        row.update(bars=0, error=str(e))
+    return row
+
+
+def _run_chunk(jobs):
+    return [run_job(_worker_store, *job) for job in jobs]
+
+
+def chunks(iterable, size):
+    """Lists of up to `size` items from `iterable`, consumed lazily"""
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_backtests(tickers, intervals=('1d',), date_ranges=('1y',), store_root=None,
+                  workers=None, chunk_size=cfg.BATCH_CHUNK_SIZE, max_pending=None):
+    """Backtest every (ticker, interval, date range) combination across a process pool"""
+    store_root = store_root or cfg.BAR_STORE_DIR
+    workers = workers or cfg.BATCH_WORKERS or os.cpu_count()
+    max_pending = max_pending or 2 * workers    # Chunks in flight, so memory stays bounded for any universe
+    jobs = itertools.product(tickers, intervals, date_ranges)
+    rows = []
+    with store_pool(store_root, workers) as pool:
+        pending = set()
+        for chunk in chunks(jobs, chunk_size):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rows.extend(future.result())
+            pending.add(pool.submit(_run_chunk, chunk))
+        for future in pending:
+            rows.extend(future.result())
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values(['ticker', 'interval', 'range']).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest a ticker universe from the local bar store")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--interval', action='append', dest='intervals')
+    parser.add_argument('--period', action='append', dest='periods')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--out', help="Write the performance table to this CSV file")
+    args = parser.parse_args(argv)
+    results = run_backtests(args.tickers, args.intervals or ['1d'], args.periods or ['1y'],
+                            workers=args.workers)
+    if args.out:
+        results.to_csv(args.out, index=False)
+    print(results.to_string())
+
+
+if __name__ == '__main__':
+    main()
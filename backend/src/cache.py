@@ -0,0 +1,90 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """Thread-safe LRU cache with optional TTL, versioned entries and request coalescing"""
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key, version):
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        entry_version, value, stored_at = entry
+        if entry_version != version or (self.ttl is not None and time.monotonic() - stored_at > self.ttl):
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def get(self, key, version=None, default=None):
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value, version=None):
+        with self._lock:
+            self._data[key] = (version, value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute, version=None):
+        """Return the cached value or run `compute()` once for all concurrent callers"""
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if found:
+                self.hits += 1
+                return value
+            future = self._inflight.get((key, version))
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[(key, version)] = future
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.set(key, value, version)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop((key, version), None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
@@ -9,6 +9,18 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 class TradingConfig:
     # Data parameters
     DEFAULT_TICKER = 'AAPL'
+    BAR_STORE_DIR = os.environ.get('TRAIDE_BAR_STORE', os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'bars'))
+    BAR_STORE_MAX_AGE = 60  # Seconds before the provider is asked for new bars
+    INCREMENTAL_FETCH = True  # Only request bars newer than the stored last bar
+    FETCH_WORKERS = 16  # Concurrent provider requests for multi-ticker fetches
+    FETCH_RATE_LIMIT = 50.0  # Provider requests per second (token bucket refill rate)
+    FETCH_BURST = 50  # Requests allowed back-to-back before the rate limit applies
+    FETCH_RETRIES = 3  # Retries per provider request after the first attempt
+    FETCH_BACKOFF = 0.5  # Seconds before the first retry, doubled on each further retry
+    FETCH_BACKOFF_MAX = 8.0
+    LOCAL_RESAMPLING = True  # Derive coarser intervals from stored base bars instead of fetching them
+    RESAMPLE_BASE_INTERVAL = '1m'
+    RESAMPLED_INTERVALS = ('5m', '15m', '1h', '1d')  # Tiers kept up to date from the base series
     TIMEFRAMES = {
         '1m': '1 Minute',
         '5m': '5 Minutes',
@@ -18,6 +30,7 @@ class TradingConfig:
         '5d': '5 Days',
         '1mo': '1 Month'
     }
+    INTERVAL_MAX_DAYS = {'1m': 7, '2m': 60, '5m': 60, '15m': 60, '30m': 60, '60m': 730, '1h': 730}  # Longest period the provider serves per intraday interval
     
     # Technical indicators
     RSI_PERIOD = 14
@@ -26,21 +39,88 @@ class TradingConfig:
     MACD_SIGNAL = 9
     BB_PERIOD = 20
     BB_STD = 2
+    COMPACT_INDICATORS = False  # Build indicators into one preallocated frame (see indicator_frame.py)
+    INDICATOR_DTYPE = 'float64'  # Storage dtype of compact frames; 'float32' halves their memory
     
     # Trading parameters
     RISK_REWARD_RATIO = 2.0
     STOP_LOSS_PCT = 0.02
     TAKE_PROFIT_PCT = 0.04
+    RSI_OVERSOLD = 30
+    RSI_OVERBOUGHT = 70
+    STOCH_OVERSOLD = 20
+    STOCH_OVERBOUGHT = 80
+    ATR_STOP_MULTIPLIER = 2
+    MACD_CROSS_THRESHOLD = 0.0  # Minimum MACD - signal gap for a crossover
+    SIGNAL_RULES = {  # Signal conditions as rule expressions (see rules.py); names not in the frame are parameters
+        'entry': "RSI < rsi_oversold and MACD - MACD_signal > macd_threshold and Stoch_K < stoch_oversold "
+                 "and Close > VWAP",
+        'exit': "RSI > rsi_overbought or Close > BB_high or Stoch_K > stoch_overbought "
+                "or MACD - MACD_signal < -macd_threshold",
+        'stop_loss': "Close < BB_low or Close < prev(Close) - ATR * atr_multiplier",
+    }
     
     # LSTM model parameters
     SEQUENCE_LENGTH = 10
     TRAIN_TEST_SPLIT = 0.8
     EPOCHS = 50
     BATCH_SIZE = 32
+    FINE_TUNE_EPOCHS = 5  # Warm-start epochs on newly arrived bars
+    MODEL_DIR = os.environ.get('TRAIDE_MODEL_DIR', os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'models'))
+    MODEL_CACHE_SIZE = 16  # Loaded models kept in memory per process
+    WALK_FORWARD_FOLDS = 5  # Test windows in a walk-forward evaluation
+    WALK_FORWARD_WORKERS = None  # Fold processes (None = all cores, at most one per fold)
+    WALK_FORWARD_THREADS = None  # TensorFlow intra-op threads per fold process (None = cores / workers)
     
     # Backtesting
     INITIAL_CAPITAL = 100000.0
+    BATCH_WORKERS = None  # Process pool size for batch runs (None = all cores)
+    BATCH_CHUNK_SIZE = 8  # Jobs sent to a worker per task
+    SWEEP_BATCH_SIZE = 256  # Parameter combinations evaluated per boolean-matrix batch
+    SLIPPAGE_PCT = 0.0005  # Adverse fill slippage per side in the event-driven backtester
+    COMMISSION_PCT = 0.0  # Commission per side as a fraction of traded value
+    COMMISSION_PER_TRADE = 0.0  # Fixed commission per side
+    EVENT_CHUNK_BARS = 1_000_000  # Bars loaded per chunk when streaming from the bar store
+    INDICATOR_WARMUP_BARS = 1000  # Extra history read before a chunk so its indicators have converged
+    HISTORY_FILE = os.environ.get('TRAIDE_HISTORY_FILE', os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'history.h5'))
+    HISTORY_CHUNK_ROWS = 65536  # HDF5 storage chunk (rows per compressed block)
+    HISTORY_COMPRESSION = 'lzf'  # Fast enough to keep up with the disk; None stores raw contiguous blocks
+    PORTFOLIO_MAX_POSITIONS = 10  # Positions open at once in a portfolio backtest
+    PORTFOLIO_POSITION_PCT = 0.1  # Equity allocated to each new position
+    PORTFOLIO_PRICE_DTYPE = 'float32'  # Close matrix dtype; 1,000 tickers x 100k bars take 400 MB
+    
+    # Market scanner
+    WATCHLIST = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'JPM', 'V', 'UNH']
+    WATCHLIST_FILE = os.environ.get('TRAIDE_WATCHLIST')  # One ticker per line; overrides WATCHLIST
+    SCAN_PERIOD = '5d'
+    SCAN_INTERVAL = '5m'
+    SCAN_WORKERS = None  # Process pool size for scans (None = all cores)
+    SCAN_CHUNK_SIZE = 32  # Symbols evaluated per worker task
+    SCAN_CACHE_SIZE = 10000  # Latest-bar results kept per process
+    PRECOMPUTE = os.environ.get('TRAIDE_PRECOMPUTE', '0') == '1'  # Keep watchlist dashboards warm in the background
+    PRECOMPUTE_PERIODS = ('1d', '5d', '1mo')  # Dashboard timeframes precomputed per watched symbol
+    PRECOMPUTE_INTERVALS = ('1m', '5m', '15m', '1h', '1d')
+    PRECOMPUTE_WORKERS = 4  # Concurrent precompute jobs
+    PRECOMPUTE_MAX_PENDING = 64  # Outstanding jobs before new ones are deferred
+    PRECOMPUTE_DELAY = 2.0  # Seconds after a bar boundary before refreshing, so the closed bar is published
+    PRECOMPUTE_JITTER = 5.0  # Random extra delay per job (seconds) to spread provider calls
     
     # UI Settings
     CHART_HEIGHT = 800
-    UPDATE_INTERVAL = 60000  # 1 minute in milliseconds
\ No newline at end of file
+    CHART_WIDTH_PX = 1400  # Approximate plot width used to size downsampling
+    CHART_MAX_POINTS = CHART_WIDTH_PX  # Line points per trace (about one per pixel)
+    CHART_PX_PER_CANDLE = 3  # Candles need a few pixels each to stay readable
+    DEFAULT_INDICATORS = ('rsi', 'macd')  # Indicator chart selection on page load (and the one precomputed)
+    WEBGL_MIN_POINTS = 1000  # Line traces at least this long render with Scattergl
+    UPDATE_INTERVAL = 60000  # 1 minute in milliseconds
+    LIVE_BUFFER_BARS = 500  # Recent bars with indicators/signals kept per live series
+    LIVE_MAX_SERIES = 256  # Live series kept in memory per process
+    DASHBOARD_CACHE_SIZE = 256  # Computed symbol/period/interval results kept per process
+    DASHBOARD_CACHE_TTL = 300  # Seconds before a cached result is recomputed anyway
+    CACHE_BACKEND = os.environ.get('TRAIDE_CACHE', 'local')  # 'shared': one cache for all server workers on the host
+    SHARED_CACHE_PATH = os.environ.get('TRAIDE_SHARED_CACHE', os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'cache.sqlite'))
+    SHARED_CACHE_MAX_MB = 512  # Pickled values kept in the shared cache before LRU eviction
+    SHARED_CACHE_LOCK_TIMEOUT = 60  # Seconds after a worker stops renewing its compute lock (e.g. crashed) before it is taken over
+    SHARED_CACHE_FLUSH_INTERVAL = 5.0  # Seconds between writes of a worker's hit/miss counts (stats lag by up to this)
+    PROFILE_DIR = os.environ.get('TRAIDE_PROFILE_DIR')  # Dump a cProfile per request here (None = off)
+    PROFILE_TOKEN = os.environ.get('TRAIDE_PROFILE_TOKEN')  # Required to toggle profiling at runtime (None = no toggle)
\ No newline at end of file
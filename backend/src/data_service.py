@@ -1,21 +1,166 @@
-import yfinance as yf
+import time
+import logging
 import pandas as pd
 import numpy as np
 from ta.trend import MACD
 from ta.momentum import RSIIndicator
 from ta.volatility import BollingerBands
 from .config import TradingConfig as cfg
+from .bar_store import BarStore, interval_to_timedelta, period_days, slice_period
+from .providers import YFinanceProvider
+from .resample import update_tier
+from .metrics import metrics
 
-def fetch_data(ticker, period, interval):    # Added interval parameter
-    """Fetch stock data from Yahoo Finance"""
+logger = logging.getLogger(__name__)
+
+_store = None
+_provider = None
+
+def configure(store=None, provider=None):
+    """Swap the bar store and/or data provider used by fetch_data"""
+    global _store, _provider
+    if store is not None:
+        _store = store
+    if provider is not None:
+        _provider = provider
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = BarStore(cfg.BAR_STORE_DIR)
+    return _store
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        _provider = YFinanceProvider()
+    return _provider
+
+def _max_age(interval):
+    """Seconds a stored series is served without asking the provider again"""
+    return min(interval_to_timedelta(interval).total_seconds(), cfg.BAR_STORE_MAX_AGE)
+
+def fetch_epoch(interval):
+    """Counter that advances once per freshness window, for caching fetch results across workers"""
+    return int(time.time() // _max_age(interval))
+
+def _bar_bounds(interval, meta=None, now=None):
+    """Wall times (epoch seconds) at which the `interval` bar containing `now` starts and ends"""
+    # Laid out from the stored last bar in its own time zone, as in resample.bin_starts; else UTC multiples
+    now = time.time() if now is None else now
+    width = interval_to_timedelta(interval).value
+    tz = meta['tz'] if meta and meta.get('rows') else None
+    anchor = pd.Timestamp(meta['last_ts'], tz='UTC').tz_convert(tz).tz_localize(None).value if tz else 0
+    local_now = pd.Timestamp(now, unit='s', tz='UTC')
+    local_now = (local_now.tz_convert(tz).tz_localize(None) if tz else local_now).value
+    start = anchor + (local_now - anchor) // width * width
+    bounds = []
+    for ns in (start, start + width):
+        ts = pd.Timestamp(ns)
+        if tz:
+            ts = ts.tz_localize(tz, ambiguous=True, nonexistent='shift_forward')
+        bounds.append(ts.value / 1e9)
+    return tuple(bounds)
+
+def next_refresh(interval, ticker=None, store=None):
+    """Wall time at which the current `interval` bar closes (of `ticker`'s stored series, when given)"""
+    meta = (store or get_store()).read_meta(ticker, interval) if ticker else None
+    return _bar_bounds(interval, meta)[1]
+
+def supported(period, interval):
+    """True when the provider serves `interval` bars over `period` and the period spans more than one bar"""
+    days = period_days(period)
+    if days is None:
+        return interval not in cfg.INTERVAL_MAX_DAYS
+    return (interval_to_timedelta(interval) < pd.Timedelta(days=days)
+            and days <= cfg.INTERVAL_MAX_DAYS.get(interval, days))
+
+def _covers(meta, period):
+    """True when the stored series already spans `period`"""
+    wanted = period_days(period)
+    covered = meta.get('coverage_days')
+    if covered == 'max':
+        return True
+    return wanted is not None and covered is not None and wanted <= covered
+
+def _refresh(store, provider, ticker, period, interval):
+    """Pull `period` from the provider and merge it into the store"""
+    with metrics.timer('provider_request', provider=provider.name, kind='full'):
+        df = provider.history(ticker, interval, period=period)
+    if df.empty:
+        return 0
+    meta = store.read_meta(ticker, interval)
+    days = period_days(period)
+    coverage = 'max' if days is None else days
+    fields = {'fetched_at': time.time(), 'coverage_days': coverage}
+    if meta is None or meta['rows'] == 0:
+        return store.write(ticker, interval, df, **fields)
+    first = pd.Timestamp(meta['first_ts'], tz='UTC')
+    last = pd.Timestamp(meta['last_ts'], tz='UTC')
+    if df.index[0] < first:
+        # Fetched window reaches further back than the stored series: rewrite it
+        stored = store.read(ticker, interval)
+        merged = pd.concat([stored, df[stored.columns]])
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        return store.write(ticker, interval, merged, **fields)
+    if df.index[0] <= last and coverage != 'max' and meta.get('coverage_days') is not None:
+        # Contiguous with what we had, so the older coverage still holds
+        old = meta['coverage_days']
+        fields['coverage_days'] = old if old == 'max' else max(old, coverage)
+    return store.append(ticker, interval, df, **fields)
+
+def _fetch_delta(store, provider, ticker, interval):
+    """Pull only bars from the stored last bar onwards (it may have been forming; the store replaces it)"""
+    last = store.last_timestamp(ticker, interval)
+    with metrics.timer('provider_request', provider=provider.name, kind='delta'):
+        df = provider.history(ticker, interval, start=last)
+    if df.empty:
+        # Nothing new (providers may return a frame without columns): just mark the series fresh
+        store.update_meta(ticker, interval, fetched_at=time.time())
+        return 0
+    return store.append(ticker, interval, df, fetched_at=time.time())
+
+def _resampled(store, ticker, period, interval):
+    """True when `interval` can be derived from a stored base series that spans `period`"""
+    if not cfg.LOCAL_RESAMPLING or interval not in cfg.RESAMPLED_INTERVALS:
+        return False
+    base = store.read_meta(ticker, cfg.RESAMPLE_BASE_INTERVAL)
+    return base is not None and base['rows'] > 0 and _covers(base, period)
+
+def refresh(ticker, period, interval, store=None, provider=None, incremental=None):
+    """Bring the stored series up to date for `period` without reading it back"""
+    store = store or get_store()
+    provider = provider or get_provider()
+    if incremental is None:
+        incremental = cfg.INCREMENTAL_FETCH
+    if _resampled(store, ticker, period, interval):    # Switching interval costs no provider round trip
+        refresh(ticker, period, cfg.RESAMPLE_BASE_INTERVAL, store, provider, incremental)
+        with metrics.stage('resample'):
+            update_tier(store, ticker, interval)
+        return store
+    meta = store.read_meta(ticker, interval)
+    covered = meta is not None and _covers(meta, period)
+    # Fresh: fetched within the max age and during the current bar, so a closed bar is never missed
+    fetched_at = meta.get('fetched_at', 0) if meta is not None else 0
+    fresh = (meta is not None and time.time() - fetched_at < _max_age(interval)
+             and fetched_at >= _bar_bounds(interval, meta)[0])
+    if covered and not fresh and incremental:
+        _fetch_delta(store, provider, ticker, interval)
+    elif not (covered and fresh):
+        _refresh(store, provider, ticker, period, interval)
+    return store
+
+def fetch_data(ticker, period, interval, store=None, provider=None, incremental=None):    # Added interval parameter
+    """Fetch stock data, served from the local bar store when it is fresh"""
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period=period, interval=interval)    # Passed interval
+        store = refresh(ticker, period, interval, store, provider, incremental)
+        df = slice_period(store.read(ticker, interval), period, interval)
         if df.empty:
             raise ValueError(f"No data found for ticker '{ticker}' with period '{period}' and interval '{interval}'.")
         return df
     except Exception as e:
-        print(f"Error fetching data for ticker '{ticker}' with period '{period}' and interval '{interval}': {str(e)}")
+        logger.warning("Error fetching data for ticker '%s' with period '%s' and interval '%s': %s",
+                       ticker, period, interval, e)
         raise
 
 def calculate_indicators(df):
@@ -0,0 +1,257 @@
+import argparse
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+from .bar_store import BarStore
+from .indicator_frame import iter_chunk_signals
+
+# Derived columns the engine reads next to the OHLCV bars
+SIGNAL_COLUMNS = ['entry', 'exit', 'ATR']
+STOP_MODES = (None, 'pct', 'atr')
+FILL_MODES = ('next_open', 'close')
+
+
+def compute_signal_columns(store, ticker, interval, strategy=None, chunk_size=cfg.EVENT_CHUNK_BARS,
+                           warmup=cfg.INDICATOR_WARMUP_BARS):
+    """Compute entry/exit (including stop_loss)/ATR chunk by chunk and store them as derived columns"""
+    rows, arrays = store.columns(ticker, interval)
+    meta = store.read_meta(ticker, interval)
+
+    def read(lo, hi):
+        index = pd.to_datetime(np.asarray(arrays['ts'][lo:hi]), unit='ns', utc=True).tz_convert(meta['tz'])
+        return pd.DataFrame({name: np.asarray(values[lo:hi]) for name, values in arrays.items() if name != 'ts'},
+                            index=index)
+
+    for start, signals, frame in iter_chunk_signals(read, rows, strategy, chunk_size, warmup, compact=True):
+        store.write_derived(ticker, interval, 'entry', signals['entry'].to_numpy(dtype=np.uint8), start)
+        store.write_derived(ticker, interval, 'exit',
+                            (signals['exit'] | signals['stop_loss']).to_numpy(dtype=np.uint8), start)
+        store.write_derived(ticker, interval, 'ATR', frame['ATR'].to_numpy(dtype=np.float64), start)
+    return rows
+
+
+class StoreSource:
+    """Bars plus signal columns streamed from memory-mapped bar store files"""
+
+    def __init__(self, store, ticker, interval):
+        self.rows, self.arrays = store.columns(ticker, interval,
+                                               ['Open', 'High', 'Low', 'Close'] + SIGNAL_COLUMNS)
+        self.tz = (store.read_meta(ticker, interval) or {}).get('tz')
+
+    def chunks(self, chunk_size):
+        for start in range(0, self.rows, chunk_size):
+            yield {name: np.asarray(values[start:start + chunk_size]) for name, values in self.arrays.items()}
+
+
+class FrameSource:
+    """In-memory bars and signals, e.g. from TradingStrategy.calculate_signals"""
+
+    def __init__(self, df, signals, atr=None):
+        close = df['Close'].to_numpy(dtype=np.float64)
+        index = df.index.as_unit('ns')
+        self.arrays = {
+            'ts': index.tz_convert('UTC').asi8 if index.tz is not None else index.asi8,
+            'Close': close,
+            'entry': signals['entry'].to_numpy(dtype=bool),
+            'exit': (signals['exit'] | signals['stop_loss']).to_numpy(dtype=bool)
+            if 'stop_loss' in signals else signals['exit'].to_numpy(dtype=bool),
+            'ATR': (atr if atr is not None else df['ATR'] if 'ATR' in df else pd.Series(np.nan, index=df.index))
+            .to_numpy(dtype=np.float64),
+        }
+        for name in ('Open', 'High', 'Low'):    # Tick data trades every event at its Close
+            self.arrays[name] = df[name].to_numpy(dtype=np.float64) if name in df else close
+        self.rows = len(df)
+        self.tz = df.index.tz
+
+    def chunks(self, chunk_size):
+        for start in range(0, self.rows, chunk_size):
+            yield {name: values[start:start + chunk_size] for name, values in self.arrays.items()}
+
+
+def _first(mask, start, stop, step=64):
+    """Position of the first True of `mask(lo, hi)` in [start, stop), or None"""
+    lo = start
+    while lo < stop:
+        hi = min(lo + step, stop)
+        hits = mask(lo, hi)
+        if hits.any():
+            return lo + int(hits.argmax())
+        lo = hi
+        step *= 2    # Cost follows the distance to the hit, not the chunk length
+    return None
+
+
+class EventBacktester:
+    """Event-driven long-only backtester with intrabar stops, slippage and commissions"""
+
+    def __init__(self, stop='pct', stop_loss_pct=cfg.STOP_LOSS_PCT, atr_multiplier=cfg.ATR_STOP_MULTIPLIER,
+                 take_profit_pct=cfg.TAKE_PROFIT_PCT, slippage=cfg.SLIPPAGE_PCT, commission=cfg.COMMISSION_PCT,
+                 commission_fixed=cfg.COMMISSION_PER_TRADE, fill='next_open',
+                 initial_capital=cfg.INITIAL_CAPITAL, chunk_size=cfg.EVENT_CHUNK_BARS):
+        if stop not in STOP_MODES:
+            raise ValueError(f"Unknown stop mode '{stop}'; expected one of {STOP_MODES}")
+        if fill not in FILL_MODES:
+            raise ValueError(f"Unknown fill mode '{fill}'; expected one of {FILL_MODES}")
+        self.stop = stop
+        self.stop_loss_pct = stop_loss_pct
+        self.atr_multiplier = atr_multiplier
+        self.take_profit_pct = take_profit_pct
+        self.slippage = slippage
+        self.commission = commission
+        self.commission_fixed = commission_fixed
+        self.fill = fill
+        self.initial_capital = initial_capital
+        self.chunk_size = chunk_size
+
+    def _levels(self, price, atr):
+        stop = -np.inf
+        if self.stop == 'pct':
+            stop = price * (1 - self.stop_loss_pct)
+        elif self.stop == 'atr' and atr == atr:
+            stop = price - self.atr_multiplier * atr
+        take = price * (1 + self.take_profit_pct) if self.take_profit_pct else np.inf
+        return stop, take
+
+    def run(self, source):
+        """Replay a source; returns `(trades, performance)` like backtest_strategy"""
+        s = self._state = {
+            'balance': self.initial_capital, 'shares': 0.0, 'pending': None, 'signal_atr': np.nan,
+            'events': 0, 'commission': 0.0, 'reasons': {'signal': 0, 'stop': 0, 'take_profit': 0},
+        }
+        self.trades = []
+        self._tz = getattr(source, 'tz', None) or 'UTC'
+        for chunk in source.chunks(self.chunk_size):
+            self._run_chunk(chunk)
+            s['events'] += len(chunk['Close'])
+        return self.trades, self._performance()
+
+    def _buy(self, price, ts, atr):
+        s = self._state
+        fill = price * (1 + self.slippage)
+        cash = s['balance'] - self.commission_fixed
+        s['shares'] = cash / (fill * (1 + self.commission))
+        s['commission'] += s['shares'] * fill * self.commission + self.commission_fixed
+        s['entry'] = (ts, fill, s['balance'])
+        s['stop'], s['take'] = self._levels(fill, atr)
+
+    def _sell(self, price, ts, reason):
+        s = self._state
+        fill = price * (1 - self.slippage)
+        value = s['shares'] * fill
+        fee = value * self.commission + self.commission_fixed
+        s['commission'] += fee
+        entry_ts, entry_price, invested = s['entry']
+        s['balance'] = value - fee
+        s['shares'] = 0.0
+        s['reasons'][reason] += 1
+        self.trades.append({
+            'entry_date': pd.Timestamp(entry_ts, tz='UTC').tz_convert(self._tz),
+            'exit_date': pd.Timestamp(ts, tz='UTC').tz_convert(self._tz),
+            'entry_price': entry_price,
+            'exit_price': fill,
+            'returns': (fill - entry_price) / entry_price * 100,
+            'pnl': s['balance'] - invested,
+            'exit_reason': reason,
+        })
+
+    def _run_chunk(self, c):
+        s = self._state
+        o, h, l, close = c['Open'], c['High'], c['Low'], c['Close']
+        ts, atr = c['ts'], c['ATR']
+        entry_idx = np.flatnonzero(c['entry'])
+        exit_idx = np.flatnonzero(c['exit'])
+        m = len(close)
+        if m == 0:
+            return
+        s['last_close'] = close[-1]
+        pos = 0
+        while pos < m:
+            if s['pending'] == 'buy':
+                self._buy(o[pos], ts[pos], s['signal_atr'])
+                s['pending'] = None
+            elif s['pending'] == 'sell':
+                self._sell(o[pos], ts[pos], 'signal')
+                s['pending'] = None
+
+            if not s['shares']:
+                k = np.searchsorted(entry_idx, pos)
+                if k == len(entry_idx):
+                    return
+                e = entry_idx[k]
+                if self.fill == 'close':
+                    self._buy(close[e], ts[e], atr[e])
+                else:
+                    s['pending'], s['signal_atr'] = 'buy', atr[e]
+                pos = e + 1
+                continue
+
+            # Long: the first bar that touches a level, or the first exit signal
+            stop, take = s['stop'], s['take']
+            k = np.searchsorted(exit_idx, pos)
+            sig = exit_idx[k] if k < len(exit_idx) else None
+            hit = None
+            if stop > -np.inf or take < np.inf:
+                end = m if sig is None else sig + 1
+                hit = _first(lambda lo, hi: (l[lo:hi] <= stop) | (h[lo:hi] >= take), pos, end)
+            if hit is not None and (sig is None or hit <= sig):
+                if o[hit] <= stop or l[hit] <= stop:    # Gaps fill at the open; a bar touching both stops out
+                    self._sell(min(o[hit], stop), ts[hit], 'stop')
+                else:
+                    self._sell(max(o[hit], take), ts[hit], 'take_profit')
+                pos = hit    # An entry signal at this bar's close may still fire
+            elif sig is not None:
+                if self.fill == 'close':
+                    self._sell(close[sig], ts[sig], 'signal')
+                else:
+                    s['pending'] = 'sell'
+                pos = sig + 1
+            else:
+                return
+
+    def _performance(self):
+        s = self._state
+        balance = s['balance']
+        returns = pd.Series([t['returns'] for t in self.trades], dtype=float)
+        performance = {
+            'total_trades': len(self.trades),
+            'winning_trades': int((returns > 0).sum()),
+            'avg_return': returns.mean() if len(returns) else 0,
+            'max_return': returns.max() if len(returns) else 0,
+            'min_return': returns.min() if len(returns) else 0,
+            'final_balance': balance,
+            'total_return': (balance - self.initial_capital) / self.initial_capital * 100 if self.trades else 0,
+            'commission_paid': s['commission'],
+            'events': s['events'],
+            'open_position': bool(s['shares']),
+            # Realized balance plus an open position marked at the last close
+            'market_value': s['shares'] * s['last_close'] if s['shares'] else balance,
+        }
+        performance.update({f"{reason}_exits": count for reason, count in s['reasons'].items()})
+        return performance
+
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Event-driven backtest of a stored series")
+    parser.add_argument('ticker')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--stop', choices=['pct', 'atr', 'none'], default='pct')
+    parser.add_argument('--fill', choices=FILL_MODES, default='next_open')
+    parser.add_argument('--recompute', action='store_true', help="Recompute the signal columns first")
+    args = parser.parse_args(argv)
+    store = BarStore(cfg.BAR_STORE_DIR)
+    derived = (store.read_meta(args.ticker, args.interval) or {}).get('derived', {})
+    if args.recompute or any(name not in derived for name in SIGNAL_COLUMNS):
+        compute_signal_columns(store, args.ticker, args.interval)
+    engine = EventBacktester(stop=None if args.stop == 'none' else args.stop, fill=args.fill)
+    started = time.perf_counter()
+    _, performance = engine.run(StoreSource(store, args.ticker, args.interval))
+    elapsed = time.perf_counter() - started
+    for key, value in performance.items():
+        print(f"{key}: {value}")
+    print(f"{performance['events'] / elapsed:,.0f} events/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import TradingConfig as cfg
+from .data_service import fetch_data, refresh, get_store, get_provider
+from .providers import DataProvider
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available and take them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def provider_bucket(name):
+    """The process-wide token bucket of provider `name`, shared by every caller"""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            bucket = _buckets[name] = TokenBucket(cfg.FETCH_RATE_LIMIT, cfg.FETCH_BURST)
+        return bucket
+
+
+def backoff_delays(retries, base, cap):
+    """Exponential backoff with full jitter: one delay per retry"""
+    return [random.uniform(0, min(cap, base * 2 ** attempt)) for attempt in range(retries)]
+
+
+class ResilientProvider(DataProvider):
+    """Wraps a provider with a shared rate limit and retries with exponential backoff"""
+
+    def __init__(self, provider, bucket=None, retries=cfg.FETCH_RETRIES,
+                 backoff=cfg.FETCH_BACKOFF, backoff_max=cfg.FETCH_BACKOFF_MAX):
+        self.provider = provider
+        self.name = provider.name
+        self.bucket = bucket or provider_bucket(provider.name)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+    def history(self, ticker, interval, period=None, start=None):
+        delays = backoff_delays(self.retries, self.backoff, self.backoff_max)
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                return self.provider.history(ticker, interval, period=period, start=start)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logger.debug("Retrying %s %s after error: %s", ticker, interval, e)
+                time.sleep(delays[attempt])
+
+
+def fetch_many(tickers, period, interval, store=None, provider=None, workers=cfg.FETCH_WORKERS,
+               bucket=None, retries=cfg.FETCH_RETRIES, read=True):
+    """Fetch many tickers concurrently through the bar store: `(frames, errors)` keyed by ticker"""
+    store = store or get_store()
+    provider = provider or get_provider()
+    if not isinstance(provider, ResilientProvider):
+        provider = ResilientProvider(provider, bucket, retries)
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+
+    def fetch_one(ticker):
+        if read:
+            return fetch_data(ticker, period, interval, store, provider)
+        refresh(ticker, period, interval, store, provider)
+        return None
+
+    frames, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers or 1, len(tickers) or 1))) as pool:
+        futures = {ticker: pool.submit(fetch_one, ticker) for ticker in tickers}
+        for ticker, future in futures.items():
+            try:
+                df = future.result()
+            except Exception as e:
+                errors[ticker] = str(e)
+            else:
+                if df is not None:
+                    frames[ticker] = df
+    if errors:
+        logger.warning("Failed to fetch %d of %d tickers (%s)", len(errors), len(tickers), interval)
+    return frames, errors
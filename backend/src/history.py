@@ -0,0 +1,153 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import h5py
+from .config import TradingConfig as cfg
+from .bar_store import BarStore
+from .indicator_frame import iter_chunk_signals
+from .providers import OHLCV_COLUMNS
+from .streaming import INDICATOR_COLUMNS
+
+SIGNAL_NAMES = ['entry', 'exit', 'stop_loss']
+
+
+class HistoryStore:
+    """HDF5 file of long OHLCV histories under `/<TICKER>/<interval>/`, plus their indicators and signals"""
+
+    def __init__(self, path=cfg.HISTORY_FILE, chunk_rows=cfg.HISTORY_CHUNK_ROWS,
+                 compression=cfg.HISTORY_COMPRESSION):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self._file = None
+
+    @property
+    def file(self):
+        if self._file is None:
+            self._file = h5py.File(self.path, 'a')
+        return self._file
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _group(self, ticker, interval):
+        return self.file.get(f"{ticker.upper()}/{interval}")
+
+    def series(self):
+        """(ticker, interval) of every stored series"""
+        return [(ticker, interval) for ticker in self.file for interval in self.file[ticker]]
+
+    def rows(self, ticker, interval):
+        group = self._group(ticker, interval)
+        return 0 if group is None or 'bars/ts' not in group else len(group['bars/ts'])
+
+    def _dataset(self, group, name, dtype, rows):
+        """Resizable chunked dataset of `rows` rows, created on first use"""
+        if name in group:
+            dataset = group[name]
+            dataset.resize((rows,))
+            return dataset
+        return group.create_dataset(name, shape=(rows,), maxshape=(None,), dtype=dtype,
+                                    chunks=(self.chunk_rows,), compression=self.compression,
+                                    shuffle=self.compression is not None)
+
+    def append(self, ticker, interval, df):
+        """Append bars newer than the stored tail (a bar at the stored last timestamp replaces it)"""
+        df = BarStore._normalize(df)
+        group = self.file.require_group(f"{ticker.upper()}/{interval}")
+        group.attrs.setdefault('tz', str(df.index.tz))
+        rows = self.rows(ticker, interval)
+        ts = df.index.tz_convert('UTC').asi8
+        if rows:
+            last = group['bars/ts'][rows - 1]
+            df, ts = df[ts >= last], ts[ts >= last]
+            if len(ts) and ts[0] == last:
+                rows -= 1
+        total = rows + len(df)
+        self._dataset(group, 'bars/ts', np.int64, total)[rows:] = ts
+        for name in OHLCV_COLUMNS:
+            self._dataset(group, f"bars/{name}", np.float64, total)[rows:] = df[name].to_numpy(dtype=np.float64)
+        group.attrs['derived_rows'] = min(group.attrs.get('derived_rows', 0), rows)
+        return len(df)
+
+    def read(self, ticker, interval, start=0, stop=None, derived=False):
+        """Bars `start:stop` as a DataFrame, with indicator and signal columns when `derived`"""
+        group = self._group(ticker, interval)
+        if group is None:
+            raise KeyError(f"No history stored for {ticker.upper()} {interval}.")
+        bars = group['bars']
+        index = pd.to_datetime(bars['ts'][start:stop], unit='ns', utc=True).tz_convert(group.attrs['tz'])
+        data = {name: bars[name][start:stop] for name in OHLCV_COLUMNS}
+        if derived:
+            if group.attrs.get('derived_rows', 0) < (stop or len(bars['ts'])):
+                raise ValueError(f"Derived columns of {ticker.upper()} {interval} are out of date; run compute.")
+            data.update({name: dataset[start:stop] for name, dataset in group['derived'].items()})
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def import_bars(self, store, ticker, interval, chunk_size=cfg.EVENT_CHUNK_BARS):
+        """Copy a BarStore series into the file in chunks, without loading it whole"""
+        rows, arrays = store.columns(ticker, interval)
+        meta = store.read_meta(ticker, interval)
+        for start in range(0, rows, chunk_size):
+            ts = np.asarray(arrays['ts'][start:start + chunk_size])
+            index = pd.to_datetime(ts, unit='ns', utc=True).tz_convert(meta['tz'])
+            self.append(ticker, interval, pd.DataFrame(
+                {name: np.asarray(arrays[name][start:start + chunk_size]) for name in OHLCV_COLUMNS}, index=index))
+        return rows
+
+    def compute(self, ticker, interval, strategy=None, chunk_size=cfg.EVENT_CHUNK_BARS,
+                warmup=cfg.INDICATOR_WARMUP_BARS, compact=None, dtype=None):
+        """Run indicators and signals over a stored series chunk by chunk and write them to `derived/`"""
+        rows = self.rows(ticker, interval)
+        group = self._group(ticker, interval)
+        group.attrs['derived_rows'] = 0
+        indicator_dtype = np.dtype(dtype or cfg.INDICATOR_DTYPE)
+        outputs = {name: self._dataset(group, f"derived/{name}", indicator_dtype, rows)
+                   for name in INDICATOR_COLUMNS}
+        outputs.update({name: self._dataset(group, f"derived/{name}", bool, rows) for name in SIGNAL_NAMES})
+
+        def read(lo, hi):
+            return self.read(ticker, interval, lo, hi)
+
+        for start, signals, frame in iter_chunk_signals(read, rows, strategy, chunk_size, warmup, compact, dtype):
+            end = start + len(frame)
+            for name in INDICATOR_COLUMNS:
+                outputs[name][start:end] = frame[name].to_numpy(dtype=indicator_dtype)
+            for name in SIGNAL_NAMES:
+                outputs[name][start:end] = signals[name].to_numpy(dtype=bool)
+            group.attrs['derived_rows'] = end    # How far an interrupted run got
+        self.file.flush()
+        return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import bar store series into the HDF5 history file and "
+                                                 "compute their indicators and signals out of core")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--file', default=cfg.HISTORY_FILE)
+    parser.add_argument('--chunk', type=int, default=cfg.EVENT_CHUNK_BARS, help="Bars per processing chunk")
+    parser.add_argument('--no-import', action='store_true', help="Only recompute series already in the file")
+    args = parser.parse_args(argv)
+    store = BarStore(cfg.BAR_STORE_DIR)
+    with HistoryStore(args.file) as history:
+        for ticker in args.tickers:
+            if not args.no_import:
+                history.import_bars(store, ticker, args.interval, args.chunk)
+            started = time.perf_counter()
+            rows = history.compute(ticker, args.interval, chunk_size=args.chunk)
+            elapsed = time.perf_counter() - started
+            print(f"{ticker} {args.interval}: {rows:,} bars in {elapsed:.1f}s ({rows / elapsed:,.0f} bars/s)")
+
+
+if __name__ == '__main__':
+    main()
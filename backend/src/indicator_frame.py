@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+from .data_service import calculate_indicators
+from .models import TradingStrategy
+from .providers import OHLCV_COLUMNS
+from .streaming import INDICATOR_COLUMNS
+
+FRAME_COLUMNS = OHLCV_COLUMNS + INDICATOR_COLUMNS
+
+
+def allocate_frame(index, dtype=np.float64):
+    """Empty single-block frame with OHLCV and indicator columns, plus its backing array"""
+    # Column-major, so each column is a contiguous slice the frame wraps without a copy
+    values = np.empty((len(index), len(FRAME_COLUMNS)), dtype=dtype, order='F')
+    frame = pd.DataFrame(values, index=index, columns=FRAME_COLUMNS, copy=False)
+    return frame, values
+
+
+def _series(values):
+    return pd.Series(values, copy=False)
+
+
+def _cumsum_skipna(values):
+    """In-place cumulative sum that leaves NaN entries as NaN and skips them, like Series.cumsum"""
+    missing = np.isnan(values)
+    if missing.any():
+        values[missing] = 0.0
+        np.cumsum(values, out=values)
+        values[missing] = np.nan
+    else:
+        np.cumsum(values, out=values)
+
+
+def indicator_frame(df, dtype=None):
+    """calculate_indicators + TradingStrategy.add_indicators into one preallocated frame"""
+    dtype = np.dtype(dtype or cfg.INDICATOR_DTYPE)
+    frame, values = allocate_frame(df.index, dtype)
+    col = {name: values[:, i] for i, name in enumerate(FRAME_COLUMNS)}
+    for name in OHLCV_COLUMNS:
+        col[name][:] = df[name].to_numpy()
+    n = len(df)
+    if n == 0:
+        return frame
+    close = df['Close'].to_numpy(dtype=np.float64)
+    high, low, volume = col['High'], col['Low'], col['Volume']
+    a = np.empty(n)
+    b = np.empty(n)
+
+    # RSI (ta.momentum.RSIIndicator)
+    a[0] = 0.0
+    np.subtract(close[1:], close[:-1], out=a[1:])
+    np.negative(a, out=b)
+    np.fmax(a, 0.0, out=a)
+    np.fmax(b, 0.0, out=b)
+    alpha = 1 / cfg.RSI_PERIOD
+    up = _series(a).ewm(alpha=alpha, min_periods=cfg.RSI_PERIOD, adjust=False).mean().to_numpy()
+    down = _series(b).ewm(alpha=alpha, min_periods=cfg.RSI_PERIOD, adjust=False).mean().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        col['RSI'][:] = np.where(down == 0, 100, 100 - 100 / (1 + up / down))
+
+    # MACD (ta.trend.MACD)
+    close_s = _series(close)
+    a[:] = close_s.ewm(span=cfg.MACD_FAST, min_periods=cfg.MACD_FAST, adjust=False).mean().to_numpy()
+    a -= close_s.ewm(span=cfg.MACD_SLOW, min_periods=cfg.MACD_SLOW, adjust=False).mean().to_numpy()
+    col['MACD'][:] = a
+    col['MACD_signal'][:] = _series(a).ewm(span=cfg.MACD_SIGNAL, min_periods=cfg.MACD_SIGNAL,
+                                           adjust=False).mean().to_numpy()
+
+    # Bollinger Bands (ta.volatility.BollingerBands)
+    rolling = close_s.rolling(cfg.BB_PERIOD, min_periods=cfg.BB_PERIOD)
+    a[:] = rolling.mean().to_numpy()
+    b[:] = rolling.std(ddof=0).to_numpy()
+    b *= cfg.BB_STD
+    np.add(a, b, out=col['BB_high'])
+    np.subtract(a, b, out=col['BB_low'])
+
+    # ATR: true range is the largest of the three ranges, skipping the missing previous close
+    np.subtract(high, low, out=a)
+    b[0] = np.nan
+    np.subtract(high[1:], close[:-1], out=b[1:])
+    np.abs(b, out=b)
+    np.fmax(a, b, out=a)
+    np.subtract(low[1:], close[:-1], out=b[1:])
+    np.abs(b, out=b)
+    np.fmax(a, b, out=a)
+    col['ATR'][:] = _series(a).rolling(14).mean().to_numpy()
+
+    # Stochastic oscillator
+    low_min = _series(low).rolling(14).min().to_numpy()
+    np.subtract(_series(high).rolling(14).max().to_numpy(), low_min, out=b)
+    np.subtract(close, low_min, out=a)
+    a *= 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(a, b, out=a)
+    col['Stoch_K'][:] = a
+    col['Stoch_D'][:] = _series(a).rolling(3).mean().to_numpy()
+
+    # VWAP, then OBV
+    np.multiply(close, volume, out=a)
+    _cumsum_skipna(a)
+    b[:] = volume
+    _cumsum_skipna(b)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(a, b, out=col['VWAP'])
+    a[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=a[1:])
+    np.sign(a, out=a)
+    a *= volume
+    a[np.isnan(a)] = 0.0
+    np.cumsum(a, out=a)
+    col['OBV'][:] = a
+    return frame
+
+
+def indicators(df, compact=None, dtype=None):
+    """OHLCV plus every indicator the signals read, via indicator_frame when compact mode is on"""
+    if compact is None:
+        compact = cfg.COMPACT_INDICATORS
+    if not compact:
+        return TradingStrategy().add_indicators(calculate_indicators(df))
+    return indicator_frame(df, dtype)
+
+
+def indicators_and_signals(df, strategy=None, compact=None, dtype=None):
+    """`(signals, frame)` for a bar frame, via the compact pipeline when enabled"""
+    strategy = strategy or TradingStrategy()
+    frame = indicators(df, compact, dtype)
+    return strategy.signals_from_indicators(frame), frame
+
+
+def iter_chunk_signals(read, rows, strategy=None, chunk_size=cfg.EVENT_CHUNK_BARS,
+                       warmup=cfg.INDICATOR_WARMUP_BARS, compact=None, dtype=None):
+    """Indicators and signals of a long series, one chunk at a time: yields `(start, signals, frame)`"""
+    strategy = strategy or TradingStrategy()
+    pv_total = v_total = obv_total = 0.0
+    for start in range(0, rows, chunk_size):
+        lo = max(start - warmup, 0)
+        bars = read(lo, min(start + chunk_size, rows))
+        frame = indicators(bars, compact, dtype)
+        keep = start - lo
+        close = bars['Close'].to_numpy(dtype=np.float64)
+        volume = bars['Volume'].to_numpy(dtype=np.float64)
+
+        # VWAP and OBV accumulate over the whole series: carry their running totals across chunks
+        pv = close[keep:] * volume[keep:]
+        v = volume[keep:].copy()
+        pv_sum, v_sum = np.nansum(pv), np.nansum(v)
+        _cumsum_skipna(pv)
+        _cumsum_skipna(v)
+        pv += pv_total
+        v += v_total
+        pv_total += pv_sum
+        v_total += v_sum
+        step = np.sign(np.diff(close, prepend=np.nan)[keep:]) * volume[keep:]
+        step[np.isnan(step)] = 0.0
+        obv = np.cumsum(step)
+        obv += obv_total
+        obv_total = obv[-1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pv /= v
+        # Written in place in the frame's own dtype, so a compact frame stays one float32 block
+        frame.iloc[keep:, frame.columns.get_loc('VWAP')] = pv.astype(frame['VWAP'].dtype, copy=False)
+        frame.iloc[keep:, frame.columns.get_loc('OBV')] = obv.astype(frame['OBV'].dtype, copy=False)
+        # Signals look one bar back, so they are evaluated before the warm-up rows are dropped
+        signals = strategy.signals_from_indicators(frame)
+        yield start, signals.iloc[keep:], frame.iloc[keep:]
+
+
+def frame_nbytes(frame):
+    """Bytes held by a frame's values and index"""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(frames):
+    """Per-symbol memory of resident frames: {symbol: frame} -> DataFrame sorted by size"""
+    rows = []
+    for symbol, frame in frames.items():
+        nbytes = frame_nbytes(frame)
+        rows.append({'symbol': symbol, 'bars': len(frame), 'columns': frame.shape[1],
+                     'bytes': nbytes, 'bytes_per_bar': nbytes / len(frame) if len(frame) else 0.0})
+    report = pd.DataFrame(rows, columns=['symbol', 'bars', 'columns', 'bytes', 'bytes_per_bar'])
+    return report.sort_values('bytes', ascending=False).reset_index(drop=True)
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict, deque
+import pandas as pd
+from .config import TradingConfig as cfg
+from .bar_store import slice_period, period_start, is_intraday
+from .data_service import refresh
+from .models import TradingStrategy
+from .streaming import IndicatorEngine
+
+SIGNAL_COLUMNS = ['entry', 'exit', 'stop_loss']
+
+
+class LiveFeed:
+    """IndicatorEngine plus a rolling buffer of recent bars per (symbol, period, interval) for live ticks"""
+
+    def __init__(self, strategy=None, buffer_size=cfg.LIVE_BUFFER_BARS, max_series=cfg.LIVE_MAX_SERIES):
+        self.strategy = strategy or TradingStrategy()
+        self.buffer_size = buffer_size
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _seed(self, store, symbol, period, interval):
+        # The dashboard's own period slice, so cumulative indicators (VWAP, OBV) match the full render
+        history = slice_period(store.read(symbol, interval), period, interval)
+        engine = IndicatorEngine()
+        values = engine.run(history)
+        frame = pd.concat([history, values], axis=1).iloc[-self.buffer_size:]
+        signals = self.strategy.signals_from_indicators(frame)
+        frame = pd.concat([frame, signals], axis=1)
+        buffer = deque(((ts, row) for ts, row in zip(frame.index, frame.to_dict('records'))),
+                       maxlen=self.buffer_size)
+        sessions = history.index.normalize().unique()
+        return {'engine': engine, 'buffer': buffer, 'first': history.index[0] if len(history) else None,
+                'sessions': len(sessions), 'session': sessions[-1] if len(sessions) else None}
+
+    @staticmethod
+    def _window_moved(state, bars, period, interval):
+        """True when `bars` push the oldest seeded bars out of the period window (see slice_period)"""
+        if bars.empty:
+            return False
+        if state['first'] is None:
+            return True    # Seeded before any bars were stored
+        if period in (None, 'max'):
+            return False
+        if period.endswith('d') and period[:-1].isdigit() and is_intraday(interval):
+            new = (bars.index.normalize().unique() > state['session']).sum()
+            return state['sessions'] + new > int(period[:-1])
+        return period_start(bars.index[-1], period) >= state['first']
+
+    def _advance(self, state, bars):
+        engine, buffer = state['engine'], state['buffer']
+        if len(bars):
+            sessions = bars.index.normalize().unique()
+            new = sessions[sessions > state['session']] if state['session'] is not None else sessions
+            if len(new):
+                state['sessions'] += len(new)
+                state['session'] = new[-1]
+        for ts, bar in zip(bars.index, bars.to_dict('records')):
+            if engine.last_ts is not None and ts < engine.last_ts:
+                continue
+            revise = engine.last_ts is not None and ts == engine.last_ts
+            values = engine.update_bar(ts, bar, revise=revise)
+            if revise:
+                buffer.pop()
+            prev_close = buffer[-1][1]['Close'] if buffer else float('nan')
+            row = dict(bar, **values)
+            frame = pd.DataFrame([{'Close': prev_close}, row],
+                                 index=pd.DatetimeIndex([ts - pd.Timedelta(1), ts]))
+            signals = self.strategy.signals_from_indicators(frame).iloc[-1]
+            row.update({name: bool(signals[name]) for name in SIGNAL_COLUMNS})
+            buffer.append((ts, row))
+
+    def poll(self, symbol, period, interval, since):
+        """Bars at or after `since` with indicators and signals; None when `since` is older than the buffer"""
+        store = refresh(symbol, period, interval)
+        key = (symbol.upper(), period, interval)
+        since = pd.Timestamp(since)
+        with self._lock:
+            state = self._series.get(key)
+            bars = None
+            if state is not None:
+                self._series.move_to_end(key)
+                bars = store.read_since(symbol, interval, state['engine'].last_ts)
+            if state is None or self._window_moved(state, bars, period, interval):
+                state = self._seed(store, symbol, period, interval)
+                self._series[key] = state
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._advance(state, bars)
+            buffer = state['buffer']
+            if not buffer or since < buffer[0][0]:
+                return None
+            rows = [(ts, row) for ts, row in buffer if ts >= since]
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame([row for _, row in rows], index=pd.DatetimeIndex([ts for ts, _ in rows]))
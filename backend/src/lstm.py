@@ -0,0 +1,112 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import tensorflow as tf
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import LSTM, Dense, Dropout
+from sklearn.preprocessing import MinMaxScaler
+from .config import TradingConfig as cfg
+
+class LSTMPredictor:
+    units = 50
+    dropout = 0.2
+
+    def __init__(self, sequence_length=cfg.SEQUENCE_LENGTH):    # Use config
+        self.sequence_length = sequence_length
+        self.model = self._build_model()
+        self.scaler = MinMaxScaler()
+        self._infer = None
+
+    def _build_model(self):
+        model = Sequential([
+            LSTM(self.units, return_sequences=True, input_shape=(self.sequence_length, 1)),
+            Dropout(self.dropout),
+            LSTM(self.units, return_sequences=False),
+            Dropout(self.dropout),
+            Dense(1)
+        ])
+        model.compile(optimizer='adam', loss='mse')
+        return model
+
+    @classmethod
+    def config_for(cls, sequence_length):
+        """Architecture settings that make saved weights compatible"""
+        return {'sequence_length': sequence_length, 'units': cls.units, 'dropout': cls.dropout}
+
+    def config(self):
+        return self.config_for(self.sequence_length)
+
+    def _scale(self, data, fit=True):
+        data = data.reshape(-1, 1)
+        if fit:
+            return self.scaler.fit_transform(data)[:, 0]
+        return self.scaler.transform(data)[:, 0]
+
+    def _windows(self, scaled):
+        """Zero-copy (N, sequence_length) view of every input window, plus targets"""
+        if len(scaled) <= self.sequence_length:
+            return np.empty((0, self.sequence_length)), np.empty(0)
+        X = sliding_window_view(scaled[:-1], self.sequence_length)
+        y = scaled[self.sequence_length:]
+        return X, y
+
+    @property
+    def scaler_fitted(self):
+        return hasattr(self.scaler, 'scale_')
+
+    def prepare_data(self, data, fit=True):
+        """Input windows and targets; pass fit=False to reuse the scaler fitted on training data"""
+        return self._windows(self._scale(data, fit=fit))
+
+    def window_dataset(self, scaled, batch_size=cfg.BATCH_SIZE, shuffle=False, with_targets=True):
+        """tf.data pipeline that gathers each batch's windows from the scaled series"""
+        count = len(scaled) - self.sequence_length
+        series = tf.constant(scaled, dtype=tf.float32)
+        offsets = tf.range(self.sequence_length, dtype=tf.int64)
+        ds = tf.data.Dataset.range(count)
+        if shuffle:
+            ds = ds.shuffle(count, reshuffle_each_iteration=True)
+        ds = ds.batch(batch_size)
+
+        def gather(idx):
+            X = tf.expand_dims(tf.gather(series, idx[:, None] + offsets), -1)
+            if not with_targets:
+                return X
+            return X, tf.gather(series, idx + self.sequence_length)
+
+        return ds.map(gather, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+    
+    def train(self, data, epochs=cfg.EPOCHS, batch_size=cfg.BATCH_SIZE):    # Use config
+        scaled = self._scale(data)
+        dataset = self.window_dataset(scaled, batch_size, shuffle=True)
+        self.model.fit(dataset, epochs=epochs, shuffle=False, verbose=0)    # Dataset shuffles itself
+        
+    def fine_tune(self, data, epochs=cfg.FINE_TUNE_EPOCHS, batch_size=cfg.BATCH_SIZE):
+        """Continue training on new bars, keeping the already fitted scaler"""
+        scaled = self._scale(data, fit=False)
+        if len(scaled) <= self.sequence_length:
+            return
+        dataset = self.window_dataset(scaled, batch_size, shuffle=True)
+        self.model.fit(dataset, epochs=epochs, shuffle=False, verbose=0)    # Dataset shuffles itself
+        
+    def predict(self, data, fit_scaler=None):
+        """One prediction per window of `data`; the scaler is only refitted if asked or not yet fitted"""
+        if fit_scaler is None:
+            fit_scaler = not self.scaler_fitted
+        scaled = self._scale(data, fit=fit_scaler)
+        predictions = self.model.predict(self.window_dataset(scaled, with_targets=False), verbose=0)
+        return self.scaler.inverse_transform(predictions.reshape(-1, 1))
+
+    def predict_next(self, data):
+        """Predict the bar after `data` from its last window with the fitted scaler"""
+        if self._infer is None:
+            # Compiled once per model; eager Keras calls cost tens of milliseconds
+            model = self.model
+
+            @tf.function(input_signature=[tf.TensorSpec([None, self.sequence_length, 1], tf.float32)])
+            def infer(x):
+                return model(x, training=False)
+
+            self._infer = infer
+        window = self._scale(np.asarray(data[-self.sequence_length:], dtype=np.float64), fit=False)
+        prediction = self._infer(window.reshape(1, self.sequence_length, 1).astype(np.float32))
+        return float(self.scaler.inverse_transform(prediction.numpy().reshape(-1, 1))[0, 0])
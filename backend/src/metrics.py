@@ -0,0 +1,180 @@
+import os
+import re
+import time
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+from .config import TradingConfig as cfg
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """In-process counters and latency histograms rendered in the Prometheus text format"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, prefix='traide_'):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[0][i] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    @contextmanager
+    def timer(self, name, ignore=(), **labels):
+        """Observe the wall time of the block (or decorated call); errors other than `ignore` are counted"""
+        start = time.perf_counter()
+        try:
+            yield
+        except ignore:
+            raise
+        except Exception:
+            self.inc(name + '_errors_total', **labels)
+            raise
+        finally:
+            self.observe(name + '_seconds', time.perf_counter() - start, **labels)
+
+    def stage(self, stage):
+        """Timer for one stage of the request pipeline (fetch, indicators, figure, ...)"""
+        return self.timer('stage', stage=stage)
+
+    def collect(self, collector):
+        """Register `collector()` -> iterable of (name, type, labels dict, value) read at scrape time"""
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in self._histograms.items())
+        lines = []
+        declared = set()
+
+        def header(name, kind):
+            full = self.prefix + name
+            if full not in declared:
+                declared.add(full)
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for (name, labels), value in counters:
+            lines.append(f"{header(name, 'counter')}{_label_text(labels)} {value}")
+        for (name, labels), (counts, total, count) in histograms:
+            full = header(name, 'histogram')
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{full}_bucket{_label_text(labels + (('le', repr(bound)),))} {bucket_count}")
+            lines.append(f"{full}_bucket{_label_text(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{full}_sum{_label_text(labels)} {total}")
+            lines.append(f"{full}_count{_label_text(labels)} {count}")
+        families = {}    # Samples of one metric must be contiguous in the output
+        for collector in self._collectors:
+            for name, kind, labels, value in collector():
+                families.setdefault((name, kind), []).append((labels, value))
+        for (name, kind), samples in families.items():
+            full = header(name, kind)
+            lines.extend(f"{full}{_label_text(sorted(labels.items()))} {value}" for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+metrics.describe('stage_seconds', "Wall time per dashboard pipeline stage")
+metrics.describe('stage_errors_total', "Pipeline stages that raised")
+metrics.describe('provider_request_seconds', "Data provider request latency")
+metrics.describe('provider_request_errors_total', "Data provider requests that raised")
+metrics.describe('callback_seconds', "Dash callback wall time")
+metrics.describe('callback_errors_total', "Dash callbacks that raised")
+metrics.describe('request_seconds', "HTTP request wall time including Dash serialization")
+
+
+def cache_collector(name, cache):
+    """Collector reporting a TTLCache's hit/miss counters under `cache="<name>"`"""
+    def collect():
+        stats = cache.stats()
+        labels = {'cache': name}
+        return [
+            ('cache_hits_total', 'counter', labels, stats['hits']),
+            ('cache_misses_total', 'counter', labels, stats['misses']),
+            ('cache_coalesced_total', 'counter', labels, stats['coalesced']),
+            ('cache_entries', 'gauge', labels, stats['size']),
+        ]
+    return collect
+
+
+class RequestProfiler:
+    """Optional per-request cProfile dumps, written as `<dir>/<time>-<name>.prof` while enabled"""
+
+    def __init__(self, directory=cfg.PROFILE_DIR):
+        self.directory = directory
+        self.enabled = directory is not None
+        self._local = threading.local()
+
+    def enable(self, directory=None):
+        self.directory = directory or self.directory or os.path.normpath(os.path.join(cfg.BAR_STORE_DIR, '..', 'profiles'))
+        os.makedirs(self.directory, exist_ok=True)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def start(self):
+        if not self.enabled:
+            return
+        profile = cProfile.Profile()
+        self._local.profile = profile
+        profile.enable()
+
+    def stop(self, name):
+        """Stop this thread's profile (if any) and dump it; returns the file path"""
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            return None
+        profile.disable()
+        self._local.profile = None
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_')[:80] or 'request'
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{time.perf_counter_ns() % 10 ** 6:06d}-{slug}.prof")
+        pstats.Stats(profile).dump_stats(path)
+        return path
+
+
+profiler = RequestProfiler()
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from .config import TradingConfig as cfg
+
+WEIGHTS_FILE = 'model.weights.h5'
+SCALER_FILE = 'scaler.pkl'
+META_FILE = 'meta.json'
+
+
+def config_hash(config):
+    payload = json.dumps(config, sort_keys=True).encode()
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Trained LSTMPredictor store keyed by (ticker, interval, sequence_length, config hash)"""
+
+    def __init__(self, root=cfg.MODEL_DIR, cache_size=cfg.MODEL_CACHE_SIZE):
+        self.root = root
+        self.cache_size = cache_size
+        self._loaded = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _predictor_class():
+        from .lstm import LSTMPredictor
+        return LSTMPredictor
+
+    def _key(self, ticker, interval, sequence_length):
+        config = self._predictor_class().config_for(sequence_length)
+        return (ticker.upper(), interval, config['sequence_length'], config_hash(config))
+
+    def _path(self, key):
+        ticker, interval, sequence_length, digest = key
+        return os.path.join(self.root, ticker, interval, f"seq{sequence_length}-{digest}")
+
+    def _remember(self, key, predictor, meta):
+        self._loaded[key] = (predictor, meta)
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.cache_size:
+            self._loaded.popitem(last=False)
+
+    def save(self, ticker, interval, predictor, last_ts=None, **meta_fields):
+        with self._lock:
+            key = self._key(ticker, interval, predictor.sequence_length)
+            path = self._path(key)
+            os.makedirs(path, exist_ok=True)
+            predictor.model.save_weights(os.path.join(path, WEIGHTS_FILE))
+            with open(os.path.join(path, SCALER_FILE), 'wb') as f:
+                pickle.dump(predictor.scaler, f)
+            meta = {
+                'config': predictor.config(),
+                'last_ts': None if last_ts is None else pd.Timestamp(last_ts).isoformat(),
+                'saved_at': time.time(),
+            }
+            meta.update(meta_fields)
+            with open(os.path.join(path, META_FILE), 'w') as f:
+                json.dump(meta, f)
+            self._remember(key, predictor, meta)
+            return path
+
+    def load(self, ticker, interval, sequence_length=cfg.SEQUENCE_LENGTH):
+        """Return (predictor, meta) for a saved model, or (None, None)"""
+        with self._lock:
+            key = self._key(ticker, interval, sequence_length)
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+                return self._loaded[key]
+            path = self._path(key)
+            if not os.path.exists(os.path.join(path, META_FILE)):
+                return None, None
+            predictor = self._predictor_class()(sequence_length)
+            # Build optimizer slots first so Adam state is restored for warm starts
+            predictor.model.optimizer.build(predictor.model.trainable_variables)
+            predictor.model.load_weights(os.path.join(path, WEIGHTS_FILE))
+            with open(os.path.join(path, SCALER_FILE), 'rb') as f:
+                predictor.scaler = pickle.load(f)
+            with open(os.path.join(path, META_FILE)) as f:
+                meta = json.load(f)
+            self._remember(key, predictor, meta)
+            return predictor, meta
+
+    def get_or_train(self, ticker, interval, df, sequence_length=cfg.SEQUENCE_LENGTH,
+                     epochs=cfg.EPOCHS, fine_tune_epochs=cfg.FINE_TUNE_EPOCHS):
+        """Load a model for `df['Close']`, training it or fine-tuning it on the bars it has not seen"""
+        predictor, meta = self.load(ticker, interval, sequence_length)
+        close = df['Close'].to_numpy(dtype=float)
+        if predictor is None:
+            predictor = self._predictor_class()(sequence_length)
+            predictor.train(close, epochs=epochs)
+            self.save(ticker, interval, predictor, last_ts=df.index[-1], trained_bars=len(close))
+            return predictor
+        last_ts = pd.Timestamp(meta['last_ts']) if meta.get('last_ts') else None
+        if last_ts is not None and df.index[-1] > last_ts:
+            new = int((df.index > last_ts).sum())
+            predictor.fine_tune(close[-(new + sequence_length):], epochs=fine_tune_epochs)
+            self.save(ticker, interval, predictor, last_ts=df.index[-1],
+                      trained_bars=meta.get('trained_bars', 0) + new)
+        return predictor
+
+    def predict_next(self, ticker, interval, df, sequence_length=cfg.SEQUENCE_LENGTH):
+        """Next-bar close prediction from a saved model (None if none is saved)"""
+        predictor, _ = self.load(ticker, interval, sequence_length)
+        if predictor is None:
+            return None
+        return predictor.predict_next(df['Close'].to_numpy(dtype=float))
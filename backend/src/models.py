@@ -1,56 +1,30 @@
 import numpy as np
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
-from sklearn.preprocessing import MinMaxScaler
 import pandas as pd
 from .config import TradingConfig as cfg  # Ensure config is imported
 
-class LSTMPredictor:
-    def __init__(self, sequence_length=cfg.SEQUENCE_LENGTH):    # Use config
-        self.sequence_length = sequence_length
-        self.model = self._build_model()
-        self.scaler = MinMaxScaler()
-        
-    def _build_model(self):
-        model = Sequential([
-            LSTM(50, return_sequences=True, input_shape=(self.sequence_length, 1)),
-            Dropout(0.2),
-            LSTM(50, return_sequences=False),
-            Dropout(0.2),
-            Dense(1)
-        ])
-        model.compile(optimizer='adam', loss='mse')
-        return model
-    
-    def prepare_data(self, data):
-        scaled_data = self.scaler.fit_transform(data.reshape(-1, 1))
-        X, y = [], []
-        
-        for i in range(len(scaled_data) - self.sequence_length):
-            X.append(scaled_data[i:(i + self.sequence_length), 0])
-            y.append(scaled_data[i + self.sequence_length, 0])
-            
-        return np.array(X), np.array(y)
-    
-    def train(self, data, epochs=cfg.EPOCHS, batch_size=cfg.BATCH_SIZE):    # Use config
-        X, y = self.prepare_data(data)
-        X = X.reshape((X.shape[0], X.shape[1], 1))
-        self.model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
-        
-    def predict(self, data):
-        X, _ = self.prepare_data(data)
-        X = X.reshape((X.shape[0], X.shape[1], 1))
-        predictions = self.model.predict(X)
-        return self.scaler.inverse_transform(predictions.reshape(-1, 1))
+def __getattr__(name):
+    # LSTMPredictor lives in .lstm so TensorFlow is only imported when it is used
+    if name == 'LSTMPredictor':
+        from .lstm import LSTMPredictor
+        return LSTMPredictor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class TradingStrategy:
-    def __init__(self, risk_ratio=cfg.RISK_REWARD_RATIO, stop_loss_pct=cfg.STOP_LOSS_PCT):    # Use config
+    def __init__(self, risk_ratio=cfg.RISK_REWARD_RATIO, stop_loss_pct=cfg.STOP_LOSS_PCT,    # Use config
+                 rsi_oversold=cfg.RSI_OVERSOLD, rsi_overbought=cfg.RSI_OVERBOUGHT,
+                 stoch_oversold=cfg.STOCH_OVERSOLD, stoch_overbought=cfg.STOCH_OVERBOUGHT,
+                 atr_multiplier=cfg.ATR_STOP_MULTIPLIER, macd_threshold=cfg.MACD_CROSS_THRESHOLD):
         self.risk_ratio = risk_ratio
         self.stop_loss_pct = stop_loss_pct
-        
-    def calculate_signals(self, df):
-        df = df.copy()
-        
+        self.rsi_oversold = rsi_oversold
+        self.rsi_overbought = rsi_overbought
+        self.stoch_oversold = stoch_oversold
+        self.stoch_overbought = stoch_overbought
+        self.atr_multiplier = atr_multiplier
+        self.macd_threshold = macd_threshold
+
+    def add_indicators(self, df):
+        """Add the ATR, Stochastic and volume indicators the signals need (in place)"""
         # ATR for volatility-based stops
         high_low = df['High'] - df['Low']
         high_close = np.abs(df['High'] - df['Close'].shift())
@@ -68,34 +42,111 @@ class TradingStrategy:
         # Volume indicators
         df['OBV'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
         df['VWAP'] = (df['Close'] * df['Volume']).cumsum() / df['Volume'].cumsum()
-        
+        return df
+
+    def signals_from_indicators(self, df):
+        """Evaluate entry/exit/stop-loss conditions on a frame that already has all indicators"""
         signals = pd.DataFrame(index=df.index)
         
         # Entry conditions
         signals['entry'] = (
-            (df['RSI'] < 30) & 
-            (df['MACD'] > df['MACD_signal']) & 
-            (df['Stoch_K'] < 20) & 
+            (df['RSI'] < self.rsi_oversold) & 
+            (df['MACD'] - df['MACD_signal'] > self.macd_threshold) & 
+            (df['Stoch_K'] < self.stoch_oversold) & 
             (df['Close'] > df['VWAP'])
         )
         
         # Exit conditions
         signals['exit'] = (
-            (df['RSI'] > 70) | 
+            (df['RSI'] > self.rsi_overbought) | 
             (df['Close'] > df['BB_high']) | 
-            (df['Stoch_K'] > 80) |
-            (df['MACD'] < df['MACD_signal'])
+            (df['Stoch_K'] > self.stoch_overbought) |
+            (df['MACD'] - df['MACD_signal'] < -self.macd_threshold)
         )
         
         # Stop loss
         signals['stop_loss'] = (
             (df['Close'] < df['BB_low']) | 
-            (df['Close'] < df['Close'].shift(1) - df['ATR'] * 2)
+            (df['Close'] < df['Close'].shift(1) - df['ATR'] * self.atr_multiplier)
         )
-        
+        return signals
+
+    def calculate_signals(self, df):
+        df = self.add_indicators(df.copy())
+        signals = self.signals_from_indicators(df)
         return signals, df
 
+def trade_indices(entry, exit):
+    """Entry/exit bar indices of a long-only, all-in strategy (exit on the first exit bar after entry)"""
+    entry_idx = np.flatnonzero(entry)
+    exit_idx = np.flatnonzero(exit)
+    entries, exits = [], []
+    start = 0
+    while True:
+        k = np.searchsorted(entry_idx, start)
+        if k == len(entry_idx):
+            break
+        e = entry_idx[k]
+        j = np.searchsorted(exit_idx, e, side='right')
+        if j == len(exit_idx):
+            break
+        entries.append(e)
+        exits.append(exit_idx[j])
+        start = exit_idx[j] + 1
+    return np.asarray(entries, dtype=np.int64), np.asarray(exits, dtype=np.int64)
+
 def backtest_strategy(data, signals, initial_capital=cfg.INITIAL_CAPITAL):
+    """Array-based backtest with the same semantics and output as backtest_strategy_reference"""
+    close = data['Close'].to_numpy(dtype=np.float64)
+    entry = signals['entry'].to_numpy(dtype=bool)
+    exit = signals['exit'].to_numpy(dtype=bool) | signals['stop_loss'].to_numpy(dtype=bool)
+    entries, exits = trade_indices(entry, exit)
+
+    entry_prices = close[entries]
+    exit_prices = close[exits]
+    returns = (exit_prices - entry_prices) / entry_prices * 100
+    balance = initial_capital
+    for entry_price, exit_price in zip(entry_prices, exit_prices):
+        balance = balance / entry_price * exit_price
+
+    index = data.index
+    trades = [
+        {
+            'entry_date': index[e],
+            'exit_date': index[x],
+            'entry_price': entry_prices[n],
+            'exit_price': exit_prices[n],
+            'returns': returns[n]
+        }
+        for n, (e, x) in enumerate(zip(entries, exits))
+    ]
+
+    if trades:
+        returns = pd.Series(returns)
+        performance = {
+            'total_trades': len(trades),
+            'winning_trades': int((returns > 0).sum()),
+            'avg_return': returns.mean(),
+            'max_return': returns.max(),
+            'min_return': returns.min(),
+            'final_balance': balance,
+            'total_return': (balance - initial_capital) / initial_capital * 100
+        }
+    else:
+        performance = {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'avg_return': 0,
+            'max_return': 0,
+            'min_return': 0,
+            'final_balance': balance,
+            'total_return': 0
+        }
+
+    return trades, performance
+
+def backtest_strategy_reference(data, signals, initial_capital=cfg.INITIAL_CAPITAL):
+    """Original per-row backtest, kept to cross-check backtest_strategy"""
     position = 0
     balance = initial_capital
     trades = []
@@ -0,0 +1,127 @@
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+from .data_service import calculate_indicators
+from .models import TradingStrategy, trade_indices
+
+# Default search space around the thresholds hard-coded in the original strategy
+DEFAULT_GRID = {
+    'rsi_oversold': [20, 25, 30, 35, 40],
+    'rsi_overbought': [60, 65, 70, 75, 80],
+    'stoch_oversold': [10, 15, 20, 25, 30],
+    'stoch_overbought': [70, 75, 80, 85, 90],
+    'atr_multiplier': [1.0, 1.5, 2.0, 2.5, 3.0],
+    'macd_threshold': [0.0],
+}
+
+PARAMS = list(DEFAULT_GRID)
+
+_worker_arrays = None
+
+
+def prepare(df):
+    """Compute every indicator column once; returns the raw arrays the sweep needs"""
+    if 'RSI' not in df.columns:
+        df = calculate_indicators(df)
+    if 'ATR' not in df.columns:
+        df = TradingStrategy().add_indicators(df.copy())
+    close = df['Close'].to_numpy(dtype=np.float64)
+    return {
+        'close': close,
+        'prev_close': np.r_[np.nan, close[:-1]],
+        'rsi': df['RSI'].to_numpy(dtype=np.float64),
+        'stoch_k': df['Stoch_K'].to_numpy(dtype=np.float64),
+        'macd_gap': (df['MACD'] - df['MACD_signal']).to_numpy(dtype=np.float64),
+        'above_vwap': (df['Close'] > df['VWAP']).to_numpy(),
+        'above_bb': (df['Close'] > df['BB_high']).to_numpy(),
+        'below_bb': (df['Close'] < df['BB_low']).to_numpy(),
+        'atr': df['ATR'].to_numpy(dtype=np.float64),
+    }
+
+
+def _threshold_masks(condition, thresholds):
+    """`condition` evaluated once per distinct threshold, plus each threshold's row in that matrix"""
+    unique, inverse = np.unique(np.asarray(thresholds, dtype=np.float64), return_inverse=True)
+    return condition(unique[:, None]), inverse
+
+
+def evaluate(arrays, combos, initial_capital=cfg.INITIAL_CAPITAL):
+    """Backtest a batch of parameter combinations (one dict per combo)"""
+    p = {name: [c[name] for c in combos] for name in PARAMS}
+    rsi, stoch_k, macd_gap = arrays['rsi'], arrays['stoch_k'], arrays['macd_gap']
+    close, prev_close, atr = arrays['close'], arrays['prev_close'], arrays['atr']
+    rsi_lt, rsi_lt_i = _threshold_masks(lambda t: rsi < t, p['rsi_oversold'])
+    rsi_gt, rsi_gt_i = _threshold_masks(lambda t: rsi > t, p['rsi_overbought'])
+    stoch_lt, stoch_lt_i = _threshold_masks(lambda t: stoch_k < t, p['stoch_oversold'])
+    stoch_gt, stoch_gt_i = _threshold_masks(lambda t: stoch_k > t, p['stoch_overbought'])
+    macd_up, macd_up_i = _threshold_masks(lambda t: macd_gap > t, p['macd_threshold'])
+    macd_dn, macd_dn_i = _threshold_masks(lambda t: macd_gap < -t, p['macd_threshold'])
+    atr_stop, atr_stop_i = _threshold_masks(lambda t: close < prev_close - atr * t, p['atr_multiplier'])
+
+    entry = rsi_lt[rsi_lt_i] & macd_up[macd_up_i] & stoch_lt[stoch_lt_i] & arrays['above_vwap']
+    exit = (rsi_gt[rsi_gt_i] | arrays['above_bb'] | stoch_gt[stoch_gt_i] | macd_dn[macd_dn_i]
+            | arrays['below_bb'] | atr_stop[atr_stop_i])
+
+    rows = []
+    for j, combo in enumerate(combos):
+        entries, exits = trade_indices(entry[j], exit[j])
+        entry_prices, exit_prices = close[entries], close[exits]
+        returns = (exit_prices - entry_prices) / entry_prices * 100
+        final_balance = initial_capital * np.prod(exit_prices / entry_prices)
+        row = dict(combo)
+        row.update({
+            'total_trades': len(returns),
+            'winning_trades': int((returns > 0).sum()),
+            'avg_return': returns.mean() if len(returns) else 0,
+            'max_return': returns.max() if len(returns) else 0,
+            'min_return': returns.min() if len(returns) else 0,
+            'final_balance': final_balance,
+            'total_return': (final_balance - initial_capital) / initial_capital * 100,
+        })
+        rows.append(row)
+    return rows
+
+
+def _init_worker(arrays):
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def _evaluate_in_worker(combos):
+    return evaluate(_worker_arrays, combos)
+
+
+def param_combinations(grid=None, n_random=None, seed=None):
+    """Full grid, or `n_random` distinct combinations sampled from it"""
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    values = [grid[name] for name in PARAMS]
+    total = int(np.prod([len(v) for v in values]))
+    if n_random is None or n_random >= total:
+        return [dict(zip(PARAMS, combo)) for combo in itertools.product(*values)]
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(total, size=n_random, replace=False)
+    return [dict(zip(PARAMS, (v[i] for v, i in zip(values, np.unravel_index(flat, [len(v) for v in values])))))
+            for flat in picks]
+
+
+def sweep(df, grid=None, n_random=None, seed=None, metric='total_return',
+          workers=None, batch_size=cfg.SWEEP_BATCH_SIZE):
+    """Grid or random search over TradingStrategy thresholds, ranked by `metric`"""
+    arrays = prepare(df)
+    combos = param_combinations(grid, n_random, seed)
+    batches = [combos[i:i + batch_size] for i in range(0, len(combos), batch_size)]
+    workers = workers or cfg.BATCH_WORKERS or os.cpu_count()
+    rows = []
+    if workers == 1 or len(batches) == 1:
+        for batch in batches:
+            rows.extend(evaluate(arrays, batch))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=_init_worker,
+                                 initargs=(arrays,)) as pool:
+            for result in pool.map(_evaluate_in_worker, batches):
+                rows.extend(result)
+    results = pd.DataFrame(rows)
+    return results.sort_values(metric, ascending=False, kind='stable').reset_index(drop=True)
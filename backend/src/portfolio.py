@@ -0,0 +1,206 @@
+import argparse
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+from .bar_store import BarStore
+from .batch import load_range
+from .indicator_frame import indicators_and_signals
+
+
+def _merge_index(union, ts):
+    if union is None:
+        return ts
+    if len(ts) == len(union) and np.array_equal(ts, union):
+        return union    # Usual case: symbols from the same exchange share their timestamps
+    return np.union1d(union, ts)
+
+
+def allocate_matrix(index, tickers, dtype=cfg.PORTFOLIO_PRICE_DTYPE):
+    """Empty time x ticker arrays: forward-filled closes (0 before a symbol's first bar) and signals"""
+    shape = (len(index), len(tickers))
+    return {
+        'index': index,
+        'tickers': list(tickers),
+        'close': np.zeros(shape, dtype=dtype),
+        'entry': np.zeros(shape, dtype=bool),
+        'exit': np.zeros(shape, dtype=bool),
+    }
+
+
+def place_column(matrix, j, data, signals):
+    """Scatter one symbol's closes and signals into column `j` of the matrix"""
+    ts = data.index.as_unit('ns').asi8
+    pos = np.searchsorted(matrix['index'].asi8, ts)
+    close = data['Close'].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(close)
+    if valid.any():
+        # Each bar holds the last known close, so a missing bar keeps the position's value
+        price_pos = pos[valid]
+        fill = np.searchsorted(price_pos, np.arange(price_pos[0], len(matrix['index'])), side='right') - 1
+        matrix['close'][price_pos[0]:, j] = close[valid][fill]
+    matrix['entry'][pos, j] = signals['entry'].to_numpy(dtype=bool) & valid
+    exit = signals['exit'] | signals['stop_loss'] if 'stop_loss' in signals else signals['exit']
+    matrix['exit'][pos, j] = exit.to_numpy(dtype=bool)
+
+
+def align_signals(frames, dtype=cfg.PORTFOLIO_PRICE_DTYPE):
+    """Line up `{ticker: (data, signals)}` (from TradingStrategy.calculate_signals) on a common time axis"""
+    union, tz = None, None
+    for data, _ in frames.values():
+        union = _merge_index(union, data.index.as_unit('ns').asi8)
+        tz = tz or data.index.tz
+    index = pd.DatetimeIndex(pd.to_datetime(union, unit='ns', utc=tz is not None))
+    if tz is not None:
+        index = index.tz_convert(tz)
+    matrix = allocate_matrix(index, frames, dtype)
+    for j, (data, signals) in enumerate(frames.values()):
+        place_column(matrix, j, data, signals)
+    return matrix
+
+
+def load_matrix(tickers, interval='1d', date_range='1y', store=None, strategy=None,
+                dtype=cfg.PORTFOLIO_PRICE_DTYPE):
+    """Build the time x ticker matrix from the bar store one symbol at a time: `(matrix, errors)`"""
+    store = store or BarStore(cfg.BAR_STORE_DIR)
+    union, tz, errors, usable = None, None, {}, []
+    for ticker in tickers:
+        index = load_range(store, ticker, interval, date_range).index
+        if len(index) < 2:
+            errors[ticker] = "Insufficient data in bar store."
+            continue
+        union = _merge_index(union, index.as_unit('ns').asi8)
+        tz = tz or index.tz
+        usable.append(ticker)
+    if union is None:
+        return allocate_matrix(pd.DatetimeIndex([], tz='UTC'), [], dtype), errors
+    index = pd.DatetimeIndex(pd.to_datetime(union, unit='ns', utc=True)).tz_convert(tz)
+    matrix = allocate_matrix(index, usable, dtype)
+    for j, ticker in enumerate(usable):
+        try:
+            signals, df = indicators_and_signals(load_range(store, ticker, interval, date_range), strategy)
+            place_column(matrix, j, df, signals)
+        except Exception as e:
+            errors[ticker] = str(e)
+    return matrix, errors
+
+
+def backtest_portfolio(matrix, initial_capital=cfg.INITIAL_CAPITAL, max_positions=cfg.PORTFOLIO_MAX_POSITIONS,
+                       position_size=cfg.PORTFOLIO_POSITION_PCT, commission=cfg.COMMISSION_PCT, priority=None):
+    """Long-only backtest of many symbols sharing one pool of capital: `(trades, performance, equity)`"""
+    close, entry, exit = matrix['close'], matrix['entry'], matrix['exit']
+    n_bars, n_assets = close.shape
+    index, tickers = matrix['index'], matrix['tickers']
+    cash = float(initial_capital)
+    shares = np.zeros(n_assets)
+    held = np.zeros(n_assets, dtype=bool)
+    entry_bar = np.zeros(n_assets, dtype=np.int64)
+    entry_price = np.zeros(n_assets)
+    cost = np.zeros(n_assets)
+    equity = np.empty(n_bars)
+    invested = np.empty(n_bars)
+    closed = []    # (assets, entry bars, exit bar, entry prices, exit prices, pnl) per exit event
+    n_held = peak = 0
+    paid = 0.0
+
+    for t in range(n_bars):
+        px = close[t].astype(np.float64)
+        exited = None
+        if n_held:
+            exited = exit[t] & held
+            if exited.any():
+                idx = np.flatnonzero(exited)
+                value = shares[idx] * px[idx]
+                fee = value * commission
+                cash += float(value.sum() - fee.sum())
+                paid += float(fee.sum())
+                closed.append((idx, entry_bar[idx], t, entry_price[idx], px[idx], value - fee - cost[idx]))
+                shares[idx] = 0.0
+                held[idx] = False
+                n_held -= len(idx)
+
+        slots = max_positions - n_held
+        if slots > 0 and entry[t].any():
+            candidates = entry[t] & ~held
+            if exited is not None:
+                candidates &= ~exited    # Like backtest_strategy, an exit bar is not also an entry
+            idx = np.flatnonzero(candidates)
+            if len(idx):
+                if priority is not None:
+                    idx = idx[np.argsort(-priority[t, idx], kind='stable')]
+                idx = idx[:slots]
+                budget = (cash + shares @ px) * position_size
+                budget = min(budget, cash / len(idx))
+                if budget > 0:
+                    shares[idx] = budget / (px[idx] * (1 + commission))
+                    paid += float((shares[idx] * px[idx]).sum()) * commission
+                    cash -= budget * len(idx)
+                    held[idx] = True
+                    entry_bar[idx] = t
+                    entry_price[idx] = px[idx]
+                    cost[idx] = budget
+                    n_held += len(idx)
+                    peak = max(peak, n_held)
+
+        invested[t] = shares @ px
+        equity[t] = cash + invested[t]
+
+    trades = [
+        {
+            'ticker': tickers[j],
+            'entry_date': index[e],
+            'exit_date': index[x],
+            'entry_price': p0,
+            'exit_price': p1,
+            'returns': (p1 - p0) / p0 * 100,
+            'pnl': pnl,
+        }
+        for idx, entries, x, entry_prices, exit_prices, pnls in closed
+        for j, e, p0, p1, pnl in zip(idx, entries, entry_prices, exit_prices, pnls)
+    ]
+    trades.sort(key=lambda trade: (trade['exit_date'], trade['ticker']))
+    equity = pd.Series(equity, index=index, name='equity')
+    returns = pd.Series([trade['returns'] for trade in trades], dtype=float)
+    final = float(equity.iloc[-1]) if n_bars else float(initial_capital)
+    drawdown = (equity / equity.cummax() - 1).min() * 100 if n_bars else 0.0
+    performance = {
+        'total_trades': len(trades),
+        'winning_trades': int((returns > 0).sum()),
+        'avg_return': returns.mean() if len(returns) else 0,
+        'max_return': returns.max() if len(returns) else 0,
+        'min_return': returns.min() if len(returns) else 0,
+        # Open positions are marked at the last close; realized_balance counts them at cost, like
+        # backtest_strategy's final_balance, so one symbol with one full-size slot matches it
+        'final_balance': final,
+        'realized_balance': cash + float(cost[held].sum()),
+        'total_return': (final - initial_capital) / initial_capital * 100,
+        'max_drawdown': float(drawdown),
+        'exposure': float(np.mean(invested / equity.to_numpy())) if n_bars else 0.0,
+        'open_positions': n_held,
+        'peak_positions': peak,
+        'commission_paid': paid,
+    }
+    return trades, performance, equity
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest a ticker universe as one portfolio from the local bar store")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--period', default='1y')
+    parser.add_argument('--max-positions', type=int, default=cfg.PORTFOLIO_MAX_POSITIONS)
+    parser.add_argument('--position-size', type=float, default=cfg.PORTFOLIO_POSITION_PCT)
+    parser.add_argument('--equity-out', help="Write the equity curve to this CSV file")
+    args = parser.parse_args(argv)
+    matrix, errors = load_matrix(args.tickers, args.interval, args.period)
+    trades, performance, equity = backtest_portfolio(matrix, max_positions=args.max_positions,
+                                                     position_size=args.position_size)
+    for key, value in performance.items():
+        print(f"{key}: {value}")
+    for ticker, error in sorted(errors.items()):
+        print(f"{ticker}: {error}")
+    if args.equity_out:
+        equity.to_csv(args.equity_out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import os
+import time
+import pandas as pd
+import yfinance as yf
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class DataProvider:
+    """Base class for OHLCV bar sources used behind the bar store"""
+    name = 'base'
+
+    def history(self, ticker, interval, period=None, start=None):
+        """OHLCV DataFrame indexed by bar timestamp, for a yfinance `period` or from an inclusive `start`"""
+        raise NotImplementedError
+
+
+class YFinanceProvider(DataProvider):
+    """Yahoo Finance provider (network), pooling connections through one HTTP session"""
+    name = 'yfinance'
+
+    def __init__(self, session=None):
+        self.session = session
+
+    def history(self, ticker, interval, period=None, start=None):
+        stock = yf.Ticker(ticker, session=self.session)
+        if start is not None:
+            df = stock.history(start=start, interval=interval)
+        else:
+            df = stock.history(period=period, interval=interval)
+        return df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+
+
+class FileProvider(DataProvider):
+    """Stand-in for yfinance reading `<root>/<TICKER>_<interval>.csv` (or `.pkl`), with optional `latency`"""
+    name = 'file'
+
+    def __init__(self, root, latency=0.0):
+        self.root = root
+        self.latency = latency
+        self.calls = 0
+        self._frames = {}
+
+    def _load(self, ticker, interval):
+        key = (ticker.upper(), interval)
+        if key not in self._frames:
+            base = os.path.join(self.root, f"{ticker.upper()}_{interval}")
+            if os.path.exists(base + '.pkl'):
+                df = pd.read_pickle(base + '.pkl')
+            elif os.path.exists(base + '.csv'):
+                df = pd.read_csv(base + '.csv', index_col=0)
+                df.index = pd.to_datetime(df.index, utc=True)
+            else:
+                df = pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], tz='UTC'))
+            self._frames[key] = df[OHLCV_COLUMNS].sort_index()
+        return self._frames[key]
+
+    def history(self, ticker, interval, period=None, start=None):
+        from .bar_store import slice_period    # Avoid circular import at module load
+
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        df = self._load(ticker, interval)
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start)].copy()
+        return slice_period(df, period, interval).copy()
@@ -0,0 +1,112 @@
+import argparse
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+from .bar_store import BarStore, interval_to_timedelta, is_intraday
+from .providers import OHLCV_COLUMNS
+
+DAY_NS = 86_400 * 10 ** 9
+
+
+def _local_ns(index):
+    """Wall-clock nanoseconds of each bar in the index's own time zone"""
+    index = index.as_unit('ns')
+    return index.tz_localize(None).asi8 if index.tz is not None else index.asi8
+
+
+def session_anchor(index):
+    """Earliest time of day (ns after local midnight) in a bar index, e.g. the 09:30 session open"""
+    if len(index) == 0:
+        return 0
+    return int((_local_ns(index) % DAY_NS).min())
+
+
+def bin_starts(index, interval, anchor=0):
+    """UTC nanosecond start of the `interval` bin each bar falls into"""
+    local = _local_ns(index)
+    utc = index.as_unit('ns').asi8
+    if is_intraday(interval):    # From the session anchor, like the provider's own 1h bars
+        width = interval_to_timedelta(interval).value
+        offset = anchor % width
+        bins = (local - offset) // width * width + offset
+    else:    # Local midnight
+        bins = local // DAY_NS * DAY_NS
+    return bins - (local - utc)
+
+
+def resample_bars(df, interval, anchor=None):
+    """Aggregate sorted bars into coarser `interval` bars (open first, high max, low min, close last, volume sum)"""
+    if anchor is None:
+        anchor = session_anchor(df.index)
+    if df.empty:
+        return df[OHLCV_COLUMNS].copy()
+    bins = bin_starts(df.index, interval, anchor)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], len(bins)] - 1
+    values = {name: df[name].to_numpy(dtype=np.float64) for name in OHLCV_COLUMNS}
+    data = {
+        'Open': values['Open'][starts],
+        'High': np.fmax.reduceat(values['High'], starts),
+        'Low': np.fmin.reduceat(values['Low'], starts),
+        'Close': values['Close'][ends],
+        'Volume': np.add.reduceat(np.nan_to_num(values['Volume']), starts),
+    }
+    index = pd.DatetimeIndex(pd.to_datetime(bins[starts], unit='ns', utc=True))
+    if df.index.tz is not None:
+        index = index.tz_convert(df.index.tz)
+    return pd.DataFrame(data, index=index)
+
+
+def _coverage(*values):
+    values = [v for v in values if v is not None]
+    if 'max' in values:
+        return 'max'
+    return max(values) if values else None
+
+
+def update_tier(store, ticker, interval, base=cfg.RESAMPLE_BASE_INTERVAL):
+    """Bring the stored `interval` series up to date from the stored `base` series; returns bars written"""
+    base_meta = store.read_meta(ticker, base)
+    if base_meta is None or base_meta['rows'] == 0:
+        return 0
+    tier = store.read_meta(ticker, interval)
+    source = (tier or {}).get('resampled')
+    fields = {'fetched_at': base_meta.get('fetched_at')}
+    stamp = {'base': base, 'base_first_ts': base_meta['first_ts'], 'base_last_ts': base_meta['last_ts'],
+             'base_rows': base_meta['rows'], 'base_fetched_at': base_meta.get('fetched_at')}
+
+    if (source and source['base'] == base and source['base_first_ts'] == base_meta['first_ts']
+            and source['base_rows'] <= base_meta['rows'] and tier['rows']):
+        if all(source.get(key) == value for key, value in stamp.items()):
+            return 0    # The base's last bar may be rewritten in place, hence fetched_at
+        # Re-aggregate from the tier's last, possibly partial, bin onwards
+        bars = store.read_since(ticker, base, pd.Timestamp(tier['last_ts'], tz='UTC'))
+        stamp['anchor'] = source['anchor']
+        return store.append(ticker, interval, resample_bars(bars, interval, source['anchor']),
+                            resampled=stamp, **fields)
+
+    bars = store.read(ticker, base)
+    stamp['anchor'] = session_anchor(bars.index)
+    derived = resample_bars(bars, interval, stamp['anchor'])
+    existing = store.read(ticker, interval)    # Keep provider bars older than the base series
+    older = existing[existing.index < derived.index[0]]
+    fields['coverage_days'] = _coverage((tier or {}).get('coverage_days'), base_meta.get('coverage_days'))
+    store.write(ticker, interval, pd.concat([older, derived]) if len(older) else derived,
+                resampled=stamp, **fields)
+    return len(derived)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild resampled interval tiers from stored base bars")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--intervals', nargs='+', default=list(cfg.RESAMPLED_INTERVALS))
+    parser.add_argument('--base', default=cfg.RESAMPLE_BASE_INTERVAL)
+    args = parser.parse_args(argv)
+    store = BarStore(cfg.BAR_STORE_DIR)
+    for ticker in args.tickers:
+        for interval in args.intervals:
+            print(f"{ticker} {interval}: {update_tier(store, ticker, interval, args.base)} bars")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+import ast
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+from .models import TradingStrategy
+
+# Parameters of TradingStrategy that rule expressions may refer to by name
+STRATEGY_PARAMS = ['risk_ratio', 'stop_loss_pct', 'rsi_oversold', 'rsi_overbought', 'stoch_oversold',
+                   'stoch_overbought', 'atr_multiplier', 'macd_threshold']
+
+_ARITHMETIC = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div'}
+_COMPARE = {ast.Lt: 'lt', ast.LtE: 'le', ast.Gt: 'gt', ast.GtE: 'ge', ast.Eq: 'eq', ast.NotEq: 'ne'}
+_SWAPPED = {'gt': 'lt', 'ge': 'le'}    # a > b is stored as b < a so both spellings share a node
+_COMMUTATIVE = {'add', 'mul', 'eq', 'ne', 'and', 'or'}
+_UFUNCS = {
+    'add': np.add, 'sub': np.subtract, 'mul': np.multiply, 'div': np.divide,
+    'lt': np.less, 'le': np.less_equal, 'eq': np.equal, 'ne': np.not_equal,
+    'and': np.logical_and, 'or': np.logical_or,
+}
+_PY = {
+    'add': lambda a, b: a + b, 'sub': lambda a, b: a - b, 'mul': lambda a, b: a * b, 'div': lambda a, b: a / b,
+    'lt': lambda a, b: a < b, 'le': lambda a, b: a <= b, 'eq': lambda a, b: a == b, 'ne': lambda a, b: a != b,
+}
+_FUNCTIONS = {'prev', 'abs', 'min', 'max', 'cross_above', 'cross_below'}    # prev(x, n=1) is x n bars ago
+_BOOL_OPS = {'lt', 'le', 'eq', 'ne', 'and', 'or', 'not', 'cross_above', 'cross_below'}
+
+
+def strategy_params(strategy):
+    """Rule parameters of a TradingStrategy instance"""
+    return {name: getattr(strategy, name) for name in STRATEGY_PARAMS}
+
+
+class RuleGraph:
+    """Python-syntax signal rules over frame columns and strategy parameters, compiled into one shared DAG"""
+
+    def __init__(self):
+        self._nodes = []    # (op, args) in topological order: children always precede parents
+        self._ids = {}    # Hash-consing: a node shared by several rules or variants is computed once
+        self.outputs = {}   # strategy -> {signal: node id}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _node(self, op, *args):
+        if op in _COMMUTATIVE:
+            args = tuple(sorted(set(args))) if op in ('and', 'or') else tuple(sorted(args))
+            if op in ('and', 'or') and len(args) == 1:
+                return args[0]
+        # Constants are keyed by type too: True == 1.0 would otherwise share a node
+        key = (op, args, type(args[0])) if op == 'const' else (op, args)
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self._nodes)
+            self._nodes.append((op, args))
+        return node
+
+    def _const(self, node):
+        op, args = self._nodes[node]
+        return args[0] if op == 'const' else None
+
+    def _binary(self, op, left, right):
+        if op in _SWAPPED:
+            op, left, right = _SWAPPED[op], right, left
+        a, b = self._const(left), self._const(right)
+        if a is not None and b is not None:
+            value = _PY[op](a, b)
+            return self._node('const', float(value) if op in _ARITHMETIC.values() else bool(value))
+        return self._node(op, left, right)
+
+    def _compile(self, expr, params):
+        if isinstance(expr, ast.Expression):
+            return self._compile(expr.body, params)
+        if isinstance(expr, ast.Constant) and isinstance(expr.value, (int, float)):
+            return self._node('const', float(expr.value))
+        if isinstance(expr, ast.Name):
+            if expr.id in params:
+                return self._node('const', float(params[expr.id]))
+            return self._node('column', expr.id)
+        if isinstance(expr, ast.BinOp) and type(expr.op) in _ARITHMETIC:
+            return self._binary(_ARITHMETIC[type(expr.op)], self._compile(expr.left, params),
+                                self._compile(expr.right, params))
+        if isinstance(expr, ast.UnaryOp) and isinstance(expr.op, ast.USub):
+            operand = self._compile(expr.operand, params)
+            return self._binary('sub', self._node('const', 0.0), operand)
+        if isinstance(expr, ast.UnaryOp) and isinstance(expr.op, ast.Not):
+            return self._node('not', self._compile(expr.operand, params))
+        if isinstance(expr, ast.BoolOp):
+            op = 'and' if isinstance(expr.op, ast.And) else 'or'
+            args = []
+            for value in expr.values:
+                child = self._compile(value, params)
+                # Flatten nested and/or so equal conjunctions share a node whatever their grouping
+                args.extend(self._nodes[child][1] if self._nodes[child][0] == op else (child,))
+            return self._node(op, *args)
+        if isinstance(expr, ast.Compare):
+            terms = [self._compile(expr.left, params)] + [self._compile(c, params) for c in expr.comparators]
+            checks = [self._binary(_COMPARE[type(op)], a, b) for op, a, b in zip(expr.ops, terms, terms[1:])]
+            return checks[0] if len(checks) == 1 else self._node('and', *checks)
+        if isinstance(expr, ast.Call) and isinstance(expr.func, ast.Name) and not expr.keywords:
+            name = expr.func.id
+            args = [self._compile(a, params) for a in expr.args] if name in _FUNCTIONS else ()
+            if name == 'prev' and len(args) in (1, 2):
+                lag = int(self._const(args[1])) if len(args) == 2 else 1
+                return self._node('prev', args[0], lag)
+            if name == 'abs' and len(args) == 1:
+                return self._node('abs', args[0])
+            if name in ('min', 'max') and len(args) == 2:
+                return self._node(name, *sorted(args))
+            if name in ('cross_above', 'cross_below') and len(args) == 2:
+                return self._node(name, *args)
+        raise ValueError(f"Unsupported rule syntax: {ast.unparse(expr)}")
+
+    def add(self, name, rules=None, params=None):
+        """Compile `{signal: expression}` for strategy `name`, with parameters folded in"""
+        rules = rules or cfg.SIGNAL_RULES
+        params = params or {}
+        self.outputs[name] = {signal: self._compile(ast.parse(text, mode='eval'), params)
+                              for signal, text in rules.items()}
+        return self
+
+    def columns(self):
+        """Frame columns the compiled rules read"""
+        return [args[0] for op, args in self._nodes if op == 'column']
+
+    def evaluate(self, frame):
+        """`{strategy: signals DataFrame}` for every compiled strategy, sharing all common nodes"""
+        n = len(frame)
+        wanted = {node for signals in self.outputs.values() for node in signals.values()}
+        last_use = {}
+        for i, (op, args) in enumerate(self._nodes):
+            for child in self._children(op, args):
+                last_use[child] = i
+        pools = {np.dtype(bool): [], np.dtype(np.float64): []}
+        values, owned = {}, set()
+
+        def buffer(dtype):
+            pool = pools[np.dtype(dtype)]
+            return pool.pop() if pool else np.empty(n, dtype=dtype)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i, (op, args) in enumerate(self._nodes):
+                if op == 'const':
+                    values[i] = args[0]
+                elif op == 'column':
+                    values[i] = frame[args[0]].to_numpy(dtype=np.float64)
+                else:
+                    out = buffer(bool if op in _BOOL_OPS else np.float64)
+                    self._apply(op, args, values, out)
+                    values[i] = out
+                    owned.add(i)
+                for child in self._children(op, args):    # Recycle buffers so memory follows the graph's width
+                    if last_use.get(child) == i and child in owned and child not in wanted:
+                        pools[values[child].dtype].append(values.pop(child))
+                        owned.discard(child)
+
+        results = {}
+        for name, signals in self.outputs.items():
+            data = {}
+            for signal, node in signals.items():
+                value = values[node]
+                data[signal] = np.full(n, bool(value)) if np.ndim(value) == 0 else value
+            # Variants sharing an output node share its array (copy-on-write keeps them independent)
+            results[name] = pd.DataFrame(data, index=frame.index, copy=False)
+        return results
+
+    def _children(self, op, args):
+        if op in ('const', 'column'):
+            return ()
+        if op == 'prev':
+            return (args[0],)
+        return args
+
+    @staticmethod
+    def _apply(op, args, values, out):
+        if op in _UFUNCS:
+            a, b = (values[arg] for arg in args[:2])
+            _UFUNCS[op](a, b, out=out)
+            for arg in args[2:]:    # n-ary and/or
+                _UFUNCS[op](out, values[arg], out=out)
+        elif op == 'not':
+            np.logical_not(values[args[0]], out=out)
+        elif op == 'abs':
+            np.abs(values[args[0]], out=out)
+        elif op in ('min', 'max'):
+            (np.minimum if op == 'min' else np.maximum)(values[args[0]], values[args[1]], out=out)
+        elif op == 'prev':
+            source, lag = values[args[0]], min(args[1], len(out))
+            out[:lag] = np.nan
+            out[lag:] = source[:len(source) - lag]
+        elif op in ('cross_above', 'cross_below'):
+            if not len(out):
+                return
+            diff = np.broadcast_to(np.subtract(values[args[0]], values[args[1]]), out.shape)
+            now, before = (diff > 0, diff <= 0) if op == 'cross_above' else (diff < 0, diff >= 0)
+            out[0] = False
+            np.logical_and(now[1:], before[:-1], out=out[1:])
+
+
+def compile_variants(combos, rules=None):
+    """RuleGraph with one strategy per parameter dict, each applied over the TradingStrategy defaults"""
+    base = strategy_params(TradingStrategy())
+    graph = RuleGraph()
+    for i, combo in enumerate(combos):
+        graph.add(i, rules, {**base, **combo})
+    return graph
+
+
+def main(argv=None):
+    from .optimizer import param_combinations
+    from .indicator_frame import indicators
+    from .data_service import fetch_data
+
+    parser = argparse.ArgumentParser(description="Evaluate many strategy variants through one compiled rule graph")
+    parser.add_argument('ticker')
+    parser.add_argument('--period', default='5d')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--variants', type=int, default=50)
+    args = parser.parse_args(argv)
+    combos = param_combinations(n_random=args.variants, seed=0)
+    frame = indicators(fetch_data(args.ticker, args.period, args.interval))
+    graph = compile_variants(combos)
+    started = time.perf_counter()
+    results = graph.evaluate(frame)
+    elapsed = time.perf_counter() - started
+    single = compile_variants(combos[:1])
+    started = time.perf_counter()
+    single.evaluate(frame)
+    one = time.perf_counter() - started
+    entries = sum(int(signals['entry'].sum()) for signals in results.values())
+    print(f"{len(combos)} variants -> {len(graph)} nodes ({len(single)} for one); "
+          f"{elapsed * 1e3:.2f} ms vs {one * 1e3:.2f} ms for one variant; {entries} entries")
+
+
+if __name__ == '__main__':
+    main()
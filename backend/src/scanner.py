@@ -0,0 +1,140 @@
+import os
+import time
+import logging
+import argparse
+import pandas as pd
+from .config import TradingConfig as cfg
+from .bar_store import slice_period
+from .cache import TTLCache
+from .data_service import get_store
+from .fetcher import fetch_many
+from .indicator_frame import indicators_and_signals
+from .metrics import metrics
+from .batch import store_pool, worker_store, chunks
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_COLUMNS = ['entry', 'exit', 'stop_loss']
+SCAN_COLUMNS = ['ticker', 'time', 'close', 'change_pct'] + SIGNAL_COLUMNS + ['RSI', 'MACD', 'Stoch_K']
+
+# Latest-bar rows per (ticker, period, interval), versioned by the stored series
+result_cache = TTLCache(cfg.SCAN_CACHE_SIZE)
+_pool = None
+_pool_root = None
+
+
+def load_watchlist(path=None):
+    """Ticker symbols from a text file (one per line, '#' comments) or cfg.WATCHLIST"""
+    path = path or cfg.WATCHLIST_FILE
+    if path and os.path.exists(path):
+        with open(path) as f:
+            tickers = [line.split('#')[0].strip().upper() for line in f]
+        return [t for t in tickers if t]
+    return list(cfg.WATCHLIST)
+
+
+def scan_symbol(store, ticker, period, interval, strategy=None):
+    """Indicators and signals of one symbol's latest bar, read from the bar store"""
+    row = {'ticker': ticker}
+    try:
+        df = slice_period(store.read(ticker, interval), period, interval)
+        if len(df) < 2:
+            raise ValueError("Insufficient data in bar store.")
+        signals, df = indicators_and_signals(df, strategy)
+        last, prev = df.iloc[-1], df.iloc[-2]
+        row.update(time=df.index[-1], close=last['Close'],
+                   change_pct=(last['Close'] / prev['Close'] - 1) * 100,
+                   RSI=last['RSI'], MACD=last['MACD'], Stoch_K=last['Stoch_K'], error=None)
+        row.update({name: bool(signals[name].iloc[-1]) for name in SIGNAL_COLUMNS})
+    except Exception as e:
+        row.update(error=str(e))
+    return row
+
+
+def _scan_chunk(jobs):
+    return [scan_symbol(worker_store(), *job) for job in jobs]
+
+
+def _get_pool(store_root, workers):
+    """Worker processes are kept between scans so each scan skips the interpreter start-up"""
+    global _pool, _pool_root
+    if _pool is None or _pool_root != store_root:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = store_pool(store_root, workers)
+        _pool_root = store_root
+    return _pool
+
+
+def _version(store, ticker, interval):
+    """Last bar timestamp, row count and the (possibly still forming) last bar's values"""
+    rows, arrays = store.columns(ticker, interval, ['Close', 'Volume'])
+    if not rows:
+        return None
+    return int(arrays['ts'][-1]), rows, float(arrays['Close'][-1]), float(arrays['Volume'][-1])
+
+
+def scan(tickers, period, interval, store=None, provider=None, workers=cfg.SCAN_WORKERS,
+         chunk_size=cfg.SCAN_CHUNK_SIZE, fired_only=True):
+    """Evaluate the latest bar of every ticker and return `(table, errors)`"""
+    started = time.monotonic()
+    store = store or get_store()
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    with metrics.stage('scan_fetch'):
+        _, errors = fetch_many(tickers, period, interval, store, provider, read=False)
+
+    rows, jobs, versions = [], [], {}
+    for ticker in tickers:
+        if ticker in errors:
+            continue
+        version = _version(store, ticker, interval)
+        cached = result_cache.get((ticker, period, interval), version) if version is not None else None
+        if cached is not None:
+            rows.append(cached)
+        else:
+            versions[ticker] = version
+            jobs.append((ticker, period, interval))
+
+    if jobs:
+        workers = workers or os.cpu_count()
+        with metrics.stage('scan_evaluate'):
+            if workers == 1 or len(jobs) <= chunk_size:
+                results = [scan_symbol(store, *job) for job in jobs]
+            else:
+                pool = _get_pool(store.root, workers)
+                results = [row for chunk in pool.map(_scan_chunk, chunks(jobs, chunk_size)) for row in chunk]
+        for row in results:
+            if row['error'] is None:
+                result_cache.set((row['ticker'], period, interval), row, versions[row['ticker']])
+            rows.append(row)
+
+    errors.update({row['ticker']: row['error'] for row in rows if row['error'] is not None})
+    table = pd.DataFrame([row for row in rows if row['error'] is None], columns=SCAN_COLUMNS)
+    if fired_only:
+        table = table[table[SIGNAL_COLUMNS].any(axis=1)]
+    table = table.sort_values('ticker').reset_index(drop=True)
+
+    elapsed = time.monotonic() - started
+    if elapsed * 1000 > cfg.UPDATE_INTERVAL:
+        logger.warning("Scan of %d symbols took %.1fs, longer than the update interval", len(tickers), elapsed)
+    return table, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan a watchlist for entry/exit/stop-loss signals")
+    parser.add_argument('tickers', nargs='*', help="Defaults to the configured watchlist")
+    parser.add_argument('--watchlist', help="File with one ticker per line")
+    parser.add_argument('--period', default=cfg.SCAN_PERIOD)
+    parser.add_argument('--interval', default=cfg.SCAN_INTERVAL)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--all', action='store_true', help="List every symbol, not only those that fired")
+    args = parser.parse_args(argv)
+    tickers = args.tickers or load_watchlist(args.watchlist)
+    table, errors = scan(tickers, args.period, args.interval, workers=args.workers, fired_only=not args.all)
+    print(table.to_string())
+    for ticker, error in sorted(errors.items()):
+        print(f"{ticker}: {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import time
+import heapq
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import TradingConfig as cfg
+from .data_service import next_refresh, supported
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PrecomputeScheduler:
+    """Background thread that re-runs `task(symbol, period, interval)` for a watchlist as bars close"""
+
+    def __init__(self, task, symbols=(), periods=cfg.PRECOMPUTE_PERIODS, intervals=cfg.PRECOMPUTE_INTERVALS,
+                 workers=cfg.PRECOMPUTE_WORKERS, max_pending=cfg.PRECOMPUTE_MAX_PENDING,
+                 delay=cfg.PRECOMPUTE_DELAY, jitter=cfg.PRECOMPUTE_JITTER, retry=1.0, clock=None):
+        self.task = task
+        # Only the combinations the provider can serve (as in the dashboard's interval menu)
+        self.grid = [(period, interval) for interval in intervals for period in periods if supported(period, interval)]
+        self.max_pending = max_pending
+        self.delay = delay
+        self.jitter = jitter
+        self.retry = retry
+        self.clock = clock or time.time
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='precompute')
+        self._heap = []
+        self._symbols = set()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self._stopped = False
+        self.watch(symbols)
+
+    def _push(self, job, due):
+        heapq.heappush(self._heap, (due, job))
+
+    def watch(self, symbols):
+        """Add symbols to the watchlist; they are warmed right away (with jitter)"""
+        now = self.clock()
+        with self._lock:
+            for symbol in symbols:
+                symbol = symbol.upper()
+                if symbol in self._symbols:
+                    continue
+                self._symbols.add(symbol)
+                for period, interval in self.grid:
+                    self._push((symbol, period, interval), now + random.uniform(0, self.jitter))
+            self._wake.notify()
+
+    def unwatch(self, symbols):
+        with self._lock:
+            self._symbols.difference_update(s.upper() for s in symbols)
+
+    def watching(self, symbol):
+        return symbol.upper() in self._symbols
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='precompute-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        with self._lock:
+            self._stopped = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._stopped and (not self._heap or self._heap[0][0] > self.clock()):
+                    timeout = self._heap[0][0] - self.clock() if self._heap else None
+                    self._wake.wait(timeout)
+                if self._stopped:
+                    return
+                due, job = heapq.heappop(self._heap)
+                symbol, _, interval = job
+                if symbol not in self._symbols:
+                    continue    # Unwatched: let the job lapse
+                if len(self._pending) >= self.max_pending:
+                    # Backpressure: hold the job back until the pool has caught up
+                    self._push(job, self.clock() + self.retry + random.uniform(0, self.jitter))
+                    metrics.inc('precompute_jobs_total', status='deferred')
+                    continue
+                run = job not in self._pending
+                self._pending.add(job)
+            # next_refresh reads the store's metadata, so it runs without holding the lock; `delay` lets
+            # the provider publish the closed bar and jitter spreads the watchlist's requests
+            due = next_refresh(interval, symbol) + self.delay + random.uniform(0, self.jitter)
+            with self._lock:
+                self._push(job, due)
+            if not run:    # Still queued or running from its last due time: skip rather than stack
+                metrics.inc('precompute_jobs_total', status='skipped')
+                continue
+            self._pool.submit(self._execute, job)
+
+    def _execute(self, job):
+        symbol, period, interval = job
+        try:
+            with metrics.timer('precompute', interval=interval):
+                self.task(symbol, period, interval)
+            metrics.inc('precompute_jobs_total', status='ok')
+        except Exception as e:
+            metrics.inc('precompute_jobs_total', status='error')
+            logger.warning("Precompute of %s %s %s failed: %s", symbol, period, interval, e)
+        finally:
+            with self._lock:
+                self._pending.discard(job)
+
+    def stats(self):
+        with self._lock:
+            return {'symbols': len(self._symbols), 'scheduled': len(self._heap), 'pending': len(self._pending),
+                    'next_due': self._heap[0][0] if self._heap else None}
+
+
+metrics.describe('precompute_seconds', "Background precompute job wall time")
+metrics.describe('precompute_jobs_total', "Background precompute jobs by outcome")
@@ -0,0 +1,244 @@
+import os
+import time
+import atexit
+import pickle
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+from .config import TradingConfig as cfg
+from .cache import TTLCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT, key TEXT, version TEXT, value BLOB, size INTEGER, stored_at REAL, used_at REAL,
+    PRIMARY KEY (namespace, key));
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used_at);
+CREATE TABLE IF NOT EXISTS locks (namespace TEXT, key TEXT, owner TEXT, expires REAL, PRIMARY KEY (namespace, key));
+DROP TABLE IF EXISTS counters;
+CREATE TABLE IF NOT EXISTS hit_counts (namespace TEXT PRIMARY KEY, hits INTEGER, misses INTEGER, coalesced INTEGER);
+"""
+
+
+class SharedCache:
+    """Versioned cache shared by every worker process on a host, backed by one SQLite file"""
+
+    def __init__(self, namespace, maxsize=128, ttl=None, path=cfg.SHARED_CACHE_PATH,
+                 max_bytes=cfg.SHARED_CACHE_MAX_MB * 2 ** 20, lock_timeout=cfg.SHARED_CACHE_LOCK_TIMEOUT,
+                 flush_interval=cfg.SHARED_CACHE_FLUSH_INTERVAL, poll=0.02):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout
+        self.flush_interval = flush_interval
+        self.poll = poll
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._counts = {'hits': 0, 'misses': 0, 'coalesced': 0}    # Not yet added to hit_counts
+        self._counts_pid = os.getpid()
+        self._flushed_at = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+        atexit.register(self._flush_counts)
+
+    def _connection(self):
+        """One connection per thread and process (connections must not cross a fork)"""
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _take_counts(self):
+        """Counts since the last flush, reset to zero (a forked child drops its parent's)"""
+        counts, self._counts = self._counts, {'hits': 0, 'misses': 0, 'coalesced': 0}
+        if self._counts_pid != os.getpid():
+            self._counts_pid = os.getpid()
+            return self._counts.copy()
+        return counts
+
+    def _count(self, name):
+        with self._lock:
+            if self._counts_pid != os.getpid():
+                self._take_counts()
+            self._counts[name] += 1
+            due = time.monotonic() - self._flushed_at > self.flush_interval
+        if due:
+            self._flush_counts()
+
+    def _flush_counts(self):
+        """Add this process's counts since the last flush to the namespace totals"""
+        with self._lock:
+            counts = self._take_counts()
+            self._flushed_at = time.monotonic()
+        if not any(counts.values()):
+            return
+        try:
+            self._connection().execute(
+                "INSERT INTO hit_counts VALUES (?, ?, ?, ?) ON CONFLICT (namespace) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses, "
+                "coalesced = coalesced + excluded.coalesced",
+                (self.namespace, counts['hits'], counts['misses'], counts['coalesced']))
+        except sqlite3.Error:
+            with self._lock:    # Keep them for the next flush
+                for name, count in counts.items():
+                    self._counts[name] += count
+            raise
+
+    def _lookup(self, key, version):
+        row = self._connection().execute(
+            "SELECT version, value, stored_at FROM entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)).fetchone()
+        if row is None or row[0] != version or (self.ttl is not None and time.time() - row[2] > self.ttl):
+            return False, None
+        self._connection().execute("UPDATE entries SET used_at = ? WHERE namespace = ? AND key = ?",
+                                   (time.time(), self.namespace, key))
+        return True, pickle.loads(row[1])
+
+    def get(self, key, version=None, default=None):
+        found, value = self._lookup(repr(key), repr(version))
+        self._count('hits' if found else 'misses')
+        return value if found else default
+
+    def set(self, key, value, version=None):
+        self._store(repr(key), repr(version), value)
+
+    def _store(self, key, version, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (self.namespace, key, version, blob, len(blob), now, now))
+            excess = db.execute("SELECT COUNT(*) - ? FROM entries WHERE namespace = ?",
+                                (self.maxsize, self.namespace)).fetchone()[0]
+            if excess > 0:
+                db.execute("DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries WHERE namespace = ? "
+                           "ORDER BY used_at LIMIT ?)", (self.namespace, excess))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            while total > self.max_bytes:
+                row = db.execute("SELECT rowid, size FROM entries ORDER BY used_at LIMIT 1").fetchone()
+                db.execute("DELETE FROM entries WHERE rowid = ?", (row[0],))
+                total -= row[1]
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _owner():
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _acquire(self, key):
+        """Take the cross-process compute lock for `key`; False while another live worker holds it"""
+        now = time.time()
+        db = self._connection()
+        db.execute("DELETE FROM locks WHERE namespace = ? AND key = ? AND expires < ?", (self.namespace, key, now))
+        try:
+            db.execute("INSERT INTO locks VALUES (?, ?, ?, ?)",
+                       (self.namespace, key, self._owner(), now + self.lock_timeout))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    @contextmanager
+    def _lease(self, key):
+        """Renew the compute lock for `key` while its owner is still computing"""
+        owner, done = self._owner(), threading.Event()
+
+        def renew():
+            while not done.wait(self.lock_timeout / 3):
+                self._connection().execute(
+                    "UPDATE locks SET expires = ? WHERE namespace = ? AND key = ? AND owner = ?",
+                    (time.time() + self.lock_timeout, self.namespace, key, owner))
+
+        thread = threading.Thread(target=renew, name='shared-cache-lease', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _release(self, key):
+        self._connection().execute("DELETE FROM locks WHERE namespace = ? AND key = ? AND owner = ?",
+                                   (self.namespace, key, self._owner()))
+
+    def get_or_compute(self, key, compute, version=None):
+        """Return the cached value or run `compute()` once for all concurrent callers on the host"""
+        key, version = repr(key), repr(version)
+        found, value = self._lookup(key, version)
+        if found:
+            self._count('hits')
+            return value
+        with self._lock:    # Threads of this process share one computation without polling
+            future = self._inflight.get((key, version))
+            owner = future is None
+            if owner:
+                future = self._inflight[(key, version)] = Future()
+        if not owner:
+            self._count('coalesced')
+            return future.result()
+        try:
+            while not self._acquire(key):
+                time.sleep(self.poll)
+                found, value = self._lookup(key, version)
+                if found:
+                    self._count('coalesced')
+                    future.set_result(value)
+                    return value
+            try:
+                found, value = self._lookup(key, version)    # Filled while we waited for the lock
+                if found:
+                    self._count('hits')
+                else:
+                    self._count('misses')
+                    with self._lease(key):
+                        value = compute()
+                    self._store(key, version, value)
+            finally:
+                self._release(key)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop((key, version), None)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+
+    def stats(self):
+        """Counters summed over all worker processes, plus entry count and stored bytes"""
+        self._flush_counts()
+        db = self._connection()
+        hits, misses, coalesced = db.execute(
+            "SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(misses), 0), COALESCE(SUM(coalesced), 0) "
+            "FROM hit_counts WHERE namespace = ?", (self.namespace,)).fetchone()
+        size, nbytes = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+                                  (self.namespace,)).fetchone()
+        total = hits + misses
+        return {
+            'size': size,
+            'bytes': nbytes,
+            'hits': hits,
+            'misses': misses,
+            'coalesced': coalesced,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+
+def make_cache(namespace, maxsize=128, ttl=None):
+    """TTLCache, or a SharedCache when cfg.CACHE_BACKEND is 'shared' (several server workers)"""
+    if cfg.CACHE_BACKEND == 'shared':
+        return SharedCache(namespace, maxsize, ttl)
+    return TTLCache(maxsize, ttl)
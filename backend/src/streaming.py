@@ -0,0 +1,397 @@
+import os
+import json
+import math
+from collections import deque
+import pandas as pd
+from .config import TradingConfig as cfg
+
+NAN = float('nan')
+
+# Columns produced by calculate_indicators and TradingStrategy.calculate_signals
+INDICATOR_COLUMNS = ['RSI', 'MACD', 'MACD_signal', 'BB_high', 'BB_low',
+                     'ATR', 'Stoch_K', 'Stoch_D', 'OBV', 'VWAP']
+
+
+def _div(num, den):
+    """Float division with numpy semantics (inf/nan instead of raising)"""
+    if den == 0:
+        if num == 0 or num != num:
+            return NAN
+        return math.copysign(math.inf, num)
+    return num / den
+
+
+class _EMA:
+    """Recursive EMA matching `Series.ewm(alpha=..., adjust=False, min_periods=...).mean()`"""
+
+    def __init__(self, alpha, min_periods):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x):
+        if x == x:
+            self.value = x if self.count == 0 else (1 - self.alpha) * self.value + self.alpha * x
+            self.count += 1
+        return self.current()
+
+    def current(self):
+        return self.value if self.count >= self.min_periods else NAN
+
+    def to_dict(self):
+        return {'value': self.value, 'count': self.count}
+
+    def load(self, state):
+        self.value = state['value']
+        self.count = state['count']
+
+
+class _RollingMean:
+    """Fixed-window mean/std over a deque with running sums"""
+    resync = 1000    # Updates between rebuilding the sums from the window, bounding floating point drift
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self.updates = 0
+
+    def update(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old != old:
+                self.nan_count -= 1
+            else:
+                self.total -= old
+                self.total_sq -= old * old
+        self.values.append(x)
+        if x != x:
+            self.nan_count += 1
+        else:
+            self.total += x
+            self.total_sq += x * x
+        self.updates += 1
+        if self.updates % self.resync == 0:
+            self._resync()
+
+    def _resync(self):
+        valid = [v for v in self.values if v == v]
+        self.total = math.fsum(valid)
+        self.total_sq = math.fsum(v * v for v in valid)
+
+    def ready(self):
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def mean(self):
+        return self.total / self.window if self.ready() else NAN
+
+    def std(self):
+        """Population standard deviation (ddof=0)"""
+        if not self.ready():
+            return NAN
+        mean = self.total / self.window
+        return math.sqrt(max(self.total_sq / self.window - mean * mean, 0.0))
+
+    def to_dict(self):
+        return {'values': list(self.values), 'updates': self.updates}
+
+    def load(self, state):
+        self.values = deque(state['values'], maxlen=self.window)
+        self.nan_count = sum(1 for v in self.values if v != v)
+        self.updates = state['updates']
+        self._resync()
+
+
+class _RollingExtreme:
+    """Rolling min or max over a monotonic deque (amortized O(1))"""
+
+    def __init__(self, window, mode):
+        self.window = window
+        self.better = (lambda a, b: a <= b) if mode == 'min' else (lambda a, b: a >= b)
+        self.items = deque()
+        self.count = 0
+
+    def update(self, x):
+        while self.items and self.better(x, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((self.count, x))
+        if self.items[0][0] <= self.count - self.window:
+            self.items.popleft()
+        self.count += 1
+        return self.items[0][1] if self.count >= self.window else NAN
+
+    def to_dict(self):
+        return {'items': [list(item) for item in self.items], 'count': self.count}
+
+    def load(self, state):
+        self.items = deque(tuple(item) for item in state['items'])
+        self.count = state['count']
+
+
+class StreamingIndicator:
+    """Base class for incremental indicators: constant-time `update` per bar, JSON-able state"""
+    outputs = ()
+
+    def update(self, high, low, close, volume):
+        raise NotImplementedError
+
+    def to_dict(self):
+        raise NotImplementedError
+
+    def load(self, state):
+        raise NotImplementedError
+
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder RSI, equivalent to ta.momentum.RSIIndicator"""
+    outputs = ('RSI',)
+
+    def __init__(self, window=cfg.RSI_PERIOD):
+        self.window = window
+        self.prev_close = None
+        self.up = _EMA(1 / window, window)
+        self.down = _EMA(1 / window, window)
+
+    def update(self, high, low, close, volume):
+        diff = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        up = self.up.update(diff if diff > 0 else 0.0)
+        down = self.down.update(-diff if diff < 0 else 0.0)
+        if down == 0:
+            return (100.0,)
+        return (100 - 100 / (1 + _div(up, down)),)
+
+    def to_dict(self):
+        return {'prev_close': self.prev_close, 'up': self.up.to_dict(), 'down': self.down.to_dict()}
+
+    def load(self, state):
+        self.prev_close = state['prev_close']
+        self.up.load(state['up'])
+        self.down.load(state['down'])
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD line and signal, equivalent to ta.trend.MACD"""
+    outputs = ('MACD', 'MACD_signal')
+
+    def __init__(self, fast=cfg.MACD_FAST, slow=cfg.MACD_SLOW, signal=cfg.MACD_SIGNAL):
+        self.fast = _EMA(2 / (fast + 1), fast)
+        self.slow = _EMA(2 / (slow + 1), slow)
+        self.signal = _EMA(2 / (signal + 1), signal)
+
+    def update(self, high, low, close, volume):
+        macd = self.fast.update(close) - self.slow.update(close)
+        return macd, self.signal.update(macd)
+
+    def to_dict(self):
+        return {'fast': self.fast.to_dict(), 'slow': self.slow.to_dict(), 'signal': self.signal.to_dict()}
+
+    def load(self, state):
+        self.fast.load(state['fast'])
+        self.slow.load(state['slow'])
+        self.signal.load(state['signal'])
+
+
+class StreamingBollinger(StreamingIndicator):
+    """Bollinger Bands, equivalent to ta.volatility.BollingerBands"""
+    outputs = ('BB_high', 'BB_low')
+
+    def __init__(self, window=cfg.BB_PERIOD, window_dev=cfg.BB_STD):
+        self.window_dev = window_dev
+        self.stats = _RollingMean(window)
+
+    def update(self, high, low, close, volume):
+        self.stats.update(close)
+        mean, std = self.stats.mean(), self.stats.std()
+        return mean + self.window_dev * std, mean - self.window_dev * std
+
+    def to_dict(self):
+        return {'stats': self.stats.to_dict()}
+
+    def load(self, state):
+        self.stats.load(state['stats'])
+
+
+class StreamingATR(StreamingIndicator):
+    """Simple-average true range as computed in TradingStrategy.calculate_signals"""
+    outputs = ('ATR',)
+
+    def __init__(self, window=14):
+        self.prev_close = None
+        self.stats = _RollingMean(window)
+
+    def update(self, high, low, close, volume):
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.stats.update(true_range)
+        return (self.stats.mean(),)
+
+    def to_dict(self):
+        return {'prev_close': self.prev_close, 'stats': self.stats.to_dict()}
+
+    def load(self, state):
+        self.prev_close = state['prev_close']
+        self.stats.load(state['stats'])
+
+
+class StreamingStochastic(StreamingIndicator):
+    """Stochastic %K/%D as computed in TradingStrategy.calculate_signals"""
+    outputs = ('Stoch_K', 'Stoch_D')
+
+    def __init__(self, window=14, smooth=3):
+        self.low_min = _RollingExtreme(window, 'min')
+        self.high_max = _RollingExtreme(window, 'max')
+        self.k_values = _RollingMean(smooth)
+
+    def update(self, high, low, close, volume):
+        low_min = self.low_min.update(low)
+        high_max = self.high_max.update(high)
+        k = 100 * _div(close - low_min, high_max - low_min)
+        self.k_values.update(k)
+        return k, self.k_values.mean()
+
+    def to_dict(self):
+        return {'low_min': self.low_min.to_dict(), 'high_max': self.high_max.to_dict(),
+                'k_values': self.k_values.to_dict()}
+
+    def load(self, state):
+        self.low_min.load(state['low_min'])
+        self.high_max.load(state['high_max'])
+        self.k_values.load(state['k_values'])
+
+
+class StreamingOBV(StreamingIndicator):
+    """On-balance volume"""
+    outputs = ('OBV',)
+
+    def __init__(self):
+        self.prev_close = None
+        self.value = 0.0
+
+    def update(self, high, low, close, volume):
+        if self.prev_close is not None and close != self.prev_close:
+            self.value += volume if close > self.prev_close else -volume
+        self.prev_close = close
+        return (self.value,)
+
+    def to_dict(self):
+        return {'prev_close': self.prev_close, 'value': self.value}
+
+    def load(self, state):
+        self.prev_close = state['prev_close']
+        self.value = state['value']
+
+
+class StreamingVWAP(StreamingIndicator):
+    """Cumulative volume-weighted average close"""
+    outputs = ('VWAP',)
+
+    def __init__(self):
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def update(self, high, low, close, volume):
+        self.price_volume += close * volume
+        self.volume += volume
+        return (_div(self.price_volume, self.volume),)
+
+    def to_dict(self):
+        return {'price_volume': self.price_volume, 'volume': self.volume}
+
+    def load(self, state):
+        self.price_volume = state['price_volume']
+        self.volume = state['volume']
+
+
+class IndicatorEngine:
+    """Bundle of streaming indicators producing the batch pipeline's columns"""
+
+    def __init__(self, indicators=None, revisable=True):
+        self.indicators = indicators or [
+            StreamingRSI(), StreamingMACD(), StreamingBollinger(), StreamingATR(),
+            StreamingStochastic(), StreamingOBV(), StreamingVWAP()
+        ]
+        self.columns = [name for ind in self.indicators for name in ind.outputs]
+        self.last_ts = None
+        self.values = dict.fromkeys(self.columns, NAN)
+        self.revisable = revisable
+        self._previous = None
+
+    @classmethod
+    def from_history(cls, df, **kwargs):
+        engine = cls(**kwargs)
+        engine.run(df)
+        return engine
+
+    def update(self, high, low, close, volume, ts=None, revise=False):
+        """Apply one bar; `revise=True` replaces the previous (still forming) bar instead"""
+        if revise and self._previous is not None:
+            self.load(self._previous)
+        if self.revisable:    # A state snapshot per bar; engines fed only closed bars can skip it
+            self._previous = self.to_dict()
+        values = self.values
+        for ind in self.indicators:
+            for name, value in zip(ind.outputs, ind.update(high, low, close, volume)):
+                values[name] = value
+        if ts is not None:
+            self.last_ts = pd.Timestamp(ts)
+        return values
+
+    def update_bar(self, ts, bar, revise=False):
+        """Update from a row with High/Low/Close/Volume fields"""
+        return self.update(bar['High'], bar['Low'], bar['Close'], bar['Volume'], ts=ts, revise=revise)
+
+    def run(self, df):
+        """Feed every row of `df` and return the indicator columns as a DataFrame"""
+        rows = []
+        last = len(df) - 1
+        cols = zip(df['High'].tolist(), df['Low'].tolist(), df['Close'].tolist(), df['Volume'].tolist())
+        for i, (high, low, close, volume) in enumerate(cols):
+            if i == last:
+                # The last bar may still be forming: keep the state before it so it can be revised
+                if i:
+                    self.last_ts, self.values = df.index[i - 1], dict(zip(self.columns, rows[-1]))
+                self._previous = self.to_dict() if self.revisable else None
+            row = []
+            for ind in self.indicators:
+                row.extend(ind.update(high, low, close, volume))
+            rows.append(row)
+        if len(df):
+            self.last_ts = df.index[-1]
+            self.values = dict(zip(self.columns, rows[-1]))
+        return pd.DataFrame(rows, index=df.index, columns=self.columns)
+
+    def to_dict(self):
+        return {
+            'last_ts': None if self.last_ts is None else self.last_ts.isoformat(),
+            'values': self.values,
+            'indicators': [ind.to_dict() for ind in self.indicators],
+        }
+
+    def load(self, state):
+        self.last_ts = None if state['last_ts'] is None else pd.Timestamp(state['last_ts'])
+        self.values = dict(state['values'])
+        for ind, ind_state in zip(self.indicators, state['indicators']):
+            ind.load(ind_state)
+
+    @classmethod
+    def from_dict(cls, state, **kwargs):
+        engine = cls(**kwargs)
+        engine.load(state)
+        return engine
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def restore(cls, path, **kwargs):
+        with open(path) as f:
+            return cls.from_dict(json.load(f), **kwargs)
@@ -0,0 +1,125 @@
+import os
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .config import TradingConfig as cfg
+
+WINDOW_MODES = ('expanding', 'rolling')
+
+
+def walk_forward_folds(n, n_folds=cfg.WALK_FORWARD_FOLDS, train_fraction=cfg.TRAIN_TEST_SPLIT,
+                       mode='expanding'):
+    """(train_start, test_start, test_end) bar positions of each walk-forward fold"""
+    if mode not in WINDOW_MODES:
+        raise ValueError(f"Unknown walk-forward mode '{mode}'; expected one of {WINDOW_MODES}")
+    initial = int(n * train_fraction)
+    if initial < 1 or initial >= n:
+        raise ValueError("train_fraction leaves no training or test bars.")
+    bounds = np.linspace(initial, n, n_folds + 1).astype(int)
+    folds = []
+    for test_start, test_end in zip(bounds[:-1], bounds[1:]):
+        if test_end <= test_start:
+            continue
+        train_start = 0 if mode == 'expanding' else test_start - initial
+        folds.append((int(train_start), int(test_start), int(test_end)))
+    return folds
+
+
+def _init_worker(threads):
+    """Cap TensorFlow's thread pools so parallel folds do not oversubscribe the cores"""
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def fold_metrics(actual, predicted, previous):
+    """Error metrics of next-bar price predictions; `previous` is the close before each target"""
+    error = predicted - actual
+    naive = previous - actual    # Persistence forecast: next close = current close
+    return {
+        'rmse': float(np.sqrt(np.mean(error ** 2))),
+        'mae': float(np.mean(np.abs(error))),
+        'mape': float(np.mean(np.abs(error / actual)) * 100),
+        'naive_rmse': float(np.sqrt(np.mean(naive ** 2))),
+        'direction_accuracy': float(np.mean(np.sign(predicted - previous) == np.sign(actual - previous))),
+    }
+
+
+def evaluate_fold(close, fold, sequence_length=cfg.SEQUENCE_LENGTH, epochs=cfg.EPOCHS,
+                  batch_size=cfg.BATCH_SIZE, seed=0):
+    """Train on one fold's training bars and score next-bar predictions on its test bars"""
+    from .lstm import LSTMPredictor
+    import keras
+
+    train_start, test_start, test_end = fold
+    started = time.perf_counter()
+    keras.utils.set_random_seed(seed)
+    predictor = LSTMPredictor(sequence_length)
+    predictor.train(close[train_start:test_start], epochs=epochs, batch_size=batch_size)
+    trained = time.perf_counter()
+    inputs = close[max(test_start - sequence_length, train_start):test_end]
+    predicted = predictor.predict(inputs, fit_scaler=False)[:, 0]
+    actual = close[test_end - len(predicted):test_end]
+    previous = close[test_end - len(predicted) - 1:test_end - 1]
+    row = {'train_start': train_start, 'test_start': test_start, 'test_end': test_end,
+           'train_bars': test_start - train_start, 'test_bars': len(predicted)}
+    row.update(fold_metrics(actual, predicted, previous))
+    row.update(train_seconds=trained - started, predict_seconds=time.perf_counter() - trained,
+               seconds=time.perf_counter() - started, pid=os.getpid())
+    return row
+
+
+def walk_forward(data, n_folds=cfg.WALK_FORWARD_FOLDS, mode='expanding', train_fraction=cfg.TRAIN_TEST_SPLIT,
+                 sequence_length=cfg.SEQUENCE_LENGTH, epochs=cfg.EPOCHS, batch_size=cfg.BATCH_SIZE,
+                 workers=cfg.WALK_FORWARD_WORKERS, threads=cfg.WALK_FORWARD_THREADS, seed=0):
+    """Walk-forward evaluation of LSTMPredictor on a close series (or a frame with 'Close'), one row per fold"""
+    close = data['Close'] if isinstance(data, pd.DataFrame) else data
+    index = close.index if isinstance(close, pd.Series) else None
+    close = np.asarray(close, dtype=np.float64)
+    folds = walk_forward_folds(len(close), n_folds, train_fraction, mode)
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers or cores, len(folds)))
+    threads = threads or max(1, cores // workers)
+
+    started = time.perf_counter()
+    args = [(close, fold, sequence_length, epochs, batch_size, seed + i) for i, fold in enumerate(folds)]
+    # TensorFlow is not fork-safe, so folds train in spawned interpreters
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(threads,)) as pool:
+        rows = list(pool.map(evaluate_fold, *zip(*args)))
+    results = pd.DataFrame(rows)
+    results.insert(0, 'fold', range(len(results)))
+    if index is not None:
+        results['test_from'] = index[results['test_start']]
+        results['test_to'] = index[results['test_end'] - 1]
+    results.attrs.update(seconds=time.perf_counter() - started, workers=workers, threads=threads, mode=mode)
+    return results
+
+
+def main(argv=None):
+    from .bar_store import BarStore, slice_period
+
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation of the LSTM predictor on stored bars")
+    parser.add_argument('ticker')
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--period', default='1y')
+    parser.add_argument('--folds', type=int, default=cfg.WALK_FORWARD_FOLDS)
+    parser.add_argument('--mode', choices=WINDOW_MODES, default='expanding')
+    parser.add_argument('--epochs', type=int, default=cfg.EPOCHS)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--threads', type=int)
+    args = parser.parse_args(argv)
+    df = slice_period(BarStore(cfg.BAR_STORE_DIR).read(args.ticker, args.interval), args.period, args.interval)
+    results = walk_forward(df, args.folds, args.mode, epochs=args.epochs, workers=args.workers,
+                           threads=args.threads)
+    print(results.to_string())
+    print(f"{len(results)} folds in {results.attrs['seconds']:.1f}s "
+          f"({results.attrs['workers']} workers x {results.attrs['threads']} threads)")
+
+
+if __name__ == '__main__':
+    main()
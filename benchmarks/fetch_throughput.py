@@ -0,0 +1,84 @@
+"""Measure watchlist refresh throughput against a simulated provider, sequentially and with fetch_many"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.src.bar_store import BarStore  # noqa: E402
+from backend.src.data_service import refresh  # noqa: E402
+from backend.src.fetcher import fetch_many, TokenBucket  # noqa: E402
+from backend.src.providers import FileProvider  # noqa: E402
+
+
+class FlakyProvider(FileProvider):
+    """FileProvider that raises on a fraction of requests"""
+
+    def __init__(self, root, latency=0.0, failure_rate=0.0):
+        super().__init__(root, latency)
+        self.failure_rate = failure_rate
+
+    def history(self, ticker, interval, period=None, start=None):
+        if random.random() < self.failure_rate:
+            self.calls += 1
+            time.sleep(self.latency)
+            raise ConnectionError("simulated provider failure")
+        return super().history(ticker, interval, period=period, start=start)
+
+
+def write_series(root, tickers, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-02 14:30', periods=bars, freq='min', tz='UTC')
+    for ticker in tickers:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, bars)))
+        df = pd.DataFrame({'Open': close, 'High': close * 1.001, 'Low': close * 0.999,
+                           'Close': close, 'Volume': rng.integers(100, 1000, bars).astype(float)},
+                          index=index)
+        df.to_pickle(os.path.join(root, f"{ticker}_1m.pkl"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=390)
+    parser.add_argument('--latency', type=float, default=0.2, help="Seconds the provider sleeps per request")
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=200.0, help="Token bucket rate (requests/second)")
+    parser.add_argument('--flaky', type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument('--skip-sequential', action='store_true')
+    args = parser.parse_args(argv)
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'src')
+        os.makedirs(src)
+        write_series(src, tickers, args.bars)
+
+        if not args.skip_sequential:
+            store = BarStore(os.path.join(tmp, 'sequential'))
+            provider = FileProvider(src, args.latency)
+            start = time.perf_counter()
+            for ticker in tickers:
+                refresh(ticker, '1d', '1m', store, provider)
+            elapsed = time.perf_counter() - start
+            print(f"sequential: {elapsed:.2f}s ({len(tickers) / elapsed:.1f} tickers/s)")
+
+        store = BarStore(os.path.join(tmp, 'concurrent'))
+        provider = FlakyProvider(src, args.latency, args.flaky)
+        start = time.perf_counter()
+        _, errors = fetch_many(tickers, '1d', '1m', store, provider, workers=args.workers,
+                               bucket=TokenBucket(args.rate, args.workers), read=False)
+        elapsed = time.perf_counter() - start
+        print(f"fetch_many: {elapsed:.2f}s ({len(tickers) / elapsed:.1f} tickers/s), "
+              f"{provider.calls} provider calls, {len(errors)} failed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
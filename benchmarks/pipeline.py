@@ -0,0 +1,160 @@
+"""Benchmark the data -> signal -> backtest -> chart pipeline on synthetic bars"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import synthetic_ohlcv  # noqa: E402
+from backend.src.data_service import calculate_indicators  # noqa: E402
+from backend.src.models import TradingStrategy, backtest_strategy  # noqa: E402
+from backend.src.indicator_frame import indicators_and_signals  # noqa: E402
+from backend.src.optimizer import param_combinations  # noqa: E402
+from backend.src.rules import compile_variants  # noqa: E402
+from frontend.src.charts import create_price_chart, create_indicator_chart  # noqa: E402
+
+DEFAULT_SIZES = [1e3, 1e4, 1e5, 1e6]
+
+
+def build_stages():
+    """Stage name -> (setup(df) returning the stage's arguments, stage function). Setup is not timed."""
+    strategy = TradingStrategy()
+
+    def with_signals(df):
+        signals, frame = strategy.calculate_signals(calculate_indicators(df))
+        return frame, signals
+
+    def price_chart_args(df):
+        frame, signals = with_signals(df)
+        return frame, 'SYN', signals
+
+    def rule_args(df):
+        graph = compile_variants(param_combinations(n_random=36, seed=0))
+        return graph, with_signals(df)[0]
+
+    def lstm_args(df):
+        from backend.src.lstm import LSTMPredictor    # TensorFlow is optional here
+        return LSTMPredictor(), df[['Close']].to_numpy()
+
+    return {
+        'indicators': (lambda df: (df,), calculate_indicators),
+        'signals': (lambda df: (calculate_indicators(df),), strategy.calculate_signals),
+        'backtest': (with_signals, backtest_strategy),
+        'compact_signals': (lambda df: (df, strategy, True, 'float64'), indicators_and_signals),
+        'compact_signals_f32': (lambda df: (df, strategy, True, 'float32'), indicators_and_signals),
+        'rule_variants': (rule_args, lambda graph, frame: graph.evaluate(frame)),
+        'lstm_prepare': (lstm_args, lambda predictor, data: predictor.prepare_data(data)),
+        'price_chart': (price_chart_args, create_price_chart),
+        'indicator_chart': (lambda df: (calculate_indicators(df), ['rsi', 'macd']), create_indicator_chart),
+    }
+
+
+def measure(func, args, repeat):
+    """Best wall time of `repeat` runs, and peak traced memory of a separate run so tracing skews no timing"""
+    gc.collect()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, stage_names, repeat, seed):
+    stages = build_stages()
+    results = {}
+    for size in sizes:
+        n = int(size)
+        df = synthetic_ohlcv(n, seed=seed)
+        for name in stage_names:
+            setup, func = stages[name]
+            try:
+                args = setup(df)
+            except ImportError as e:
+                print(f"{name:>16} {n:>10,} skipped ({e})")
+                continue
+            seconds, peak = measure(func, args, repeat)
+            result = {'bars': n, 'seconds': seconds, 'bars_per_sec': n / seconds,
+                      'peak_mb': peak / 2 ** 20}
+            results[f"{name}@{n}"] = result
+            print(f"{name:>16} {n:>10,} {result['bars_per_sec']:>14,.0f} bars/s "
+                  f"{seconds * 1000:>10.1f} ms {result['peak_mb']:>9.1f} MB peak")
+    return results
+
+
+def environment(seed):
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'seed': seed,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print per-stage ratios against a baseline; return the regressions"""
+    regressions = []
+    for key, result in results.items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        speed = result['bars_per_sec'] / base['bars_per_sec']
+        memory = result['peak_mb'] / base['peak_mb'] if base['peak_mb'] else 1.0
+        flag = ''
+        if speed < 1 - tolerance or memory > 1 + tolerance:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"{key:>28} throughput x{speed:.2f}  peak memory x{memory:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', help="Bar counts (default: 1e3 1e4 1e5 1e6, or the baseline's)")
+    parser.add_argument('--stages', nargs='+', choices=list(build_stages()), default=list(build_stages()))
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage; the best is reported")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help="Write results to this baseline JSON file")
+    parser.add_argument('--compare', help="Compare against this baseline JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="Allowed relative throughput drop / memory growth before failing")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    sizes = args.sizes
+    if sizes is None:
+        sizes = sorted({r['bars'] for r in baseline['results'].values()}) if baseline else DEFAULT_SIZES
+
+    results = run(sizes, args.stages, args.repeat, args.seed)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': environment(args.seed), 'results': results}, f, indent=2)
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"FAIL: {len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Measure the median cold `import app` time and fail if heavy ML modules load at startup"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['tensorflow', 'keras', 'sklearn']
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'heavy': [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(runs):
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=None,
+                        help="Fail if the median import time exceeds this many seconds")
+    args = parser.parse_args(argv)
+
+    results = measure(args.runs)
+    median = statistics.median(r['seconds'] for r in results)
+    heavy = sorted({m for r in results for m in r['heavy']})
+    print(f"import app: median {median:.3f}s over {args.runs} runs")
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        return 1
+    if args.budget is not None and median > args.budget:
+        print(f"FAIL: median {median:.3f}s exceeds budget {args.budget:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
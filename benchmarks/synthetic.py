@@ -0,0 +1,22 @@
+"""Deterministic synthetic OHLCV bars for benchmarks"""
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(n_bars, seed=0, start='2020-01-01', freq='min', price=100.0,
+                    drift=0.0, volatility=1e-3, volume=1e5):
+    """Seeded geometric random walk: each open is the previous close, volume rises with the move"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(drift, volatility, n_bars)
+    close = price * np.exp(np.cumsum(returns))
+    open_ = np.empty(n_bars)
+    open_[0] = price
+    open_[1:] = close[:-1]
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    high = body_high * (1 + np.abs(rng.normal(0, volatility / 2, n_bars)))
+    low = body_low * (1 - np.abs(rng.normal(0, volatility / 2, n_bars)))
+    vol = np.round(volume * rng.lognormal(0, 0.5, n_bars) * (1 + np.abs(returns) / volatility))
+    index = pd.date_range(start, periods=n_bars, freq=freq, tz='UTC')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': vol},
+                        index=index)
@@ -1,8 +1,63 @@
+import math
+import base64
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from dash import html  # Add this import
+from dash import html, Patch  # Add this import
+from backend.src.config import TradingConfig as cfg
+from .downsample import ohlc_buckets, downsample_line, slice_range, thin_markers
 
-def create_chart_figure(df, signals, indicators, predictions=None):
+def line_trace(series, max_points=None, **kwargs):
+    """Line trace for an indicator series, LTTB-reduced and WebGL-rendered when dense"""
+    x, y = downsample_line(series, max_points)
+    trace = go.Scattergl if len(x) >= cfg.WEBGL_MIN_POINTS else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+ARRAY_ATTRS = ('x', 'y', 'open', 'high', 'low', 'close')
+SIGNAL_MARKERS = (    # (signal column, price trace index, price column, offset) as drawn by create_price_chart
+    ('entry', 3, 'Low', 0.99),
+    ('exit', 4, 'High', 1.01),
+    ('stop_loss', 5, 'Low', 0.99),
+)
+
+def _plain(values):
+    """JSON-ready list: timestamps as ISO strings, NaN as None"""
+    if isinstance(values, dict) and 'bdata' in values:
+        # plotly's base64 typed-array encoding of numpy data
+        values = np.frombuffer(base64.b64decode(values['bdata']), dtype=values['dtype'])
+    values = list(values)
+    if values and hasattr(values[0], 'isoformat'):
+        return [v.isoformat() for v in values]
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in np.asarray(values).tolist()]
+
+def figure_dict(fig):
+    """Figure as a dict with plain-list trace arrays so Dash Patch can extend them in the browser"""
+    figure = fig.to_dict()
+    for trace in figure['data']:
+        for attr in ARRAY_ATTRS:
+            values = trace.get(attr)
+            if values is not None and not isinstance(values, (list, str)):
+                trace[attr] = _plain(values)
+    return figure
+
+def candle_limit(max_points=cfg.CHART_MAX_POINTS):
+    """Candles drawn one per bar; longer series are bucketed"""
+    return max_points // cfg.CHART_PX_PER_CANDLE if max_points else None
+
+def _view(df, signals, x_range, max_points):
+    """Viewport slice of the bars/signals plus the candles to draw"""
+    if x_range is not None:
+        df = slice_range(df, x_range)
+        if signals is not None:
+            signals = signals.loc[df.index]
+    max_candles = candle_limit(max_points)
+    candles = ohlc_buckets(df, max_candles)
+    if signals is not None:
+        signals = signals.apply(thin_markers, max_markers=max_candles)
+    return df, signals, candles
+
+def create_chart_figure(df, signals, indicators, predictions=None, max_points=cfg.CHART_MAX_POINTS, x_range=None):
+    df, signals, candles = _view(df, signals, x_range, max_points)
     fig = make_subplots(
         rows=3, cols=1,
         shared_xaxes=True,
@@ -12,11 +67,11 @@ def create_chart_figure(df, signals, indicators, predictions=None):
     
     # Main candlestick chart
     fig.add_candlestick(
-        x=df.index,
-        open=df['Open'],
-        high=df['High'],
-        low=df['Low'],
-        close=df['Close'],
+        x=candles.index,
+        open=candles['Open'],
+        high=candles['High'],
+        low=candles['Low'],
+        close=candles['Close'],
         name='Price',
         row=1, col=1
     )
@@ -24,13 +79,13 @@ def create_chart_figure(df, signals, indicators, predictions=None):
     # Add Bollinger Bands if selected
     if "BB" in indicators:
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['BB_high'], name='BB Upper',
-                      line=dict(color='gray', dash='dash')),
+            line_trace(df['BB_high'], max_points, name='BB Upper',
+                       line=dict(color='gray', dash='dash')),
             row=1, col=1
         )
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['BB_low'], name='BB Lower',
-                      line=dict(color='gray', dash='dash')),
+            line_trace(df['BB_low'], max_points, name='BB Lower',
+                       line=dict(color='gray', dash='dash')),
             row=1, col=1
         )
     
@@ -71,7 +126,7 @@ def create_chart_figure(df, signals, indicators, predictions=None):
     # Add RSI if selected
     if "RSI" in indicators:
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['RSI'], name='RSI'),
+            line_trace(df['RSI'], max_points, name='RSI'),
             row=2, col=1
         )
         fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
@@ -80,11 +135,11 @@ def create_chart_figure(df, signals, indicators, predictions=None):
     # Add MACD if selected
     if "MACD" in indicators:
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['MACD'], name='MACD'),
+            line_trace(df['MACD'], max_points, name='MACD'),
             row=3, col=1
         )
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['MACD_signal'], name='Signal'),
+            line_trace(df['MACD_signal'], max_points, name='Signal'),
             row=3, col=1
         )
     
@@ -99,27 +154,28 @@ def create_chart_figure(df, signals, indicators, predictions=None):
     
     return fig
 
-def create_price_chart(df, symbol, signals):    # Added signals parameter
+def create_price_chart(df, symbol, signals, max_points=cfg.CHART_MAX_POINTS, x_range=None):    # Added signals parameter
+    df, signals, candles = _view(df, signals, x_range, max_points)
     fig = go.Figure()
     
     fig.add_candlestick(
-        x=df.index,
-        open=df['Open'],
-        high=df['High'],
-        low=df['Low'],
-        close=df['Close'],
+        x=candles.index,
+        open=candles['Open'],
+        high=candles['High'],
+        low=candles['Low'],
+        close=candles['Close'],
         name='Price'
     )
     
     # Add Bollinger Bands if available
     if 'BB_high' in df.columns and 'BB_low' in df.columns:
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['BB_high'], name='BB Upper',
-                      line=dict(color='gray', dash='dash'))
+            line_trace(df['BB_high'], max_points, name='BB Upper',
+                       line=dict(color='gray', dash='dash'))
         )
         fig.add_trace(
-            go.Scatter(x=df.index, y=df['BB_low'], name='BB Lower',
-                      line=dict(color='gray', dash='dash'))
+            line_trace(df['BB_low'], max_points, name='BB Lower',
+                       line=dict(color='gray', dash='dash'))
         )
     
     # Add trading signals
@@ -149,12 +205,14 @@ def create_price_chart(df, symbol, signals):    # Added signals parameter
         title=f'{symbol} Price Chart',
         yaxis_title='Price',
         template='plotly_dark',
-        height=600
+        height=600,
+        uirevision=symbol    # Keep the user's zoom when detail is re-fetched
     )
     
     return fig
 
-def create_indicator_chart(df, indicators):
+def create_indicator_chart(df, indicators, max_points=cfg.CHART_MAX_POINTS, x_range=None):
+    df = slice_range(df, x_range)
     fig = make_subplots(rows=len(indicators) if indicators else 1, cols=1, 
                         shared_xaxes=True, vertical_spacing=0.05)
     
@@ -162,7 +220,7 @@ def create_indicator_chart(df, indicators):
     for indicator in indicators or []:
         if indicator == "rsi":
             fig.add_trace(
-                go.Scatter(x=df.index, y=df['RSI'], name='RSI'),
+                line_trace(df['RSI'], max_points, name='RSI'),
                 row=row, col=1
             )
             fig.add_hline(y=70, line_dash="dash", line_color="red", row=row, col=1)
@@ -171,22 +229,85 @@ def create_indicator_chart(df, indicators):
             
         elif indicator == "macd":
             fig.add_trace(
-                go.Scatter(x=df.index, y=df['MACD'], name='MACD'),
+                line_trace(df['MACD'], max_points, name='MACD'),
                 row=row, col=1
             )
             fig.add_trace(
-                go.Scatter(x=df.index, y=df['MACD_signal'], name='Signal'),
+                line_trace(df['MACD_signal'], max_points, name='Signal'),
                 row=row, col=1
             )
             row += 1
     
     fig.update_layout(
         height=200 * (len(indicators) if indicators else 1),
-        template='plotly_dark'
+        template='plotly_dark',
+        uirevision=True
     )
     
     return fig
 
+def _indicator_columns(indicators):
+    """Indicator chart trace columns in the order create_indicator_chart adds them"""
+    columns = []
+    for indicator in indicators or []:
+        if indicator == "rsi":
+            columns.append('RSI')
+        elif indicator == "macd":
+            columns.extend(['MACD', 'MACD_signal'])
+    return columns
+
+# Columns whose traces live patches revise in place (Bollinger bands are price traces 1-2)
+PATCHED_COLUMNS = ('BB_high', 'BB_low', 'RSI', 'MACD', 'MACD_signal')
+
+def patchable(df, max_points=cfg.CHART_MAX_POINTS):
+    """True when every bar is its own candle and the patched line traces are past their NaN warm-up"""
+    limit = candle_limit(max_points)
+    if limit is not None and len(df) > limit:
+        return False
+    last = df.iloc[-1]
+    return all(col in df.columns and last[col] == last[col] for col in PATCHED_COLUMNS)
+
+def price_chart_patch(bars, last_ts, marked_ts):
+    """Patch for the price chart: revise the last drawn bar, append newer ones"""
+    patch = Patch()
+    if bars.index[0] == last_ts:
+        first = bars.iloc[0]
+        for attr, col in (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close')):
+            patch['data'][0][attr][-1] = _plain([first[col]])[0]
+        for trace, col in ((1, 'BB_high'), (2, 'BB_low')):
+            patch['data'][trace]['y'][-1] = _plain([first[col]])[0]
+    new = bars[bars.index > last_ts]
+    if len(new):
+        x = _plain(new.index)
+        patch['data'][0]['x'].extend(x)
+        for attr, col in (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close')):
+            patch['data'][0][attr].extend(_plain(new[col]))
+        for trace, col in ((1, 'BB_high'), (2, 'BB_low')):
+            patch['data'][trace]['x'].extend(x)
+            patch['data'][trace]['y'].extend(_plain(new[col]))
+    closed = bars[(bars.index > marked_ts) & (bars.index < bars.index[-1])]    # Markers only on closed bars
+    for signal, trace, col, offset in SIGNAL_MARKERS:
+        hits = closed[closed[signal]]
+        if len(hits):
+            patch['data'][trace]['x'].extend(_plain(hits.index))
+            patch['data'][trace]['y'].extend(_plain(hits[col] * offset))
+    return patch
+
+def indicator_chart_patch(bars, indicators, last_ts):
+    """Patch for the indicator chart matching price_chart_patch"""
+    patch = Patch()
+    columns = _indicator_columns(indicators)
+    if bars.index[0] == last_ts:
+        for trace, col in enumerate(columns):
+            patch['data'][trace]['y'][-1] = _plain([bars[col].iloc[0]])[0]
+    new = bars[bars.index > last_ts]
+    if len(new):
+        x = _plain(new.index)
+        for trace, col in enumerate(columns):
+            patch['data'][trace]['x'].extend(x)
+            patch['data'][trace]['y'].extend(_plain(new[col]))
+    return patch
+
 def create_performance_metrics(df):
     if len(df) < 2:
         return html.Div([
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+
+def points_for_width(width_px, px_per_point=1):
+    """How many points are worth sending for a chart `width_px` pixels wide"""
+    return max(int(width_px // px_per_point), 3)
+
+
+def slice_range(df, x_range):
+    """Bars inside a (start, end) viewport; the whole frame if x_range is None"""
+    if x_range is None or df.empty:
+        return df
+    start, end = (pd.Timestamp(v) for v in x_range)
+    tz = df.index.tz
+    if tz is not None:
+        start = start.tz_localize(tz) if start.tz is None else start.tz_convert(tz)
+        end = end.tz_localize(tz) if end.tz is None else end.tz_convert(tz)
+    return df[(df.index >= start) & (df.index <= end)]
+
+
+def ohlc_buckets(df, max_bars):
+    """Re-bucket consecutive bars so at most `max_bars` candles remain, spanning the true price range"""
+    n = len(df)
+    if max_bars is None or n <= max_bars:
+        return df
+    size = -(-n // max_bars)
+    starts = np.arange(0, n, size)
+    ends = np.r_[starts[1:] - 1, n - 1]
+    data = {
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.fmax.reduceat(df['High'].to_numpy(dtype=np.float64), starts),
+        'Low': np.fmin.reduceat(df['Low'].to_numpy(dtype=np.float64), starts),
+        'Close': df['Close'].to_numpy()[ends],
+    }
+    if 'Volume' in df.columns:
+        data['Volume'] = np.add.reduceat(df['Volume'].to_numpy(dtype=np.float64), starts)
+    return pd.DataFrame(data, index=df.index[starts])
+
+
+def thin_markers(mask, max_markers):
+    """Keep at most one True per bucket of a boolean Series (markers closer than a pixel overlap)"""
+    n = len(mask)
+    if max_markers is None or n <= max_markers:
+        return mask
+    size = -(-n // max_markers)
+    values = mask.to_numpy(dtype=bool)
+    positions = np.flatnonzero(values)
+    _, first = np.unique(positions // size, return_index=True)
+    thinned = np.zeros(n, dtype=bool)
+    thinned[positions[first]] = True
+    return pd.Series(thinned, index=mask.index)
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points that preserve a line's shape"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    every = (n - 2) / (n_out - 2)
+    bounds = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_end = bounds[i + 2] if i + 2 < len(bounds) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample_line(series, max_points):
+    """(x, y) of a line series reduced with LTTB; NaN warm-up values are dropped first"""
+    series = series.dropna()
+    if max_points is None or len(series) <= max_points:
+        return series.index, series.to_numpy()
+    index = series.index
+    x = index.asi8.astype(np.float64) if isinstance(index, pd.DatetimeIndex) else np.arange(len(index), dtype=np.float64)
+    y = series.to_numpy(dtype=np.float64)
+    keep = lttb_indices(x, y, max_points)
+    return index[keep], y[keep]
@@ -0,0 +1,32 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.src import data_service  # noqa: E402
+from backend.src.bar_store import BarStore  # noqa: E402
+from backend.src.providers import DataProvider  # noqa: E402
+
+
+class FrameProvider(DataProvider):
+    """Serves whatever frame the test currently holds"""
+    name = 'frame'
+
+    def __init__(self, df=None):
+        self.df = df
+        self.calls = []
+
+    def history(self, ticker, interval, period=None, start=None):
+        self.calls.append({'ticker': ticker, 'interval': interval, 'period': period, 'start': start})
+        return self.df if start is None else self.df[self.df.index >= start]
+
+
+@pytest.fixture
+def bar_store(tmp_path, monkeypatch):
+    """Temporary bar store and frame provider behind data_service: `(store, provider)`"""
+    store = BarStore(str(tmp_path))
+    provider = FrameProvider()
+    monkeypatch.setattr(data_service, '_store', store)
+    monkeypatch.setattr(data_service, '_provider', provider)
+    return store, provider
@@ -0,0 +1,78 @@
+import time
+import app
+from backend.src.config import TradingConfig as cfg
+from benchmarks.synthetic import synthetic_ohlcv
+
+DASHBOARD_OUTPUTS = [('price-chart', 'figure'), ('indicator-chart', 'figure'),
+                     ('performance-metrics', 'children'), ('live-state', 'data')]
+
+
+def dashboard_request(client, symbol, timeframe, interval, indicators):
+    """POST the update_dashboard callback the way the browser does after clicking Update"""
+    inputs = [('symbol-input', 'value', symbol), ('timeframe-select', 'value', timeframe),
+              ('interval-select', 'value', interval), ('update-button', 'n_clicks', 1),
+              ('price-chart', 'relayoutData', None)]
+    payload = {
+        'output': '..' + '...'.join(f"{i}.{p}" for i, p in DASHBOARD_OUTPUTS) + '..',
+        'outputs': [{'id': i, 'property': p} for i, p in DASHBOARD_OUTPUTS],
+        'inputs': [{'id': i, 'property': p, 'value': v} for i, p, v in inputs],
+        'state': [{'id': 'technical-indicators', 'property': 'value', 'value': indicators}],
+        'changedPropIds': ['update-button.n_clicks'],
+    }
+    return client.post('/_dash-update-component', json=payload)
+
+
+def test_precompute_serves_next_dashboard_request(bar_store):
+    store, provider = bar_store
+    provider.df = synthetic_ohlcv(2000, seed=7, freq='5min')
+    store.write('WARM', '5m', provider.df, fetched_at=time.time(), coverage_days='max')
+    app.app.layout = app.create_layout()
+
+    app.precompute('WARM', '5d', '5m')
+    analysis, figures = app.analysis_cache.stats(), app.figure_cache.stats()
+    response = dashboard_request(app.app.server.test_client(), 'WARM', '5d', '5m', list(cfg.DEFAULT_INDICATORS))
+
+    assert response.status_code == 200
+    assert app.analysis_cache.stats()['hits'] == analysis['hits'] + 1
+    assert app.figure_cache.stats()['hits'] == figures['hits'] + 1
+    assert app.figure_cache.stats()['misses'] == figures['misses']
+
+
+def test_scheduler_is_only_built_when_enabled():
+    assert not cfg.PRECOMPUTE and app.precompute_scheduler is None
+
+
+def test_interval_menu_disables_unservable_intervals():
+    options = [{'label': i, 'value': i} for i in ('1m', '5m', '1d')]
+    assert [o['disabled'] for o in app.interval_options('1mo', options)] == [True, False, False]
+    assert [o['disabled'] for o in app.interval_options('1d', options)] == [False, False, True]
+
+
+def test_scan_endpoint_lists_requested_symbols(bar_store):
+    store, provider = bar_store
+    provider.df = synthetic_ohlcv(400, seed=1, freq='D', volatility=2e-2)
+    app.result_cache.clear()
+    response = app.app.server.test_client().get('/api/scan?symbols=aaa,bbb&period=1y&interval=1d&all=1')
+    body = response.get_json()
+    assert response.status_code == 200
+    assert (body['symbols'], body['errors']) == (2, {})
+    assert [row['ticker'] for row in body['signals']] == ['AAA', 'BBB']
+    assert body['signals'][0]['time'] == provider.df.index[-1].isoformat()
+
+
+def test_profile_toggle_requires_token(monkeypatch, tmp_path):
+    monkeypatch.setattr(app.profiler, 'directory', str(tmp_path))
+    monkeypatch.setattr(app.profiler, 'enabled', False)
+    client = app.app.server.test_client()
+    monkeypatch.setattr(cfg, 'PROFILE_TOKEN', None)
+    assert client.post('/metrics/profile', data={'enable': '1'}).status_code == 403
+    monkeypatch.setattr(cfg, 'PROFILE_TOKEN', 'secret')
+    assert client.post('/metrics/profile', data={'enable': '1'},
+                       headers={'X-Profile-Token': 'wrong'}).status_code == 403
+    response = client.post('/metrics/profile', data={'enable': '1'}, headers={'X-Profile-Token': 'secret'})
+    assert response.get_json() == {'enabled': True}
+    client.get('/metrics')
+    assert len(list(tmp_path.glob('*.prof'))) >= 1
+    response = client.post('/metrics/profile', data={'enable': '0'}, headers={'X-Profile-Token': 'secret'})
+    assert response.get_json() == {'enabled': False}
+    assert 'traide_request_seconds_bucket' in client.get('/metrics').get_data(as_text=True)
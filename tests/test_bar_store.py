@@ -0,0 +1,85 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.bar_store import BarStore
+from backend.src.data_service import _covers
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def ns(df):
+    """The stored resolution of `df`'s index"""
+    return df.set_axis(df.index.as_unit('ns'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path))
+
+
+def test_write_read_round_trip(store):
+    df = synthetic_ohlcv(500, seed=1).tz_convert('America/New_York')
+    assert store.write('abc', '1m', df, coverage_days=5) == 500
+    pd.testing.assert_frame_equal(store.read('ABC', '1m'), ns(df), check_freq=False)
+    meta = store.read_meta('abc', '1m')
+    assert meta['rows'] == 500 and meta['tz'] == 'America/New_York'
+    assert meta['first_ts'] == df.index[0].value and meta['last_ts'] == df.index[-1].value
+    assert store.last_timestamp('abc', '1m') == df.index[-1]
+
+
+def test_append_replaces_forming_bar_and_skips_old(store):
+    df = synthetic_ohlcv(300, seed=2)
+    store.write('X', '1m', df.iloc[:200])
+    update = df.iloc[150:260].copy()    # Overlaps the stored tail
+    assert store.append('X', '1m', update) == 61    # Stored last bar rewritten, 60 new
+    revised = df.iloc[259:300].copy()
+    revised.iloc[0, revised.columns.get_loc('Close')] += 1
+    store.append('X', '1m', revised)
+
+    expected = pd.concat([df.iloc[:259], revised])
+    pd.testing.assert_frame_equal(store.read('X', '1m'), ns(expected), check_freq=False)
+    assert store.read_meta('X', '1m')['rows'] == 300
+
+
+def test_read_since_with_lookback(store):
+    df = synthetic_ohlcv(100, seed=3)
+    store.write('X', '1m', df)
+    tail = store.read_since('X', '1m', df.index[90], lookback=5)
+    pd.testing.assert_frame_equal(tail, ns(df.iloc[85:]), check_freq=False)
+    assert store.read_since('X', '1m', df.index[-1] + pd.Timedelta(minutes=1)).empty
+    assert store.read_since('Y', '1m', df.index[0]).empty
+
+
+def test_coverage_metadata(store):
+    df = synthetic_ohlcv(100, seed=4)
+    store.write('X', '1m', df, fetched_at=1.0, coverage_days=5)
+    store.append('X', '1m', synthetic_ohlcv(10, seed=5, start=df.index[-1]), fetched_at=2.0)
+    meta = store.read_meta('X', '1m')
+    assert (meta['fetched_at'], meta['coverage_days'], meta['rows']) == (2.0, 5, 109)
+    assert _covers(meta, '5d') and not _covers(meta, '1mo') and not _covers(meta, 'max')
+
+    store.update_meta('X', '1m', coverage_days='max')
+    assert _covers(store.read_meta('X', '1m'), 'max')
+    store.update_meta('Y', '1m', coverage_days='max')    # No series: nothing is created
+    assert store.read_meta('Y', '1m') is None
+
+
+def test_series_locks_are_independent(store):
+    store.write('A', '1m', synthetic_ohlcv(10))
+    store.write('B', '1m', synthetic_ohlcv(10))
+    done = threading.Event()
+    with store._locked('A', '1m'):
+        thread = threading.Thread(target=lambda: (store.read('B', '1m'), done.set()))
+        thread.start()
+        assert done.wait(5)
+    thread.join()
+
+
+def test_shared_lock_is_not_upgraded(store):
+    store.write('A', '1m', synthetic_ohlcv(10))
+    with store._locked('A', '1m'):
+        assert len(store.read('A', '1m')) == 10    # Reading under the write lock is fine
+    with store._locked('A', '1m', shared=True):
+        with pytest.raises(RuntimeError):
+            store.append('A', '1m', synthetic_ohlcv(1, start='2021-01-01'))
+    np.testing.assert_array_equal(store.read('A', '1m')['Close'], synthetic_ohlcv(10)['Close'])
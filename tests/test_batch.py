@@ -0,0 +1,20 @@
+import pandas as pd
+from backend.src.bar_store import BarStore
+from backend.src.batch import run_backtests, run_job
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_parallel_run_matches_serial_jobs(tmp_path):
+    store = BarStore(str(tmp_path))
+    for seed, ticker in enumerate(['AAA', 'BBB', 'CCC']):
+        store.write(ticker, '1h', synthetic_ohlcv(3000, seed=seed, freq='h'))
+    tickers = ['AAA', 'BBB', 'CCC', 'MISSING']
+
+    results = run_backtests(tickers, ['1h'], ['1mo', '3mo'], store_root=str(tmp_path), workers=2,
+                            chunk_size=1, max_pending=2)
+
+    expected = pd.DataFrame([run_job(store, t, '1h', r) for t in tickers for r in ('1mo', '3mo')])
+    pd.testing.assert_frame_equal(results, expected.sort_values(['ticker', 'interval', 'range'])
+                                  .reset_index(drop=True))
+    assert results.loc[results['ticker'] == 'MISSING', 'error'].notna().all()
+    assert results.loc[results['ticker'] != 'MISSING', 'error'].isna().all()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from benchmarks import pipeline
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_synthetic_bars_are_deterministic_and_valid():
+    df = synthetic_ohlcv(5000, seed=3, freq='5min')
+    pd.testing.assert_frame_equal(df, synthetic_ohlcv(5000, seed=3, freq='5min'))
+    assert not df.equals(synthetic_ohlcv(5000, seed=4, freq='5min'))
+    assert df.index.is_monotonic_increasing and str(df.index.tz) == 'UTC'
+    assert (df['High'] >= df[['Open', 'Close']].max(axis=1)).all()
+    assert (df['Low'] <= df[['Open', 'Close']].min(axis=1)).all()
+    assert (df['Volume'] > 0).all()
+    np.testing.assert_array_equal(df['Open'].to_numpy()[1:], df['Close'].to_numpy()[:-1])
+
+
+def test_every_stage_runs_and_reports_throughput(capsys):
+    results = pipeline.run([300], list(pipeline.build_stages()), repeat=1, seed=0)
+    assert set(results) == {f"{name}@300" for name in pipeline.build_stages()}
+    for result in results.values():
+        assert result['bars'] == 300 and result['bars_per_sec'] > 0 and result['peak_mb'] >= 0
+
+
+def test_compare_flags_slower_or_larger_stages(capsys):
+    baseline = {'results': {
+        'a@10': {'bars_per_sec': 100.0, 'peak_mb': 10.0},
+        'b@10': {'bars_per_sec': 100.0, 'peak_mb': 10.0},
+        'c@10': {'bars_per_sec': 100.0, 'peak_mb': 10.0},
+    }}
+    results = {
+        'a@10': {'bars_per_sec': 80.0, 'peak_mb': 12.0},
+        'b@10': {'bars_per_sec': 60.0, 'peak_mb': 10.0},
+        'c@10': {'bars_per_sec': 100.0, 'peak_mb': 14.0},
+        'new@10': {'bars_per_sec': 1.0, 'peak_mb': 1.0},
+    }
+    assert pipeline.compare(results, baseline, tolerance=0.3) == ['b@10', 'c@10']
@@ -0,0 +1,59 @@
+import threading
+import time
+import types
+from backend.src import cache
+from backend.src.cache import TTLCache
+
+
+def test_lru_evicts_least_recently_used():
+    c = TTLCache(maxsize=2)
+    c.set('a', 1)
+    c.set('b', 2)
+    assert c.get('a') == 1
+    c.set('c', 3)
+    assert c.get('b') is None
+    assert (c.get('a'), c.get('c')) == (1, 3)
+
+
+def test_ttl_and_version_expire_entries(monkeypatch):
+    clock = types.SimpleNamespace(now=100.0)
+    monkeypatch.setattr(cache, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    c = TTLCache(ttl=10)
+    c.set('a', 1, version='bar-1')
+    clock.now += 9
+    assert c.get('a', version='bar-1') == 1
+    assert c.get('a', version='bar-2') is None
+    c.set('a', 2, version='bar-2')
+    clock.now += 11
+    assert c.get('a', version='bar-2') is None
+    assert c.stats()['size'] == 0
+
+
+def test_concurrent_callers_share_one_computation():
+    c = TTLCache()
+    started, release, calls = threading.Event(), threading.Event(), []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(c.get_or_compute('k', compute, version=1)))
+    owner.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(c.get_or_compute('k', compute, version=1)))
+               for _ in range(4)]
+    for t in waiters:
+        t.start()
+    while c.stats()['coalesced'] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in [owner, *waiters]:
+        t.join()
+    assert calls == [1]
+    assert results == ['value'] * 5
+    assert c.get_or_compute('k', compute, version=1) == 'value'
+    assert calls == [1]
+    assert c.stats()['hits'] == 1 and c.stats()['misses'] == 1
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from backend.src import data_service
+from backend.src.bar_store import BarStore, slice_period
+from backend.src.data_service import fetch_data
+from benchmarks.synthetic import synthetic_ohlcv
+from conftest import FrameProvider
+
+
+@pytest.fixture
+def daily():
+    return synthetic_ohlcv(400, seed=8, freq='D')
+
+
+def expire(store):
+    store.update_meta('X', '1d', fetched_at=0)
+
+
+def test_fresh_series_fetches_once(bar_store, daily):
+    store, provider = bar_store
+    provider.df = daily
+    df = fetch_data('X', '1y', '1d')
+    assert [(c['period'], c['start']) for c in provider.calls] == [('1y', None)]
+    assert len(df) == len(slice_period(daily, '1y', '1d'))
+
+
+def test_warm_series_makes_no_call(bar_store, daily):
+    store, provider = bar_store
+    provider.df = daily
+    first = fetch_data('X', '1y', '1d')
+    second = fetch_data('X', '1y', '1d')
+    assert len(provider.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_expired_series_fetches_from_last_bar(bar_store, daily):
+    store, provider = bar_store
+    provider.df = daily.iloc[:300].copy()
+    provider.df.iloc[-1, provider.df.columns.get_loc('Close')] -= 1    # Still forming when first fetched
+    fetch_data('X', '1y', '1d')
+    expire(store)
+    provider.df = daily
+    df = fetch_data('X', '1y', '1d')
+
+    assert provider.calls[-1]['start'] == daily.index[299] and provider.calls[-1]['period'] is None
+    assert store.read_meta('X', '1d')['rows'] == 400
+    stored = store.read('X', '1d')
+    assert stored['Close'].iloc[299] == daily['Close'].iloc[299]    # Revised bar replaced the stored one
+    assert df.index[-1] == daily.index[-1]
+
+
+def test_delta_merge_equals_full_fetch(bar_store, daily, tmp_path):
+    store, provider = bar_store
+    provider.df = daily.iloc[:250]
+    fetch_data('X', '1y', '1d')
+    for end in (260, 261, 330, 400):
+        expire(store)
+        provider.df = daily.iloc[:end]
+        fetch_data('X', '1y', '1d')
+    assert all(c['start'] is not None for c in provider.calls[1:])
+
+    full = BarStore(str(tmp_path / 'full'))
+    fetch_data('X', '1y', '1d', store=full, provider=FrameProvider(daily))
+    pd.testing.assert_frame_equal(store.read('X', '1d'), full.read('X', '1d'))
+    assert fetch_data('X', '1y', '1d').equals(fetch_data('X', '1y', '1d', store=full))
+
+
+def test_empty_delta_only_marks_fresh(bar_store, daily):
+    store, provider = bar_store
+    provider.df = daily
+    fetch_data('X', '1y', '1d')
+    expire(store)
+    provider.df = daily.iloc[:0][[]]    # Some providers return a frame without columns
+    fetch_data('X', '1y', '1d')
+    assert store.read_meta('X', '1d')['fetched_at'] > 0
+    assert store.read_meta('X', '1d')['rows'] == 400
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from frontend.src.downsample import downsample_line, lttb_indices, ohlc_buckets, thin_markers
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_lttb_keeps_endpoints_and_requested_length():
+    rng = np.random.default_rng(0)
+    y = rng.standard_normal(10_000).cumsum()
+    y[4321] += 500    # A spike the reduced line must not lose
+    keep = lttb_indices(np.arange(len(y), dtype=np.float64), y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert (np.diff(keep) > 0).all()
+    assert 4321 in keep
+
+
+def test_downsample_line_drops_warm_up_and_keeps_short_series():
+    series = pd.Series(np.r_[np.full(20, np.nan), np.arange(1000.0)],
+                       index=pd.date_range('2024-01-01', periods=1020, freq='min'))
+    x, y = downsample_line(series, 100)
+    assert len(x) == len(y) == 100
+    assert (x[0], y[0], x[-1], y[-1]) == (series.index[20], 0.0, series.index[-1], 999.0)
+    x, y = downsample_line(series, 5000)
+    assert len(x) == 1000
+
+
+def test_ohlc_buckets_match_groupby_aggregation():
+    df = synthetic_ohlcv(1003)
+    buckets = ohlc_buckets(df, 100)
+    size = -(-len(df) // 100)
+    expected = df.groupby(np.arange(len(df)) // size).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+    expected.index = df.index[::size]
+    assert len(buckets) <= 100
+    pd.testing.assert_frame_equal(buckets, expected, check_dtype=False, check_freq=False)
+
+
+def test_thin_markers_keeps_one_per_bucket():
+    mask = pd.Series(np.zeros(1000, dtype=bool))
+    mask[[3, 4, 5, 500, 999]] = True
+    thinned = thin_markers(mask, 100)
+    assert list(np.flatnonzero(thinned)) == [3, 500, 999]
@@ -0,0 +1,25 @@
+import pytest
+from backend.src.data_service import calculate_indicators
+from backend.src.event_backtest import EventBacktester, FrameSource
+from backend.src.models import TradingStrategy, backtest_strategy
+from benchmarks.synthetic import synthetic_ohlcv
+
+TRADE_KEYS = ('entry_date', 'exit_date', 'entry_price', 'exit_price', 'returns')
+PERFORMANCE_KEYS = ('total_trades', 'winning_trades', 'avg_return', 'max_return', 'min_return',
+                    'final_balance', 'total_return')
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_close_fills_match_backtest_strategy(seed):
+    df = synthetic_ohlcv(20000, seed=seed, volatility=3e-3)
+    signals, frame = TradingStrategy().calculate_signals(calculate_indicators(df))
+    expected_trades, expected = backtest_strategy(frame, signals)
+
+    engine = EventBacktester(stop=None, take_profit_pct=None, slippage=0, commission=0, commission_fixed=0,
+                             fill='close', chunk_size=777)
+    trades, performance = engine.run(FrameSource(frame, signals))
+
+    assert expected_trades
+    assert [{k: t[k] for k in TRADE_KEYS} for t in trades] == pytest.approx(expected_trades)
+    assert {k: performance[k] for k in PERFORMANCE_KEYS} == pytest.approx(expected)
+    assert performance['signal_exits'] == len(trades)
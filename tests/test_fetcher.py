@@ -0,0 +1,71 @@
+import threading
+import time
+import pytest
+from backend.src.fetcher import ResilientProvider, TokenBucket, fetch_many
+from benchmarks.synthetic import synthetic_ohlcv
+from conftest import FrameProvider
+
+
+def test_token_bucket_enforces_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+    taken = []
+
+    def worker():
+        for _ in range(10):
+            bucket.acquire()
+            taken.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 5 banked tokens go at once, the other 25 arrive at 50 per second
+    assert len(taken) == 30
+    assert taken[-1] - start >= 25 / 50 * 0.95
+    for n, t in enumerate(sorted(taken), 1):
+        assert n <= 5 + 50 * (t - start) + 1e-6
+
+
+class FlakyProvider(FrameProvider):
+    def __init__(self, df, failures):
+        super().__init__(df)
+        self.failures = dict(failures)
+
+    def history(self, ticker, interval, period=None, start=None):
+        result = super().history(ticker, interval, period, start)
+        if self.failures.get(ticker, 0):
+            self.failures[ticker] -= 1
+            raise ConnectionError(f"{ticker} unavailable")
+        return result
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(rate=1000)
+        self.taken = 0
+
+    def acquire(self, tokens=1):
+        super().acquire(tokens)
+        self.taken += tokens
+
+
+def test_retries_take_tokens_and_recover():
+    df = synthetic_ohlcv(10, freq='D')
+    bucket = CountingBucket()
+    provider = ResilientProvider(FlakyProvider(df, {'X': 2}), bucket, retries=2, backoff=0)
+    assert provider.history('X', '1d', period='1y') is df
+    assert len(provider.provider.calls) == bucket.taken == 3
+    with pytest.raises(ConnectionError):
+        ResilientProvider(FlakyProvider(df, {'X': 3}), bucket, retries=2, backoff=0).history('X', '1d', '1y')
+
+
+def test_fetch_many_isolates_failing_tickers(bar_store):
+    store, _ = bar_store
+    provider = FlakyProvider(synthetic_ohlcv(300, freq='D'), {'BAD': 10})
+    frames, errors = fetch_many(['a', 'b', 'bad', 'A'], '1y', '1d', store, provider, workers=3,
+                                bucket=TokenBucket(1000), retries=1)
+    assert sorted(frames) == ['A', 'B']
+    assert list(errors) == ['BAD'] and 'unavailable' in errors['BAD']
+    assert sorted(c['ticker'] for c in provider.calls) == ['A', 'B', 'BAD', 'BAD']
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.bar_store import BarStore
+from backend.src.history import SIGNAL_NAMES, HistoryStore
+from backend.src.indicator_frame import iter_chunk_signals
+from backend.src.streaming import INDICATOR_COLUMNS
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+@pytest.fixture
+def history(tmp_path):
+    with HistoryStore(str(tmp_path / 'history.h5'), chunk_rows=256) as store:
+        yield store
+
+
+def bars(n, seed=0):
+    df = synthetic_ohlcv(n, seed=seed, freq='5min')
+    df.index = df.index.tz_convert('America/New_York')
+    return df
+
+
+def test_append_read_round_trip(history):
+    df = bars(3000)
+    assert history.append('abc', '5m', df.iloc[:2000]) == 2000
+    revised = df.iloc[1999:].copy()
+    revised.iloc[0, revised.columns.get_loc('Close')] += 1    # The forming bar was revised
+    assert history.append('ABC', '5m', revised) == 1001
+    expected = pd.concat([df.iloc[:1999], revised])
+    pd.testing.assert_frame_equal(history.read('ABC', '5m'), expected, check_freq=False, check_index_type=False)
+    pd.testing.assert_frame_equal(history.read('ABC', '5m', 700, 1300), expected.iloc[700:1300],
+                                  check_freq=False, check_index_type=False)
+    assert history.series() == [('ABC', '5m')] and history.rows('ABC', '5m') == 3000
+    with pytest.raises(KeyError):
+        history.read('XYZ', '5m')
+
+
+def test_import_bars_copies_the_bar_store_in_chunks(history, tmp_path):
+    store = BarStore(str(tmp_path / 'bars'))
+    df = bars(2500, seed=1)
+    store.write('ABC', '5m', df)
+    assert history.import_bars(store, 'ABC', '5m', chunk_size=700) == 2500
+    pd.testing.assert_frame_equal(history.read('ABC', '5m'), store.read('ABC', '5m'),
+                                  check_freq=False, check_index_type=False)
+
+
+def test_compute_writes_chunked_signals(history):
+    df = bars(4000, seed=2)
+    history.append('ABC', '5m', df)
+    with pytest.raises(ValueError):
+        history.read('ABC', '5m', derived=True)
+    assert history.compute('ABC', '5m', chunk_size=900, warmup=300) == 4000
+    derived = history.read('ABC', '5m', derived=True)
+    expected = list(iter_chunk_signals(lambda lo, hi: history.read('ABC', '5m', lo, hi), 4000,
+                                       chunk_size=900, warmup=300))
+    signals = pd.concat([s for _, s, _ in expected])
+    frame = pd.concat([f for _, _, f in expected])
+    for name in SIGNAL_NAMES:
+        np.testing.assert_array_equal(derived[name], signals[name])
+    for name in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(derived[name], frame[name], equal_nan=True)
+
+    history.append('ABC', '5m', bars(4100, seed=2).iloc[-101:])
+    with pytest.raises(ValueError):
+        history.read('ABC', '5m', derived=True)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.indicator_frame import FRAME_COLUMNS, indicators_and_signals, iter_chunk_signals
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_compact_signals_match_default(seed):
+    df = synthetic_ohlcv(3000, seed=seed)
+    expected, frame = indicators_and_signals(df, compact=False)
+    signals, compact = indicators_and_signals(df, compact=True, dtype='float64')
+    pd.testing.assert_frame_equal(signals, expected)
+    pd.testing.assert_frame_equal(compact, frame[FRAME_COLUMNS], check_exact=False, rtol=1e-9)
+
+
+def test_float32_frame_is_one_block_close_to_default():
+    df = synthetic_ohlcv(3000, seed=1)
+    _, frame = indicators_and_signals(df, compact=False)
+    _, compact = indicators_and_signals(df, compact=True, dtype='float32')
+    assert (compact.dtypes == np.float32).all()
+    np.testing.assert_allclose(compact.to_numpy(dtype=np.float64), frame[FRAME_COLUMNS].to_numpy(),
+                               rtol=1e-5, atol=1e-2, equal_nan=True)    # Stoch_K is on a 0-100 scale
+
+
+@pytest.mark.parametrize('compact, dtype', [(False, None), (True, 'float64'), (True, 'float32')])
+def test_chunks_match_full_series(compact, dtype):
+    df = synthetic_ohlcv(5000, seed=2)
+    expected, frame = indicators_and_signals(df, compact=compact, dtype=dtype)
+    chunks = list(iter_chunk_signals(lambda lo, hi: df.iloc[lo:hi], len(df), chunk_size=1000,
+                                     warmup=300, compact=compact, dtype=dtype))
+    assert [start for start, _, _ in chunks] == list(range(0, 5000, 1000))
+    pd.testing.assert_frame_equal(pd.concat([s for _, s, _ in chunks]), expected)
+    joined = pd.concat([f for _, _, f in chunks])
+    assert (joined.dtypes == frame.dtypes).all()
+    rtol = 1e-5 if dtype == 'float32' else 1e-9
+    for name in ('VWAP', 'OBV'):
+        np.testing.assert_allclose(joined[name], frame[name], rtol=rtol)
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+SCRIPT = """
+import sys
+import backend.src.models as models
+assert 'tensorflow' not in sys.modules, 'imported eagerly'
+models.TradingStrategy()
+assert 'tensorflow' not in sys.modules, 'imported by TradingStrategy'
+predictor_class = models.LSTMPredictor
+assert 'tensorflow' in sys.modules
+from backend.src.lstm import LSTMPredictor
+assert predictor_class is LSTMPredictor
+"""
+
+
+def test_models_import_tensorflow_on_first_lstm_access():
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, '-c', SCRIPT], cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_unknown_models_attribute_raises():
+    import backend.src.models as models
+    with pytest.raises(AttributeError, match='Missing'):
+        models.Missing
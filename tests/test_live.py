@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.bar_store import slice_period
+from backend.src.live import LiveFeed
+from backend.src.streaming import IndicatorEngine
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+@pytest.fixture
+def feed(bar_store):
+    # Two sessions' worth of 1m bars: 2020-01-02 22:00 to 2020-01-03 00:59 UTC
+    full = synthetic_ohlcv(180, seed=5, start='2020-01-02 22:00')
+    store, provider = bar_store
+
+    def serve(df):
+        provider.df = df
+        if store.read_meta('X', '1m') is None:
+            store.write('X', '1m', df, fetched_at=0, coverage_days='max')
+        else:
+            store.update_meta('X', '1m', fetched_at=0)    # Force a delta fetch on the next poll
+
+    return LiveFeed(), full, serve
+
+
+def assert_matches_batch(rows, history):
+    expected = IndicatorEngine().run(history).loc[rows.index]
+    for name in expected.columns:
+        np.testing.assert_allclose(rows[name].to_numpy(dtype=float), expected[name].to_numpy(), err_msg=name)
+
+
+def test_revise_tick_matches_batch(feed):
+    live, full, serve = feed
+    final = full.iloc[:120]    # Ends at 23:59, inside the first session
+    forming = final.iloc[:-1].copy()
+    forming.iloc[-1, forming.columns.get_loc('Close')] *= 1.01
+    forming.iloc[-1, forming.columns.get_loc('Volume')] /= 4
+
+    serve(forming)
+    live.poll('X', '1d', '1m', since=forming.index[-1])
+    serve(final)
+    rows = live.poll('X', '1d', '1m', since=forming.index[-1])
+
+    assert list(rows.index) == list(final.index[-2:])
+    assert_matches_batch(rows, slice_period(final, '1d', '1m'))
+
+
+def test_seed_uses_period_window(feed):
+    live, full, serve = feed
+    serve(full.iloc[:150])
+    history = slice_period(full.iloc[:150], '1d', '1m')
+    rows = live.poll('X', '1d', '1m', since=history.index[0])
+
+    assert rows.index[0] == pd.Timestamp('2020-01-03', tz='UTC')
+    assert_matches_batch(rows, history)
+
+
+def test_new_session_reseeds(feed):
+    live, full, serve = feed
+    serve(full.iloc[:110])
+    live.poll('X', '1d', '1m', since=full.index[109])
+    serve(full.iloc[:130])    # Crosses midnight: the 1d window now holds only the new session
+    rows = live.poll('X', '1d', '1m', since=pd.Timestamp('2020-01-03', tz='UTC'))
+
+    assert len(rows) == 10
+    assert_matches_batch(rows, slice_period(full.iloc[:130], '1d', '1m'))
@@ -0,0 +1,33 @@
+import numpy as np
+from backend.src.lstm import LSTMPredictor
+
+
+def loop_windows(scaled, sequence_length):
+    X = np.array([scaled[i:i + sequence_length] for i in range(len(scaled) - sequence_length)])
+    return X, scaled[sequence_length:]
+
+
+def test_windows_match_loop():
+    predictor = LSTMPredictor(sequence_length=5)
+    data = np.random.default_rng(0).random(40) * 100
+    X, y = predictor.prepare_data(data)
+    expected_X, expected_y = loop_windows(predictor.scaler.transform(data.reshape(-1, 1))[:, 0], 5)
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+
+
+def test_window_dataset_batches_match_loop():
+    predictor = LSTMPredictor(sequence_length=5)
+    scaled = np.random.default_rng(1).random(40)
+    batches = list(predictor.window_dataset(scaled, batch_size=8).as_numpy_iterator())
+    X = np.concatenate([b[0] for b in batches])
+    y = np.concatenate([b[1] for b in batches])
+    expected_X, expected_y = loop_windows(scaled.astype(np.float32), 5)
+    assert [len(b[0]) for b in batches] == [8, 8, 8, 8, 3]
+    np.testing.assert_array_equal(X[..., 0], expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+
+
+def test_short_series_has_no_windows():
+    X, y = LSTMPredictor(sequence_length=5).prepare_data(np.arange(5.0))
+    assert X.shape == (0, 5) and y.shape == (0,)
@@ -0,0 +1,61 @@
+import os
+import pytest
+from backend.src.cache import TTLCache
+from backend.src.metrics import Metrics, RequestProfiler, cache_collector
+
+
+def test_timer_observes_histogram_and_counts_errors():
+    metrics = Metrics(buckets=(0.5, 10.0), prefix='t_')
+    metrics.describe('op_seconds', "Operation time")
+
+    @metrics.timer('op', ignore=KeyError, kind='decorated')
+    def work(error=None):
+        if error:
+            raise error
+
+    work()
+    for error in (ValueError, KeyError):
+        with pytest.raises(error):
+            work(error)
+    metrics.observe('op_seconds', 5.0, kind='decorated')
+    lines = metrics.render().splitlines()
+    assert lines == [
+        '# TYPE t_op_errors_total counter',
+        't_op_errors_total{kind="decorated"} 1',
+        '# HELP t_op_seconds Operation time',
+        '# TYPE t_op_seconds histogram',
+        't_op_seconds_bucket{kind="decorated",le="0.5"} 3',
+        't_op_seconds_bucket{kind="decorated",le="10.0"} 4',
+        't_op_seconds_bucket{kind="decorated",le="+Inf"} 4',
+        lines[7],
+        't_op_seconds_count{kind="decorated"} 4',
+    ]
+    assert lines[7].startswith('t_op_seconds_sum{kind="decorated"} 5.0')
+
+
+def test_collectors_are_read_at_scrape_time():
+    metrics = Metrics(prefix='t_')
+    cache = TTLCache()
+    metrics.collect(cache_collector('a', cache))
+    metrics.collect(cache_collector('b', TTLCache()))
+    cache.get('missing')
+    text = metrics.render()
+    assert 't_cache_misses_total{cache="a"} 1' in text
+    assert text.count('# TYPE t_cache_misses_total counter') == 1
+    lines = text.splitlines()
+    hits = [n for n, line in enumerate(lines) if line.startswith('t_cache_hits_total')]
+    assert hits == [hits[0], hits[0] + 1]    # One family per metric name
+
+
+def test_profiler_dumps_only_while_enabled(tmp_path):
+    profiler = RequestProfiler(directory=None)
+    profiler.start()
+    assert profiler.stop('GET /') is None
+    profiler.enable(str(tmp_path))
+    profiler.start()
+    sum(range(1000))
+    path = profiler.stop('GET /api/scan?x=1')
+    assert os.path.dirname(path) == str(tmp_path) and path.endswith('-GET_api_scan_x_1.prof')
+    profiler.disable()
+    profiler.start()
+    assert profiler.stop('GET /') is None
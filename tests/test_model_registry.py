@@ -0,0 +1,31 @@
+import numpy as np
+from backend.src.model_registry import ModelRegistry
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_save_load_round_trip(tmp_path):
+    df = synthetic_ohlcv(60, freq='D')
+    registry = ModelRegistry(str(tmp_path))
+    trained = registry.get_or_train('abc', '1d', df, sequence_length=5, epochs=1)
+    predictor, meta = ModelRegistry(str(tmp_path)).load('ABC', '1d', sequence_length=5)
+    assert meta['trained_bars'] == 60
+    assert meta['last_ts'] == df.index[-1].isoformat()
+    for saved, loaded in zip(trained.model.get_weights(), predictor.model.get_weights()):
+        np.testing.assert_array_equal(saved, loaded)
+    np.testing.assert_array_equal(trained.scaler.scale_, predictor.scaler.scale_)
+    assert ModelRegistry(str(tmp_path)).load('ABC', '1d', sequence_length=6) == (None, None)
+
+
+def test_get_or_train_fine_tunes_only_on_new_bars(tmp_path):
+    df = synthetic_ohlcv(80, freq='D')
+    registry = ModelRegistry(str(tmp_path))
+    predictor = registry.get_or_train('ABC', '1d', df.iloc[:60], sequence_length=5, epochs=1)
+    tuned = []
+    predictor.fine_tune = lambda data, epochs: tuned.append(len(data))
+    assert registry.get_or_train('ABC', '1d', df.iloc[:60], sequence_length=5) is predictor
+    assert tuned == []
+    registry.get_or_train('ABC', '1d', df, sequence_length=5)
+    assert tuned == [20 + 5]
+    _, meta = registry.load('ABC', '1d', sequence_length=5)
+    assert meta['trained_bars'] == 80
+    assert meta['last_ts'] == df.index[-1].isoformat()
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.data_service import calculate_indicators
+from backend.src.models import TradingStrategy, backtest_strategy, backtest_strategy_reference
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_backtest_matches_reference_on_strategy_signals(seed):
+    df = calculate_indicators(synthetic_ohlcv(3000, seed=seed))
+    signals, df = TradingStrategy(rsi_oversold=55, stoch_oversold=50, macd_threshold=0).calculate_signals(df)
+    trades, performance = backtest_strategy(df, signals)
+    assert trades
+    assert (trades, performance) == backtest_strategy_reference(df, signals)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_backtest_matches_reference_on_random_signals(seed):
+    rng = np.random.default_rng(seed)
+    df = synthetic_ohlcv(500, seed=seed)
+    signals = pd.DataFrame({name: rng.random(len(df)) < p
+                            for name, p in (('entry', 0.1), ('exit', 0.05), ('stop_loss', 0.02))},
+                           index=df.index)
+    trades, performance = backtest_strategy(df, signals)
+    assert trades
+    assert (trades, performance) == backtest_strategy_reference(df, signals)
+
+
+def test_backtest_without_trades():
+    df = synthetic_ohlcv(50)
+    signals = pd.DataFrame(False, index=df.index, columns=['entry', 'exit', 'stop_loss'])
+    assert backtest_strategy(df, signals) == backtest_strategy_reference(df, signals)
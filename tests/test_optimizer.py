@@ -0,0 +1,36 @@
+import pytest
+from backend.src.data_service import calculate_indicators
+from backend.src.models import TradingStrategy, backtest_strategy
+from backend.src.optimizer import PARAMS, sweep
+from benchmarks.synthetic import synthetic_ohlcv
+
+GRID = {
+    'rsi_oversold': [45, 55],
+    'rsi_overbought': [65, 75],
+    'stoch_oversold': [40, 50],
+    'stoch_overbought': [80],
+    'atr_multiplier': [1.5, 2.5],
+    'macd_threshold': [0.0],
+}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_matches_strategy_backtest(workers):
+    df = calculate_indicators(synthetic_ohlcv(3000, seed=4))
+    results = sweep(df, GRID, workers=workers, batch_size=5)
+    assert len(results) == 16
+    assert results['total_return'].is_monotonic_decreasing
+    assert results['total_trades'].max() > 0
+    for row in results.to_dict('records'):
+        params = {name: row[name] for name in PARAMS}
+        signals, frame = TradingStrategy(**params).calculate_signals(df)
+        _, performance = backtest_strategy(frame, signals)
+        for key, value in performance.items():
+            assert row[key] == pytest.approx(value), (params, key)
+
+
+def test_random_search_samples_distinct_combinations():
+    df = calculate_indicators(synthetic_ohlcv(500, seed=0))
+    results = sweep(df, GRID, n_random=6, seed=1, workers=1)
+    assert len(results) == 6
+    assert not results[PARAMS].duplicated().any()
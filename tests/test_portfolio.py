@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.data_service import calculate_indicators
+from backend.src.models import TradingStrategy, backtest_strategy
+from backend.src.portfolio import align_signals, backtest_portfolio
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_single_full_size_slot_matches_backtest_strategy(seed):
+    strategy = TradingStrategy(rsi_oversold=55, stoch_oversold=50, macd_threshold=0)
+    signals, df = strategy.calculate_signals(calculate_indicators(synthetic_ohlcv(3000, seed=seed)))
+    expected_trades, expected = backtest_strategy(df, signals)
+
+    matrix = align_signals({'X': (df, signals)}, dtype='float64')
+    trades, performance, equity = backtest_portfolio(matrix, max_positions=1, position_size=1.0, commission=0.0)
+
+    assert expected_trades
+    assert [{k: v for k, v in t.items() if k not in ('ticker', 'pnl')} for t in trades] == expected_trades
+    for key in ('total_trades', 'winning_trades', 'avg_return', 'max_return', 'min_return'):
+        assert performance[key] == pytest.approx(expected[key]), key
+    assert performance['open_positions'] == 0
+    assert performance['final_balance'] == pytest.approx(expected['final_balance'])
+    assert performance['realized_balance'] == pytest.approx(expected['final_balance'])
+
+
+def test_open_position_is_marked_to_market():
+    df = synthetic_ohlcv(500, seed=9)
+    rng = np.random.default_rng(9)
+    signals = pd.DataFrame({'entry': rng.random(500) < 0.1, 'exit': rng.random(500) < 0.05,
+                            'stop_loss': False}, index=df.index)
+    signals.iloc[-20:, signals.columns.get_loc('exit')] = False
+    signals.iloc[-20, signals.columns.get_loc('entry')] = True    # Still open at the last bar
+    expected_trades, expected = backtest_strategy(df, signals)
+
+    matrix = align_signals({'X': (df, signals)}, dtype='float64')
+    trades, performance, _ = backtest_portfolio(matrix, max_positions=1, position_size=1.0, commission=0.0)
+
+    assert [{k: v for k, v in t.items() if k not in ('ticker', 'pnl')} for t in trades] == expected_trades
+    assert performance['open_positions'] == 1
+    # backtest_strategy ignores the open position; final_balance values it at the last close
+    realized = performance['realized_balance']
+    assert realized == pytest.approx(expected['final_balance'])
+    after_last_exit = signals.index > expected_trades[-1]['exit_date']
+    entry_price = df['Close'][signals['entry'] & after_last_exit].iloc[0]
+    assert performance['final_balance'] == pytest.approx(realized / entry_price * df['Close'].iloc[-1])
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from backend.src.bar_store import BarStore
+from backend.src.resample import resample_bars, session_anchor, update_tier
+from benchmarks.synthetic import synthetic_ohlcv
+
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def session_bars(days=10, seed=0, start='2024-03-04'):
+    """US-equity style 1m bars: 09:30-16:00 New York time on weekdays, across the March DST change"""
+    df = synthetic_ohlcv(days * 1440, seed=seed, start=start).tz_convert('America/New_York')
+    local = df.index.hour * 60 + df.index.minute
+    return df[(df.index.dayofweek < 5) & (local >= 9 * 60 + 30) & (local < 16 * 60)]
+
+
+def pandas_resample(df, rule, anchor=None):
+    offset = {} if anchor is None else {'origin': 'start_day', 'offset': pd.Timedelta(anchor, unit='ns')}
+    out = df.resample(rule, **offset).agg(AGG).dropna(subset=['Open'])
+    return out.set_axis(out.index.as_unit('ns'))
+
+
+@pytest.mark.parametrize('interval, rule', [('5m', '5min'), ('15m', '15min'), ('1h', '1h'), ('1d', '1D')])
+def test_matches_pandas_resample(interval, rule):
+    df = session_bars()
+    anchor = session_anchor(df.index)
+    assert anchor == (9 * 60 + 30) * 60 * 10 ** 9
+    expected = pandas_resample(df, rule, anchor if interval != '1d' else None)    # Days start at local midnight
+    result = resample_bars(df, interval)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+    if interval == '1h':
+        assert (result.index.minute == 30).all()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path))
+
+
+def test_incremental_update_rewrites_partial_bin(store, monkeypatch):
+    full = session_bars(seed=1)
+    store.write('X', '1m', full.iloc[:1000])    # Ends inside an hourly bin
+    update_tier(store, 'X', '1h')
+    forming = full.iloc[1000:1700].copy()
+    forming.iloc[0, forming.columns.get_loc('High')] += 5    # Moves the partial bin's high
+
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("tier was rebuilt instead of appended")
+
+    store.append('X', '1m', forming)
+    with monkeypatch.context() as m:
+        m.setattr(store, 'write', no_rebuild)
+        assert update_tier(store, 'X', '1h') > 0
+        assert update_tier(store, 'X', '1h') == 0    # Nothing new in the base series
+    store.append('X', '1m', full.iloc[1700:])
+    update_tier(store, 'X', '1h')
+
+    base = store.read('X', '1m')
+    pd.testing.assert_frame_equal(store.read('X', '1h'), resample_bars(base, '1h'), check_freq=False)
+    assert store.read('X', '1h')['High'].max() == base['High'].max()
+
+
+def test_rebuild_after_base_rewrite(store):
+    full = session_bars(seed=2)
+    store.write('X', '1m', full.iloc[2000:])
+    update_tier(store, 'X', '15m')
+    store.write('X', '1m', full)    # e.g. a longer period fetched: the base starts earlier
+    update_tier(store, 'X', '15m')
+    pd.testing.assert_frame_equal(store.read('X', '15m'), resample_bars(full, '15m'), check_freq=False)
+    assert store.read_meta('X', '15m')['resampled']['base_first_ts'] == full.index[0].value
@@ -0,0 +1,23 @@
+import pandas as pd
+from backend.src.data_service import calculate_indicators
+from backend.src.models import TradingStrategy
+from backend.src.rules import RuleGraph, compile_variants
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_variants_match_strategy_signals():
+    _, frame = TradingStrategy().calculate_signals(calculate_indicators(synthetic_ohlcv(2000, seed=1)))
+    combos = [{'rsi_oversold': 35, 'stoch_oversold': 25}, {'rsi_overbought': 65, 'atr_multiplier': 1.5}]
+    results = compile_variants(combos).evaluate(frame)
+    for i, combo in enumerate(combos):
+        expected = TradingStrategy(**combo).signals_from_indicators(frame)
+        assert (results[i].to_numpy() == expected.to_numpy()).all()
+
+
+def test_empty_frame_and_typed_constants():
+    graph = RuleGraph().add('x', {'cross': "cross_above(MACD, MACD_signal)", 'true': "1 < 2", 'one': "RSI * 1 > 0"})
+    nodes = [args for op, args in graph._nodes if op == 'const']
+    assert (True,) in nodes and (1.0,) in nodes
+
+    empty = pd.DataFrame({'MACD': [], 'MACD_signal': [], 'RSI': []}, dtype=float)
+    assert graph.evaluate(empty)['x'].shape == (0, 3)
@@ -0,0 +1,67 @@
+import pytest
+from backend.src import scanner
+from backend.src.data_service import fetch_data
+from backend.src.indicator_frame import indicators_and_signals
+from backend.src.scanner import SIGNAL_COLUMNS, scan
+from benchmarks.synthetic import synthetic_ohlcv
+from conftest import FrameProvider
+
+TICKERS = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+
+
+class TickerProvider(FrameProvider):
+    """One synthetic series per ticker"""
+
+    def __init__(self, frames):
+        super().__init__()
+        self.frames = frames
+
+    def history(self, ticker, interval, period=None, start=None):
+        self.df = self.frames[ticker]
+        return super().history(ticker, interval, period, start)
+
+
+@pytest.fixture
+def watchlist(bar_store, monkeypatch):
+    store, _ = bar_store
+    provider = TickerProvider({t: synthetic_ohlcv(400, seed=n, freq='D', volatility=2e-2)
+                               for n, t in enumerate(TICKERS)})
+    monkeypatch.setattr('backend.src.data_service._provider', provider)
+    scanner.result_cache.clear()
+    yield store, provider
+    if scanner._pool is not None:
+        scanner._pool.shutdown()
+        scanner._pool = None
+
+
+def latest_signals(ticker):
+    signals, df = indicators_and_signals(fetch_data(ticker, '1y', '1d'))
+    return {'time': df.index[-1], 'close': df['Close'].iloc[-1], 'RSI': df['RSI'].iloc[-1],
+            **{name: bool(signals[name].iloc[-1]) for name in SIGNAL_COLUMNS}}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_scan_matches_per_ticker_signals(watchlist, workers):
+    table, errors = scan([t.lower() for t in TICKERS] + ['MISSING'], '1y', '1d', workers=workers,
+                         chunk_size=2, fired_only=False)
+    assert list(errors) == ['MISSING']
+    assert list(table['ticker']) == TICKERS
+    for row in table.to_dict('records'):
+        expected = latest_signals(row['ticker'])
+        assert {key: row[key] for key in expected} == expected
+
+    fired, _ = scan(TICKERS, '1y', '1d', workers=workers, chunk_size=2)
+    assert 0 < len(fired) < len(TICKERS)
+    assert list(fired['ticker']) == list(table.loc[table[SIGNAL_COLUMNS].any(axis=1), 'ticker'])
+
+
+def test_unchanged_series_are_served_from_cache(watchlist):
+    store, provider = watchlist
+    scan(TICKERS, '1y', '1d', workers=1)
+    misses = scanner.result_cache.stats()['misses']
+    store.update_meta('AAA', '1d', fetched_at=0)
+    provider.frames['AAA'] = provider.frames['AAA'].copy()
+    provider.frames['AAA'].iloc[-1, provider.frames['AAA'].columns.get_loc('Close')] += 1
+    table, _ = scan(TICKERS, '1y', '1d', workers=1, fired_only=False)
+    assert scanner.result_cache.stats()['misses'] == misses + 1
+    assert table.set_index('ticker').loc['AAA', 'close'] == provider.frames['AAA']['Close'].iloc[-1]
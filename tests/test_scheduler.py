@@ -0,0 +1,34 @@
+import time
+import threading
+from backend.src import scheduler
+from backend.src.scheduler import PrecomputeScheduler
+
+
+def test_grid_skips_unservable_combinations():
+    sched = PrecomputeScheduler(lambda *job: None, periods=('1d', '5d', '1mo'), intervals=('1m', '5m', '1d'))
+    assert ('1mo', '1m') not in sched.grid and ('1d', '1d') not in sched.grid
+    assert ('5d', '1m') in sched.grid and ('1mo', '1d') in sched.grid
+    sched.stop()
+
+
+def test_next_refresh_runs_outside_the_lock(monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_next_refresh(interval, symbol):
+        entered.set()
+        release.wait(5)
+        return time.time() + 3600
+
+    ran = threading.Event()
+    monkeypatch.setattr(scheduler, 'next_refresh', slow_next_refresh)
+    sched = PrecomputeScheduler(lambda *job: ran.set(), ['A'], periods=('5d',), intervals=('5m',), jitter=0).start()
+    try:
+        assert entered.wait(5)
+        watched = threading.Thread(target=lambda: (sched.watch(['B']), sched.unwatch(['B'])))
+        watched.start()
+        watched.join(1)
+        assert not watched.is_alive()
+    finally:
+        release.set()
+    assert ran.wait(5)
+    sched.stop()
@@ -0,0 +1,55 @@
+import os
+import time
+import multiprocessing
+import pytest
+from backend.src.shared_cache import SharedCache
+
+fork = pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="needs fork")
+
+
+def slow_compute(log, seconds):
+    with open(log, 'a') as f:
+        f.write(f"{os.getpid()}\n")
+    time.sleep(seconds)
+    return 'value'
+
+
+def worker(path, log, seconds, results):
+    cache = SharedCache('test', path=path, lock_timeout=0.3, poll=0.01)
+    results.put(cache.get_or_compute('key', lambda: slow_compute(log, seconds), version=1))
+    cache._flush_counts()
+
+
+@fork
+def test_one_compute_across_processes(tmp_path):
+    path, log = str(tmp_path / 'cache.sqlite'), str(tmp_path / 'computes.log')
+    SharedCache('test', path=path)
+    ctx = multiprocessing.get_context('fork')
+    results = ctx.Queue()
+    # The compute outlasts lock_timeout several times, so only lease renewal keeps the others waiting
+    procs = [ctx.Process(target=worker, args=(path, log, 1.2, results)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    values = [results.get(timeout=30) for _ in procs]
+    for p in procs:
+        p.join(30)
+
+    assert values == ['value'] * 4
+    with open(log) as f:
+        assert len(f.read().split()) == 1
+    stats = SharedCache('test', path=path).stats()
+    assert (stats['misses'], stats['hits'] + stats['coalesced']) == (1, 3)
+
+
+def test_counts_are_batched(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = SharedCache('test', path=path, flush_interval=60)
+    reader = SharedCache('test', path=path)
+    cache.set('key', 1)
+    for _ in range(100):
+        assert cache.get('key') == 1
+    assert cache.get('other') is None
+    assert reader.stats()['hits'] == 0    # Nothing written on the hot path yet
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (100, 1)
+    assert reader._connection().execute("SELECT COUNT(*) FROM hit_counts").fetchone()[0] == 1
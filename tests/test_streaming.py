@@ -0,0 +1,29 @@
+import numpy as np
+from backend.src.streaming import IndicatorEngine
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_revise_after_run_matches_batch():
+    full = synthetic_ohlcv(300, seed=3)
+    forming = full.copy()
+    forming.iloc[-1, forming.columns.get_loc('Close')] = full['Close'].iloc[-2]
+    forming.iloc[-1, forming.columns.get_loc('Volume')] = full['Volume'].iloc[-1] / 3
+
+    engine = IndicatorEngine.from_history(forming)
+    values = engine.update_bar(full.index[-1], full.iloc[-1], revise=True)
+
+    expected = IndicatorEngine().run(full).iloc[-1]
+    for name in engine.columns:
+        assert np.isclose(values[name], expected[name], equal_nan=True), name
+    assert engine.last_ts == full.index[-1]
+
+
+def test_revise_after_run_then_new_bar():
+    full = synthetic_ohlcv(120, seed=4)
+    engine = IndicatorEngine.from_history(full.iloc[:-1])
+    engine.update_bar(full.index[-2], full.iloc[-2], revise=True)
+    values = engine.update_bar(full.index[-1], full.iloc[-1])
+
+    expected = IndicatorEngine().run(full).iloc[-1]
+    for name in engine.columns:
+        assert np.isclose(values[name], expected[name], equal_nan=True), name
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from backend.src.walk_forward import evaluate_fold, fold_metrics, walk_forward_folds
+
+
+@pytest.mark.parametrize('mode', ['expanding', 'rolling'])
+@pytest.mark.parametrize('n, n_folds', [(1000, 5), (103, 7), (10, 20)])
+def test_test_windows_tile_the_tail_without_overlap(n, n_folds, mode):
+    folds = walk_forward_folds(n, n_folds, train_fraction=0.6, mode=mode)
+    initial = int(n * 0.6)
+    assert folds[0][1] == initial and folds[-1][2] == n
+    for (_, _, prev_end), (_, start, _) in zip(folds, folds[1:]):
+        assert start == prev_end
+    for train_start, test_start, test_end in folds:
+        assert 0 <= train_start < test_start < test_end
+        assert test_start - train_start == (test_start if mode == 'expanding' else initial)
+
+
+def test_invalid_folds_are_rejected():
+    with pytest.raises(ValueError):
+        walk_forward_folds(100, 5, mode='sliding')
+    with pytest.raises(ValueError):
+        walk_forward_folds(100, 5, train_fraction=1.0)
+
+
+def test_persistence_forecast_matches_naive_baseline():
+    actual = np.array([101.0, 99.0, 102.0])
+    previous = np.array([100.0, 101.0, 99.0])
+    metrics = fold_metrics(actual, previous, previous)
+    assert metrics['rmse'] == metrics['naive_rmse']
+    assert metrics['direction_accuracy'] == 0.0
+
+
+def test_every_test_bar_gets_a_prediction():
+    close = 100 + np.random.default_rng(0).standard_normal(120).cumsum()
+    row = evaluate_fold(close, (20, 80, 120), sequence_length=5, epochs=1, batch_size=16)
+    assert (row['train_bars'], row['test_bars']) == (60, 40)
+    assert np.isfinite(row['rmse']) and row['rmse'] > 0